@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark da representação da AST: memória e custo de alocação do Node (__slots__)
+comparado com a versão anterior baseada em __dict__.
+
+Uso: python bench_ast.py [num_statements]
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from parser import Node, parse
+
+
+class LegacyNode:
+    """Réplica do Node original (um __dict__ por instância, cópia filtrada dos filhos)."""
+    def __init__(self, type, children=None, leaf=None, lineno=None):
+        self.type = type
+        self.lineno = lineno
+        if children is None:
+            self.children = []
+        elif isinstance(children, list):
+            self.children = [c for c in children if c is not None]
+        else:
+            self.children = [children]
+        self.leaf = leaf
+
+
+def make_program(n):
+    """Programa sintético com 'n' atribuições/ifs sobre expressões de largura média."""
+    lines = ["program BenchAST;", "var", "    a, b, c, i: integer;", "    v: array[1..100] of integer;", "begin"]
+    for k in range(n):
+        if k % 3 == 0:
+            lines.append(f"    a := (b + {k}) * c - v[{k % 100 + 1}] div 2;")
+        elif k % 3 == 1:
+            lines.append(f"    if a > {k} then b := b + 1 else c := c - a;")
+        else:
+            lines.append(f"    for i := 1 to {k % 10 + 1} do v[i] := v[i] + a * {k};")
+    lines.append("    writeln(a)")
+    lines.append("end.")
+    return "\n".join(lines)
+
+
+def clone(node, cls):
+    """Reconstrói a árvore com outra classe de nó (mesmos valores, novas instâncias)."""
+    children = [clone(c, cls) if isinstance(c, Node) else c for c in node.children]
+    return cls(node.type, children, node.leaf, node.lineno)
+
+
+def count_nodes(node):
+    return 1 + sum(count_nodes(c) for c in node.children if isinstance(c, Node))
+
+
+def measure(ast, cls):
+    tracemalloc.start()
+    start = time.perf_counter()
+    tree = clone(ast, cls)
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return tree, current, elapsed
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    ast, errors, _ = parse(make_program(n))
+    if errors or not ast:
+        sys.exit("Programa sintético inválido")
+
+    nodes = count_nodes(ast)
+    print(f"Nós na AST: {nodes}")
+    print(f"{'Representação':<16} {'Memória (MB)':>14} {'Bytes/nó':>10} {'Tempo (ms)':>12}")
+    print("-" * 56)
+    results = {}
+    for label, cls in (("dict (antigo)", LegacyNode), ("__slots__", Node)):
+        tree, mem, elapsed = measure(ast, cls)
+        results[label] = (mem, elapsed)
+        print(f"{label:<16} {mem / 1e6:>14.2f} {mem / nodes:>10.1f} {elapsed * 1000:>12.1f}")
+        del tree
+
+    old_mem, old_t = results["dict (antigo)"]
+    new_mem, new_t = results["__slots__"]
+    print(f"\nPoupança de memória: {100 * (1 - new_mem / old_mem):.1f}%  |  "
+          f"Alocação: {old_t / new_t:.2f}x mais rápida")
+
+
+if __name__ == "__main__":
+    main()
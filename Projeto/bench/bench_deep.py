@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Stress benchmark para ASTs profundas: somas com milhares de termos, cadeias longas
+de 'if/else if' e parênteses aninhados. Com a travessia recursiva antiga estes
+programas rebentavam o limite de recursão do Python (RecursionError).
+
+Uso: python bench_deep.py [profundidade]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from pipeline import compile_source
+
+
+def long_sum(n):
+    terms = " + ".join(f"x * {k}" for k in range(n))
+    return f"program Soma;\nvar x, y: integer;\nbegin\n    x := 1;\n    y := {terms};\n    writeln(y)\nend.\n"
+
+
+def else_if_chain(n):
+    lines = ["program Cadeia;", "var x, y: integer;", "begin", "    read(x);"]
+    branches = [f"if x = {k} then y := {k}" for k in range(n)]
+    lines.append("    " + "\n    else ".join(branches) + "\n    else y := -1;")
+    lines += ["    writeln(y)", "end."]
+    return "\n".join(lines)
+
+
+def nested_parens(n):
+    expr = "x"
+    for k in range(n):
+        expr = f"({expr} + {k % 7})"
+    return f"program Parenteses;\nvar x: integer;\nbegin\n    x := 1;\n    x := {expr};\n    writeln(x)\nend.\n"
+
+
+def main():
+    depth = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    cases = {
+        f"soma com {depth} termos": long_sum(depth),
+        f"{depth // 2} 'else if' encadeados": else_if_chain(depth // 2),
+        f"{depth} parênteses aninhados": nested_parens(depth),
+    }
+
+    print(f"Limite de recursão do Python: {sys.getrecursionlimit()}")
+    print(f"{'Caso':<32} {'Estado':<8} {'Instr.':>8} " + " ".join(f"{p:>9}" for p in
+          ('lexer', 'parse', 'semantic', 'optimize', 'codegen')) + "  (ms)")
+    print("-" * 110)
+    for name, source in cases.items():
+        start = time.perf_counter()
+        try:
+            result = compile_source(source)
+            status = result.status
+            instructions = len(result.code) if result.code else 0
+            timings = result.timings
+        except RecursionError:
+            status, instructions, timings = 'RecursionError', 0, {}
+        total = time.perf_counter() - start
+        cols = " ".join(f"{timings.get(p, 0) * 1000:>9.1f}" for p in ('lexer', 'parse', 'semantic', 'optimize', 'codegen'))
+        print(f"{name:<32} {status:<8} {instructions:>8} {cols}  total {total * 1000:.1f}")
+
+
+if __name__ == "__main__":
+    main()
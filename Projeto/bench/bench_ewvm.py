@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Custo dinâmico do código gerado, medido com o interpretador local (ewvm.py).
+
+Compila cada programa de Projeto/tests (e um programa sintético) com e sem
+otimizações, executa os dois com a mesma entrada e compara: instruções no ficheiro,
+instruções executadas e tempo de execução. Verifica também que a saída das duas
+versões é igual (a memória final não: a eliminação de código morto e o movimento
+de código invariante mudam as variáveis que ficam escritas).
+
+Uso: python bench_ewvm.py [num_statements_sintetico]
+"""
+import glob
+import os
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', 'src'))
+
+from pipeline import compile_source
+from ewvm import decode, run, EWVMError
+from synth import generate_program
+
+# Entrada para os programas que leem do teclado (ex: ex4 lê 5 números)
+STDIN = "5\n1\n2\n3\n4\n5\n101\n"
+MAX_STEPS = 50_000_000
+
+
+def execute(source, no_opt):
+    result = compile_source(source, no_opt=no_opt)
+    if not result.ok:
+        return None
+    program = decode(result.code)
+    start = time.perf_counter()
+    execution = run(program, STDIN, MAX_STEPS)
+    return len(program), execution, time.perf_counter() - start
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    programs = []
+    for path in sorted(glob.glob(os.path.join(BENCH_DIR, '..', 'tests', '*.pas'))):
+        with open(path) as f:
+            programs.append((os.path.basename(path), f.read()))
+    # Sem subprogramas: só o corpo principal, com ciclos aninhados
+    programs.append((f"sintético ({n})", generate_program(n, depth=3, subprograms=0, array_size=50)))
+
+    print(f"{'Programa':<24} {'Estáticas':>17} {'Executadas':>21} {'Tempo (ms)':>10} {'Instr/s':>12}")
+    print(f"{'':<24} {'-O0':>8} {'-O':>8} {'-O0':>10} {'-O':>10}")
+    print("-" * 88)
+    for name, source in programs:
+        try:
+            base = execute(source, no_opt=True)
+            opt = execute(source, no_opt=False)
+        except EWVMError as e:
+            print(f"{name:<24} erro de execução: {e}")
+            continue
+        if base is None or opt is None:
+            continue
+        (size0, run0, _), (size1, run1, elapsed) = base, opt
+        same = run0.output == run1.output
+        print(f"{name:<24} {size0:>8} {size1:>8} {run0.steps:>10} {run1.steps:>10} {elapsed * 1000:>10.2f} "
+              f"{run1.steps / elapsed if elapsed else 0:>12,.0f}{'' if same else '  <- RESULTADOS DIFERENTES'}")
+
+
+if __name__ == "__main__":
+    main()
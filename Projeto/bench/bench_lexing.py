@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Benchmark "lex once": verificação léxica + parsing com o lexer a correr duas vezes
+(fluxo antigo) contra um único TokenBuffer partilhado com o parser.
+
+Uso: python bench_lexing.py [num_statements] [repeticoes]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import parser as pascal_parser
+from lexer import lexer, TokenBuffer
+from bench_ast import make_program
+
+
+def lex_twice(source):
+    """Fluxo antigo: run_lexical_check tokeniza tudo e o parser volta a tokenizar."""
+    lexer.errors = []
+    lexer.lineno = 1
+    lexer.input(source)
+    for _ in lexer:
+        pass
+    lexer.lineno = 1
+    return pascal_parser.parser.parse(source, lexer=lexer)
+
+
+def lex_once(source):
+    buffer = TokenBuffer(source)
+    return pascal_parser.parse(source, buffer)[0]
+
+
+def best_of(repeat, fn, arg):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(arg)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    source = make_program(n)
+    tokens = len(TokenBuffer(source).tokens)
+
+    lex_only = best_of(repeat, TokenBuffer, source)
+    old = best_of(repeat, lex_twice, source)
+    new = best_of(repeat, lex_once, source)
+
+    print(f"Fonte: {len(source) / 1024:.0f} KiB, {tokens} tokens")
+    print(f"Só lexer (1 passagem):       {lex_only * 1000:8.1f} ms  ({tokens / lex_only:,.0f} tokens/s)")
+    print(f"Lexer 2x + parser (antigo):  {old * 1000:8.1f} ms")
+    print(f"TokenBuffer + parser (novo): {new * 1000:8.1f} ms")
+    print(f"Poupança: {(old - new) * 1000:.1f} ms ({100 * (1 - new / old):.1f}%)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Benchmark do otimizador peephole: número de instruções antes e depois em cada
+programa de Projeto/tests (e num programa sintético maior), regras aplicadas e
+custo do filtro.
+
+Uso: python bench_peephole.py [num_statements_sintetico]
+"""
+import glob
+import os
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', 'src'))
+
+from parser import parse
+from semantic import SemanticAnalyzer
+from optimizer import Optimizer
+from codegen import CodeGenerator
+from peephole import optimize_code
+from synth import generate_program
+
+
+def generate(source):
+    """Código EWVM sem peephole (AST otimizada), ou None se a fonte tiver erros."""
+    ast, errors, _ = parse(source)
+    if errors or not ast:
+        return None
+    analyzer = SemanticAnalyzer()
+    is_valid, _, _ = analyzer.analyze(ast)
+    if not is_valid:
+        return None
+    ast = Optimizer().optimize(ast)
+    return CodeGenerator().generate(ast)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    programs = []
+    for path in sorted(glob.glob(os.path.join(BENCH_DIR, '..', 'tests', '*.pas'))):
+        with open(path) as f:
+            programs.append((os.path.basename(path), f.read()))
+    programs.append((f"sintético ({n})", generate_program(n)))
+
+    print(f"{'Programa':<26} {'Antes':>8} {'Depois':>8} {'Redução':>9} {'Tempo (ms)':>11}")
+    print("-" * 66)
+    total_before = total_after = 0
+    rules = {}
+    for name, source in programs:
+        code = generate(source)
+        if code is None:
+            continue
+        start = time.perf_counter()
+        optimized, stats = optimize_code(code)
+        elapsed = time.perf_counter() - start
+        before, after = len(code), len(optimized)
+        total_before += before
+        total_after += after
+        for rule, count in stats.rule_counts.items():
+            rules[rule] = rules.get(rule, 0) + count
+        print(f"{name:<26} {before:>8} {after:>8} {(before - after) / before:>8.1%} {elapsed * 1000:>11.2f}")
+
+    print("-" * 66)
+    print(f"{'Total':<26} {total_before:>8} {total_after:>8} {(total_before - total_after) / total_before:>8.1%}")
+    print("\nRegras aplicadas: " + ", ".join(f"{rule}={count}" for rule, count in sorted(rules.items())))
+
+
+if __name__ == "__main__":
+    main()
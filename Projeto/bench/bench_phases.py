@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Benchmark por fase do compilador sobre programas sintéticos (synth.py).
+
+Para cada tamanho (número de comandos) mede separadamente:
+  lexer     - TokenBuffer (tokenização)
+  parse     - parser.parse
+  semantic  - SemanticAnalyzer.analyze
+  optimize  - Optimizer.optimize
+  codegen   - CodeGenerator.generate
+e reporta o tempo (melhor de N), o débito (tokens/s ou nós/s), o pico de memória
+de cada fase (tracemalloc, numa execução à parte) e o expoente de escala de cada
+fase (declive log-log do tempo em função do tamanho: ~1.0 é linear).
+
+Os resultados são guardados em JSON (com o commit e os parâmetros) para poderem
+ser comparados entre commits com --compare.
+
+Uso:
+  python bench_phases.py --sizes 500,1000,2000,4000 --json antes.json
+  python bench_phases.py --sizes 500,1000,2000,4000 --compare antes.json
+"""
+import argparse
+import datetime
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', 'src'))
+
+from lexer import TokenBuffer
+from parser import parse
+from semantic import SemanticAnalyzer
+from optimizer import Optimizer
+from codegen import CodeGenerator
+from visitor import walk
+from synth import generate_program
+
+PHASES = ('lexer', 'parse', 'semantic', 'optimize', 'codegen')
+# Unidade do débito de cada fase: as duas primeiras trabalham sobre tokens, as outras sobre a AST
+UNITS = {'lexer': 'tokens', 'parse': 'tokens', 'semantic': 'nodes', 'optimize': 'nodes', 'codegen': 'nodes'}
+
+
+def run_phases(source, lexer_backend, clock, on_phase=None):
+    """
+    Executa as cinco fases sobre 'source' e devolve (tempos, contagens).
+    'clock' mede cada fase; 'on_phase(nome)' é chamado antes de cada uma (ex: reset do pico).
+    """
+    times = {}
+    counts = {}
+
+    def phase(name, fn, *args):
+        if on_phase:
+            on_phase(name)
+        start = clock()
+        value = fn(*args)
+        times[name] = clock() - start
+        return value
+
+    buffer = phase('lexer', TokenBuffer, source, None, None, lexer_backend)
+    if buffer.errors:
+        raise RuntimeError(f"Erros léxicos no programa sintético: {buffer.errors[:3]}")
+    ast, errors, _ = phase('parse', parse, source, buffer)
+    if errors or not ast:
+        raise RuntimeError(f"Erros sintáticos no programa sintético: {errors[:3]}")
+
+    analyzer = SemanticAnalyzer()
+    is_valid, sem_errors, _ = phase('semantic', analyzer.analyze, ast)
+    if not is_valid:
+        raise RuntimeError(f"Erros semânticos no programa sintético: {sem_errors[:3]}")
+
+    nodes = [0]
+    walk(ast, pre=lambda item, depth: nodes.__setitem__(0, nodes[0] + 1) if hasattr(item, 'children') else False)
+
+    ast = phase('optimize', Optimizer().optimize, ast)
+    code = phase('codegen', CodeGenerator().generate, ast)
+
+    counts['tokens'] = len(buffer.tokens)
+    counts['nodes'] = nodes[0]
+    counts['instructions'] = len(code)
+    return times, counts
+
+
+def peak_memory(source, lexer_backend):
+    """Pico de memória (bytes) alocado durante cada fase, acima do que já estava em uso."""
+    peaks = {}
+    state = {}
+
+    def on_phase(name):
+        finish()
+        tracemalloc.reset_peak()
+        state['name'] = name
+        state['base'] = tracemalloc.get_traced_memory()[0]
+
+    def finish():
+        if 'name' in state:
+            peaks[state['name']] = tracemalloc.get_traced_memory()[1] - state['base']
+
+    tracemalloc.start()
+    try:
+        run_phases(source, lexer_backend, time.perf_counter, on_phase)
+        finish()
+    finally:
+        tracemalloc.stop()
+    return peaks
+
+
+def measure(statements, options):
+    source = generate_program(statements, options.depth, options.subprograms,
+                              options.array_size, options.width, options.seed)
+    best = {name: float('inf') for name in PHASES}
+    counts = None
+    for _ in range(options.repeat):
+        times, counts = run_phases(source, options.lexer, time.perf_counter)
+        for name in PHASES:
+            best[name] = min(best[name], times[name])
+    peaks = peak_memory(source, options.lexer)
+
+    phases = {}
+    for name in PHASES:
+        unit = UNITS[name]
+        phases[name] = {
+            'seconds': best[name],
+            'throughput': counts[unit] / best[name] if best[name] else None,
+            'unit': f"{unit}/s",
+            'peak_bytes': peaks.get(name, 0),
+        }
+    total = sum(best.values())
+    return {
+        'statements': statements,
+        'lines': source.count("\n"),
+        'bytes': len(source),
+        'tokens': counts['tokens'],
+        'nodes': counts['nodes'],
+        'instructions': counts['instructions'],
+        'phases': phases,
+        'total_seconds': total,
+        'lines_per_second': source.count("\n") / total if total else None,
+    }
+
+
+def scaling_exponents(runs):
+    """Declive da reta de mínimos quadrados de log(tempo) contra log(tamanho), por fase."""
+    if len(runs) < 2:
+        return {}
+    xs = [math.log(run['statements']) for run in runs]
+    mean_x = sum(xs) / len(xs)
+    var_x = sum((x - mean_x) ** 2 for x in xs)
+    if not var_x:
+        return {}
+    exponents = {}
+    for name in PHASES + ('total',):
+        ys = [math.log(run['total_seconds'] if name == 'total' else run['phases'][name]['seconds'])
+              for run in runs]
+        mean_y = sum(ys) / len(ys)
+        exponents[name] = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / var_x
+    return exponents
+
+
+def git_commit():
+    try:
+        out = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BENCH_DIR,
+                             capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_runs(runs, exponents):
+    header = f"{'Comandos':>9} {'Fase':<10} {'Tempo (ms)':>11} {'Débito':>18} {'Pico (KiB)':>11}"
+    print(header)
+    print("-" * len(header))
+    for run in runs:
+        for name in PHASES:
+            data = run['phases'][name]
+            rate = f"{data['throughput']:,.0f} {data['unit']}" if data['throughput'] else "-"
+            print(f"{run['statements']:>9} {name:<10} {data['seconds'] * 1000:>11.2f} {rate:>18} "
+                  f"{data['peak_bytes'] / 1024:>11.0f}")
+        print(f"{'':>9} {'total':<10} {run['total_seconds'] * 1000:>11.2f} "
+              f"{run['lines_per_second']:>12,.0f} lin/s  ({run['tokens']} tokens, {run['nodes']} nós, "
+              f"{run['instructions']} instruções)")
+    if exponents:
+        print("\nExpoente de escala (tempo ~ tamanho^k):")
+        print("  " + "  ".join(f"{name}={k:.2f}" for name, k in exponents.items()))
+
+
+def compare(runs, old_path, threshold):
+    """Compara com um JSON anterior (mesmos tamanhos); devolve o número de regressões."""
+    with open(old_path) as f:
+        old = json.load(f)
+    old_runs = {run['statements']: run for run in old['runs']}
+    print(f"\nComparação com {old_path} (commit {old['meta'].get('commit')}):")
+    print(f"{'Comandos':>9} {'Fase':<10} {'Antes (ms)':>11} {'Agora (ms)':>11} {'Razão':>7}")
+    regressions = 0
+    for run in runs:
+        before = old_runs.get(run['statements'])
+        if before is None:
+            continue
+        for name in PHASES:
+            t_old = before['phases'][name]['seconds']
+            t_new = run['phases'][name]['seconds']
+            ratio = t_new / t_old if t_old else float('inf')
+            mark = ""
+            if ratio > 1 + threshold:
+                mark = "  <- regressão"
+                regressions += 1
+            print(f"{run['statements']:>9} {name:<10} {t_old * 1000:>11.2f} {t_new * 1000:>11.2f} {ratio:>7.2f}{mark}")
+    return regressions
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark por fase com programas sintéticos")
+    ap.add_argument('--sizes', default='500,1000,2000,4000', help='Números de comandos, separados por vírgulas')
+    ap.add_argument('--depth', type=int, default=3, help='Profundidade máxima de aninhamento')
+    ap.add_argument('--subprograms', type=int, default=8, help='Número de funções/procedimentos')
+    ap.add_argument('--array-size', type=int, default=100, help='Tamanho dos arrays')
+    ap.add_argument('--width', type=int, default=4, help='Termos por expressão')
+    ap.add_argument('--seed', type=int, default=0)
+    ap.add_argument('--repeat', type=int, default=3, help='Repetições (fica o melhor tempo)')
+    ap.add_argument('--lexer', choices=['ply', 'fast'], default='ply')
+    ap.add_argument('--json', metavar='FICHEIRO', help='Onde guardar os resultados (omissão: results/phases-<commit>.json)')
+    ap.add_argument('--compare', metavar='FICHEIRO', help='JSON anterior para comparar')
+    ap.add_argument('--threshold', type=float, default=0.10, help='Abrandamento relativo considerado regressão')
+    options = ap.parse_args()
+
+    sizes = [int(s) for s in options.sizes.split(',') if s]
+    runs = [measure(n, options) for n in sizes]
+    exponents = scaling_exponents(runs)
+    print_runs(runs, exponents)
+
+    commit = git_commit()
+    report = {
+        'meta': {
+            'commit': commit,
+            'date': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'params': {
+                'depth': options.depth, 'subprograms': options.subprograms, 'array_size': options.array_size,
+                'width': options.width, 'seed': options.seed, 'repeat': options.repeat, 'lexer': options.lexer,
+            },
+        },
+        'runs': runs,
+        'scaling': exponents,
+    }
+    path = options.json or os.path.join(BENCH_DIR, 'results', f"phases-{commit or 'local'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResultados guardados em {path}")
+
+    if options.compare:
+        if compare(runs, options.compare, options.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
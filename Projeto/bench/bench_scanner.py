@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Benchmark dos scanners: lexer do PLY contra o scanner com regex mestre (scanner.py).
+Verifica também que ambos produzem exatamente os mesmos tokens e erros.
+
+Uso: python bench_scanner.py [num_statements] [repeticoes]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from lexer import TokenBuffer
+from bench_ast import make_program
+
+
+def as_tuples(buffer):
+    return [(t.type, t.value, t.lineno, t.lexpos) for t in buffer.tokens]
+
+
+def best_of(repeat, backend, source):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        TokenBuffer(source, backend=backend)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    # Comentários e strings para exercitar todas as regras
+    source = make_program(n).replace("begin\n", "begin\n    { comentario } writeln('texto ''citado''');\n", 1)
+
+    ply_buf = TokenBuffer(source, backend='ply')
+    fast_buf = TokenBuffer(source, backend='fast')
+    if as_tuples(ply_buf) != as_tuples(fast_buf) or ply_buf.errors != fast_buf.errors:
+        sys.exit("ERRO: os scanners produziram tokens diferentes")
+    tokens = len(ply_buf.tokens)
+
+    t_ply = best_of(repeat, 'ply', source)
+    t_fast = best_of(repeat, 'fast', source)
+    print(f"Fonte: {len(source) / 1024:.0f} KiB, {tokens} tokens (idênticos nos dois scanners)")
+    print(f"{'Scanner':<8} {'Tempo (ms)':>12} {'Tokens/s':>14}")
+    print("-" * 36)
+    print(f"{'ply':<8} {t_ply * 1000:>12.1f} {tokens / t_ply:>14,.0f}")
+    print(f"{'fast':<8} {t_fast * 1000:>12.1f} {tokens / t_fast:>14,.0f}")
+    print(f"\nGanho: {t_ply / t_fast:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
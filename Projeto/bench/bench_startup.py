@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Benchmark do tempo de arranque: cada cenário corre num processo novo e mede-se o
+tempo total (wall time), do lançamento do Python até ao fim do processo.
+O objetivo é que uma compilação curta em modo rápido (-q) fique bem abaixo de 100 ms.
+
+Uso: python bench_startup.py [repeticoes] [ficheiro.pas]
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SRC_DIR = os.path.join(BENCH_DIR, '..', 'src')
+TARGET_MS = 100
+
+
+def best_of(repeat, args):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable] + args, cwd=SRC_DIR, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    source = sys.argv[2] if len(sys.argv) > 2 else os.path.join(BENCH_DIR, '..', 'tests', 'ex1.pas')
+    source = os.path.abspath(source)
+    output = os.path.join(tempfile.mkdtemp(), 'startup.ewvm')
+
+    scenarios = [
+        ("python (sem nada)", ['-c', 'pass']),
+        ("import pipeline", ['-c', 'import pipeline']),
+        ("main.py --help", ['main.py', '--help']),
+        ("main.py -q (compilação)", ['main.py', '-q', '--no-cache', '-o', output, source]),
+        ("main.py (interface rich)", ['main.py', '--no-cache', '-o', output, source]),
+    ]
+
+    print(f"Fonte: {os.path.basename(source)}, melhor de {repeat} execuções")
+    print(f"{'Cenário':<28} {'Tempo (ms)':>12}")
+    print("-" * 42)
+    times = {}
+    for name, args in scenarios:
+        times[name] = best_of(repeat, args)
+        print(f"{name:<28} {times[name] * 1000:>12.1f}")
+
+    quiet = times["main.py -q (compilação)"] * 1000
+    verdict = "OK" if quiet < TARGET_MS else "ACIMA DO OBJETIVO"
+    print(f"\nCompilação rápida: {quiet:.1f} ms (objetivo < {TARGET_MS} ms): {verdict}")
+
+
+if __name__ == "__main__":
+    main()
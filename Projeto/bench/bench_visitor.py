@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark do despacho dos visitantes: tabela pré-calculada (NodeVisitor)
+contra o despacho antigo (f-string + getattr em cada nó, com recursão).
+
+Uso: python bench_visitor.py [num_statements] [repeticoes]
+"""
+import copy
+import os
+import sys
+import time
+from types import GeneratorType
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from parser import parse
+from semantic import SemanticAnalyzer
+from codegen import CodeGenerator
+from optimizer import Optimizer
+from visitor import transform_postorder
+from bench_ast import make_program, count_nodes
+
+
+def legacy_visit(self, node, prefix):
+    """Despacho antigo: nome do método construído e procurado com getattr a cada nó."""
+    if not node: return self.default_result
+    result = getattr(self, f'{prefix}{node.type}', self.generic_visit)(node)
+    if result.__class__ is not GeneratorType:
+        return result
+    # Os métodos atuais são geradores: conduzi-los recursivamente como antes
+    value = None
+    try:
+        while True:
+            value = legacy_visit(self, result.send(value), prefix)
+    except StopIteration as stop:
+        return stop.value
+
+
+class LegacySemantic(SemanticAnalyzer):
+    def visit(self, node):
+        return legacy_visit(self, node, 'visit_')
+
+
+class LegacyCodeGenerator(CodeGenerator):
+    def visit(self, node):
+        return legacy_visit(self, node, 'generate_')
+
+
+class LegacyOptimizer(Optimizer):
+    def optimize(self, node):
+        for i, child in enumerate(node.children):
+            node.children[i] = self.optimize(child)
+        if node.type == 'BinaryOp':
+            return self.fold_BinaryOp(node)
+        elif node.type == 'UnaryOp':
+            return self.fold_UnaryOp(node)
+        elif node.type == 'IfStatement':
+            return self.fold_IfStatement(node)
+        return node
+
+
+def table_fold(tree):
+    """
+    A mesma dobragem com a tabela de despacho (Optimizer.fold_node numa travessia em
+    pós-ordem). Optimizer.optimize também corre o inliner, a propagação, o LICM, a
+    eliminação de código morto e as chamadas finais: não seria uma comparação justa.
+    """
+    return transform_postorder(tree, Optimizer().fold_node)
+
+
+def best_of(repeat, fn, setup=None):
+    """Melhor tempo de 'repeat' execuções; 'setup' prepara o argumento fora da medição."""
+    best = float('inf')
+    for _ in range(repeat):
+        arg = setup() if setup else None
+        start = time.perf_counter()
+        fn(arg)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    ast, errors, _ = parse(make_program(n))
+    if errors or not ast:
+        sys.exit("Programa sintético inválido")
+    nodes = count_nodes(ast)
+
+    # A análise semântica liga os identificadores (node.binding) de que o gerador precisa
+    SemanticAnalyzer().analyze(ast)
+
+    # O otimizador altera a AST, por isso cada execução recebe uma cópia feita fora da medição
+    fresh = lambda: copy.deepcopy(ast)
+    passes = {
+        'semantic': (lambda _: LegacySemantic().analyze(ast), lambda _: SemanticAnalyzer().analyze(ast), None),
+        'optimizer': (lambda t: LegacyOptimizer().optimize(t), table_fold, fresh),
+        'codegen': (lambda _: LegacyCodeGenerator().generate(ast),
+                    lambda _: CodeGenerator().generate(ast), None),
+    }
+
+    print(f"Nós na AST: {nodes}")
+    print(f"{'Fase':<10} {'getattr (nós/s)':>16} {'tabela (nós/s)':>16} {'Ganho':>7}")
+    print("-" * 52)
+    for name, (legacy, table, setup) in passes.items():
+        t_old = best_of(repeat, legacy, setup)
+        t_new = best_of(repeat, table, setup)
+        print(f"{name:<10} {nodes / t_old:>16,.0f} {nodes / t_new:>16,.0f} {t_old / t_new:>6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
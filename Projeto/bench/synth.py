@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Gerador de programas Pascal sintéticos para os benchmarks.
+
+A forma do programa é controlada por parâmetros independentes:
+  statements   - número de comandos no corpo principal
+  depth        - profundidade máxima de aninhamento (if/while/for/begin-end)
+  subprograms  - número de funções e procedimentos (metade de cada)
+  array_size   - tamanho dos arrays (array[1..array_size])
+  width        - número de termos de cada expressão aritmética
+
+Os programas passam na análise semântica e, ao serem executados, terminam e não
+saem dos limites dos arrays (os ciclos são limitados e os índices são constantes
+ou variáveis de controlo de um 'for' de 1 até array_size).
+Cada subprograma usa apenas os seus parâmetros e variáveis locais (o gerador de
+código não dá acesso às globais dentro de funções e procedimentos).
+O gerador é determinístico para a mesma 'seed'.
+
+Uso: python synth.py [statements] [depth] [subprograms] > programa.pas
+"""
+import random
+import sys
+
+NUM_SCALARS = 6
+NUM_ARRAYS = 2
+
+
+class ProgramGenerator:
+    def __init__(self, statements=1000, depth=3, subprograms=4, array_size=100, width=4, seed=0):
+        if array_size < 1 or width < 1 or depth < 0:
+            raise ValueError("array_size e width têm de ser >= 1 e depth >= 0")
+        self.statements = statements
+        self.depth = depth
+        self.subprograms = subprograms
+        self.array_size = array_size
+        self.width = width
+        self.rng = random.Random(seed)
+        self.functions = [] # Nomes das funções (f(x, y: integer): integer)
+        self.procedures = [] # Nomes dos procedimentos (p(x: integer))
+        self.counter = '' # Prefixo das variáveis de controlo dos ciclos (único por subprograma)
+        # Variáveis visíveis no escopo atual: o gerador de código só dá acesso aos
+        # parâmetros e locais dentro de um subprograma, por isso cada escopo usa as suas
+        self.scalars = [f"a{k}" for k in range(NUM_SCALARS)]
+        self.targets = self.scalars # Escalares que podem ser atribuídos
+        self.arrays = [f"v{k}" for k in range(NUM_ARRAYS)]
+        self.flag = "flag"
+
+    # Expressões
+    def term(self, loop_var=None):
+        rng = self.rng
+        choice = rng.random()
+        if choice < 0.3:
+            return str(rng.randint(0, 99))
+        if choice < 0.6:
+            return rng.choice(self.scalars)
+        if choice < 0.85:
+            index = loop_var if loop_var else str(rng.randint(1, self.array_size))
+            return f"{rng.choice(self.arrays)}[{index}]"
+        if self.functions:
+            return f"{rng.choice(self.functions)}({rng.choice(self.scalars)}, {rng.randint(0, 9)})"
+        return f"({rng.randint(1, 9)} * {rng.choice(self.scalars)})"
+
+    def expression(self, loop_var=None, width=None):
+        rng = self.rng
+        width = width or self.width
+        parts = [self.term(loop_var)]
+        for _ in range(width - 1):
+            op = rng.choice(('+', '-', '*', 'div', 'mod'))
+            if op in ('div', 'mod'):
+                # Divisor constante e não nulo
+                parts.append(f"{op} {rng.randint(1, 9)}")
+            else:
+                parts.append(f"{op} {self.term(loop_var)}")
+        # Mantém os valores pequenos (evita overflow na execução)
+        return f"({' '.join(parts)}) mod 1000"
+
+    def condition(self, loop_var=None):
+        rng = self.rng
+        op = rng.choice(('<', '<=', '>', '>=', '=', '<>'))
+        cond = f"{self.term(loop_var)} {op} {rng.randint(0, 99)}"
+        if rng.random() < 0.3:
+            cond = f"({cond}) and ({rng.choice(self.scalars)} <> {rng.randint(0, 9)})"
+        return cond
+
+    # Comandos
+    def simple_statement(self, loop_var=None):
+        rng = self.rng
+        choice = rng.random()
+        if choice < 0.55:
+            return f"{rng.choice(self.targets)} := {self.expression(loop_var)}"
+        if choice < 0.8:
+            index = loop_var if loop_var else str(rng.randint(1, self.array_size))
+            return f"{rng.choice(self.arrays)}[{index}] := {self.expression(loop_var)}"
+        if choice < 0.9 and self.procedures:
+            return f"{rng.choice(self.procedures)}({self.expression(loop_var, 1)})"
+        return f"{self.flag} := {self.condition(loop_var)}"
+
+    def statement(self, level, indent, loop_var=None, force_depth=False):
+        """Devolve as linhas de um comando; aninha até 'self.depth' níveis."""
+        rng = self.rng
+        pad = "    " * indent
+        if level >= self.depth or (not force_depth and rng.random() < 0.5):
+            return [pad + self.simple_statement(loop_var)]
+
+        kind = rng.choice(('if', 'for', 'while', 'block'))
+        inner = level + 1
+        if kind == 'if':
+            lines = [f"{pad}if {self.condition(loop_var)} then"]
+            lines += self.statement(inner, indent + 1, loop_var, force_depth)
+            if rng.random() < 0.5:
+                lines.append(f"{pad}else")
+                lines += self.statement(inner, indent + 1, loop_var)
+            return lines
+        if kind == 'for':
+            var = f"{self.counter}i{level}"
+            lines = [f"{pad}for {var} := 1 to {self.array_size} do"]
+            return lines + self.statement(inner, indent + 1, var, force_depth)
+        if kind == 'while':
+            # Contador próprio por nível: o ciclo termina sempre.
+            # O begin-end exterior faz da inicialização + while um único comando.
+            var = f"{self.counter}w{level}"
+            body = self.statement(inner, indent + 2, loop_var, force_depth)
+            body[-1] += ";"
+            return ([f"{pad}begin", f"{pad}    {var} := 0;", f"{pad}    while {var} < {rng.randint(1, 5)} do",
+                     f"{pad}    begin"] + body + [f"{pad}        {var} := {var} + 1", f"{pad}    end", f"{pad}end"])
+        body = []
+        for _ in range(rng.randint(2, 3)):
+            body.append(self.statement(inner, indent + 1, loop_var, force_depth))
+            force_depth = False
+        lines = [f"{pad}begin"]
+        for i, stmt in enumerate(body):
+            if i < len(body) - 1:
+                stmt[-1] += ";"
+            lines += stmt
+        return lines + [f"{pad}end"]
+
+    def statement_list(self, count, indent):
+        lines = []
+        for k in range(count):
+            # Um em cada dez comandos atinge sempre a profundidade máxima
+            stmt = self.statement(0, indent, force_depth=(k % 10 == 0))
+            if k < count - 1:
+                stmt[-1] += ";"
+            lines += stmt
+        return lines
+
+    # Programa
+    def counters(self):
+        levels = range(max(self.depth, 1))
+        return ", ".join([f"{self.counter}i{k}" for k in levels] + [f"{self.counter}w{k}" for k in levels])
+
+    def declarations(self, scalars, indent=1):
+        pad = "    " * indent
+        lines = ["var", f"{pad}{', '.join(scalars)}, {self.counters()}: integer;"]
+        for name in self.arrays:
+            lines.append(f"{pad}{name}: array[1..{self.array_size}] of integer;")
+        lines.append(f"{pad}{self.flag}: boolean;")
+        return lines
+
+    def subprogram(self, k):
+        rng = self.rng
+        body_size = rng.randint(2, 5)
+        is_function = k % 2 == 0
+        name = f"f{k}" if is_function else f"p{k}"
+        params = ["x", "y"] if is_function else ["x"]
+
+        # Escopo do subprograma: parâmetros + locais com nomes próprios (uma chamada
+        # dentro de um ciclo nunca altera a variável de controlo de quem chamou)
+        saved = (self.scalars, self.targets, self.arrays, self.flag)
+        self.counter = name + "_"
+        local_scalars = [f"{name}_t{j}" for j in range(2)]
+        self.scalars = params + local_scalars
+        self.targets = local_scalars
+        self.arrays = [f"{name}_v"]
+        self.flag = f"{name}_flag"
+
+        if is_function:
+            lines = [f"function {name}({', '.join(params)}: integer): integer;"]
+            result = f"{name} := ({self.expression(width=2)} + y) mod 1000"
+        else:
+            lines = [f"procedure {name}(x: integer);"]
+            result = f"{local_scalars[0]} := x mod 1000"
+        lines += self.declarations(local_scalars)
+        lines.append("begin")
+        body = self.statement_list(body_size, 1)
+        body[-1] += ";"
+        lines += body
+        lines += [f"    {result}", "end;", ""]
+
+        self.scalars, self.targets, self.arrays, self.flag = saved
+        self.counter = ''
+        # Só a partir daqui pode ser chamado (sem recursão)
+        (self.functions if is_function else self.procedures).append(name)
+        return lines
+
+    def generate(self):
+        lines = ["program Synth;", ""]
+        lines += self.declarations(self.scalars)
+        lines.append("")
+        for k in range(self.subprograms):
+            lines += self.subprogram(k)
+        lines.append("begin")
+        lines += self.statement_list(self.statements, 1)
+        lines.append("end.")
+        return "\n".join(lines) + "\n"
+
+
+def generate_program(statements=1000, depth=3, subprograms=4, array_size=100, width=4, seed=0):
+    """Atalho: devolve o texto de um programa sintético com a forma pedida."""
+    return ProgramGenerator(statements, depth, subprograms, array_size, width, seed).generate()
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:4]]
+    sys.stdout.write(generate_program(*args))
@@ -0,0 +1,152 @@
+import hashlib
+import os
+import pickle
+
+# Versão do formato das entradas; incrementar quando a estrutura guardada mudar.
+CACHE_FORMAT = 3
+
+# Módulos cujo código influencia o resultado da compilação
+# (um por linha; um módulo novo do compilador entra aqui no mesmo commit)
+COMPILER_MODULES = (
+    'lexer.py',
+    'lextab.py',
+    'scanner.py',
+    'parser.py',
+    'parsetab.pickle',
+    'visitor.py',
+    'semantic.py',
+    'typesystem.py',
+    'optimizer.py',
+    'inliner.py',
+    'propagation.py',
+    'deadcode.py',
+    'licm.py',
+    'tailcall.py',
+    'codegen.py',
+    'sinks.py',
+    'sourcemap.py',
+    'peephole.py',
+    'pipeline.py',
+)
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    'PLC_CACHE_DIR',
+    os.path.join(os.path.expanduser('~'), '.cache', 'plc-pascal'),
+)
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+_fingerprint = None
+
+
+def compiler_fingerprint(version):
+    """
+    Identifica a versão do compilador: a constante de versão mais o conteúdo dos módulos.
+    Assim uma alteração ao compilador invalida a cache sem ser preciso lembrar de mudar a versão.
+    """
+    global _fingerprint
+    if _fingerprint is None:
+        digest = hashlib.sha256(f"{version}:{CACHE_FORMAT}".encode())
+        src_dir = os.path.dirname(os.path.abspath(__file__))
+        for name in COMPILER_MODULES:
+            try:
+                with open(os.path.join(src_dir, name), 'rb') as f:
+                    digest.update(f.read())
+            except OSError:
+                digest.update(name.encode())
+        _fingerprint = digest.hexdigest()
+    return _fingerprint
+
+
+class ArtifactCache:
+    """
+    Cache em disco, endereçada pelo conteúdo (hash da fonte + versão + flags).
+    Cada entrada é um ficheiro pickle com os artefactos de todas as fases.
+    A ordem LRU é dada pelo mtime: uma leitura "toca" no ficheiro; ao exceder
+    'max_bytes', as entradas menos usadas recentemente são removidas.
+    """
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def make_key(self, source_code, version, flags):
+        """'flags' é um dicionário (ex: {'no_opt': False}); a ordem das chaves não importa."""
+        digest = hashlib.sha256()
+        digest.update(compiler_fingerprint(version).encode())
+        digest.update(repr(sorted(flags.items())).encode())
+        digest.update(source_code.encode('utf-8'))
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key + '.pkl')
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                entry = pickle.load(f)
+        except (OSError, pickle.PickleError, EOFError, AttributeError, ImportError):
+            self.misses += 1
+            return None
+
+        try:
+            os.utime(path) # Marca como usado recentemente (LRU)
+        except OSError:
+            pass
+        self.hits += 1
+        return entry
+
+    def put(self, key, entry):
+        path = self._path(key)
+        # Escrita atómica: vários processos (modo batch) podem escrever ao mesmo tempo
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except (OSError, pickle.PickleError, RecursionError):
+            # A cache é apenas uma otimização: uma falha aqui não pode parar a compilação
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return
+        self.evict()
+
+    def evict(self):
+        """Remove as entradas menos usadas recentemente até caber em 'max_bytes'."""
+        entries = []
+        total = 0
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith('.pkl'):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+            total += st.st_size
+
+        if total <= self.max_bytes:
+            return
+
+        entries.sort() # Mais antigos primeiro
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+    def clear(self):
+        for name in os.listdir(self.cache_dir):
+            if name.endswith('.pkl'):
+                try:
+                    os.remove(os.path.join(self.cache_dir, name))
+                except OSError:
+                    pass
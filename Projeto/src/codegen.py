@@ -1,25 +1,152 @@
-class CodeGenerator:
+from types import GeneratorType
+
+from visitor import NodeVisitor
+from parser import Node
+from typesystem import INTEGER, REAL, STRING
+from sinks import ListSink
+from sourcemap import Origin, NO_ORIGIN
+
+# Nós que mudam a origem das instruções (mapa de origem): comandos e subprogramas
+TRACKED_NODES = frozenset((
+    'Program', 'FunctionDeclaration', 'ProcedureDeclaration',
+    'AssignmentStatement', 'IfStatement', 'WhileStatement', 'ForStatement',
+    'ReadStatement', 'WriteStatement', 'ProcedureCall', 'TailCall',
+))
+LOOP_NODES = ('WhileStatement', 'ForStatement')
+LITERALS = ('IntegerConstant', 'NumericConst', 'BooleanConstant')
+
+# Instruções dos operadores binários (o tipo de cada expressão vem da análise semântica)
+INTEGER_OPS = {'+': 'ADD', '-': 'SUB', '*': 'MUL', 'DIV': 'DIV', 'MOD': 'MOD',
+               '=': 'EQUAL', '<': 'INF', '>': 'SUP', '<=': 'INFEQ', '>=': 'SUPEQ',
+               'AND': 'AND', 'OR': 'OR'}
+REAL_OPS = {'+': 'FADD', '-': 'FSUB', '*': 'FMUL', '/': 'FDIV',
+            '=': 'EQUAL', '<': 'FINF', '>': 'FSUP', '<=': 'FINFEQ', '>=': 'FSUPEQ'}
+# Conversão da linha lida (READ dá uma string) para o tipo da variável
+READ_CONVERSIONS = {INTEGER: 'ATOI', REAL: 'ATOF'}
+# Comparação com o resultado oposto (para saltar quando a condição é verdadeira só há JZ)
+NEGATED_COMPARISON = {'=': '<>', '<>': '=', '<': '>=', '>=': '<', '>': '<=', '<=': '>'}
+# Podem falhar em runtime (divisão por zero, índice fora da string) ou ter efeitos
+UNSAFE_NODES = ('FunctionCall', 'ArrayAccess')
+DIVISIONS = ('DIV', 'MOD', '/')
+
+
+def _is_literal(node):
+    return node.type in LITERALS
+
+
+def _is_safe(node):
+    """Avaliar 'node' não tem efeitos nem pode falhar (pode ser avaliado mesmo que não seja preciso)."""
+    pending = [node]
+    while pending:
+        item = pending.pop()
+        if item.type in UNSAFE_NODES or (item.type == 'BinaryOp' and item.leaf in DIVISIONS):
+            return False
+        pending.extend(item.children)
+    return True
+
+
+def _limit_slots(body):
+    """
+    Número de espaços escondidos para os limites dos ciclos for de um corpo: a maior
+    profundidade de ciclos for aninhados com limite não constante (ciclos irmãos
+    reutilizam o mesmo espaço). Só percorre comandos, não expressões.
+    """
+    deepest = 0
+    pending = [(body, 0)]
+    while pending:
+        node, depth = pending.pop()
+        kind = getattr(node, 'type', None)
+        if kind == 'ForStatement':
+            if not _is_literal(node.children[2]):
+                depth += 1
+                deepest = max(deepest, depth)
+            pending.append((node.children[3], depth))
+        elif kind == 'WhileStatement':
+            pending.append((node.children[1], depth))
+        elif kind == 'IfStatement':
+            pending.extend((child, depth) for child in node.children[1:])
+        elif kind in ('CompoundStatement', 'TailLoop'):
+            pending.extend((child, depth) for child in node.children)
+    return deepest
+
+
+class CodeGenerator(NodeVisitor):
     """
     Módulo final do compilador: Traduz a AST para instruções da VM (EWVM).
     Responsabilidades:
     1. Gerir alocação de endereços (Globais vs Locais).
     2. Traduzir controlo de fluxo (If/While) para Saltos e Labels.
     3. Gerar instruções de pilha (PUSH, STORE, OP).
+    Os identificadores já vêm resolvidos da análise semântica (node.binding, ver
+    semantic.Binding): nenhum nome é procurado aqui.
     """
-    def __init__(self, symbol_table):
-        self.symbol_table = symbol_table
-        self.code = []
+    visit_prefix = 'generate_'
+
+    def __init__(self, sink=None, source_map=False):
+        # Destino das instruções (ver sinks.py): por omissão uma lista em memória
+        self.sink = sink if sink is not None else ListSink()
+        self.code = getattr(self.sink, 'code', None) # Só existe quando o destino é uma lista
+        # Com source_map=True o destino recebe marcas de origem (linha, subprograma, ciclos)
+        self.track_source = source_map
+        self.origin = NO_ORIGIN
         self.label_counter = 0
-        self.variable_offsets = {} # Mapa: Nome -> Endereço (Offset)
         self.current_offset = 0 # Próximo endereço livre no escopo atual
-        self.procedure_starts = {} # Mapa: Nome Função -> Label de Início (ex: "soma" -> "L5")
+        self.procedure_starts = {} # Mapa: Ligação do subprograma -> Label de Início (ex: soma -> "L5")
+        self.subprogram = None # Nome do subprograma a ser gerado (None no programa principal)
+        self.parameters = [] # Ligações dos parâmetros do subprograma atual, pela ordem da declaração
+        self.tail_entry = None # Etiqueta do início do corpo (destino das chamadas finais, ver tailcall.py)
+        self.limit_base = 0 # Offset do primeiro espaço escondido para os limites dos ciclos for
+        self.limit_depth = 0 # Ciclos for com limite guardado em que estamos (índice do próximo espaço)
 
     def generate(self, ast):
-        self.visit(ast)
+        """Gera o código para o destino; devolve a lista de instruções se o destino for uma lista."""
+        try:
+            self.visit(ast)
+        finally:
+            self.sink.close()
         return self.code
 
+    @property
+    def source_map(self):
+        """Mapa de origem das instruções (sourcemap.SourceMap), ou None sem source_map=True."""
+        return self.sink.source_map
+
     def emit(self, instruction):
-        self.code.append(instruction)
+        self.sink.emit(instruction)
+
+    # Mapa de origem
+    # Os métodos dos nós em TRACKED_NODES são embrulhados (uma vez, na cache de despacho)
+    # para marcarem a origem ao entrar e repor a do pai ao sair. Sem source_map não há
+    # embrulho nenhum, por isso a geração normal não paga nada.
+    def _method_for(self, node_type):
+        method = super()._method_for(node_type)
+        if self.track_source and node_type in TRACKED_NODES:
+            method = self._visit_cache[node_type] = self._tracked(method)
+        return method
+
+    def _tracked(self, method):
+        def tracked(node):
+            parent = self.origin
+            line = node.lineno if node.lineno is not None else parent.line
+            subprogram = parent.subprogram
+            loops = parent.loops
+            if node.type in ('FunctionDeclaration', 'ProcedureDeclaration'):
+                subprogram = node.leaf
+                loops = ()
+            elif node.type in LOOP_NODES:
+                loops = loops + (line,)
+            self._set_origin(Origin(line, subprogram, loops))
+            result = method(node)
+            if result.__class__ is GeneratorType:
+                result = yield from result
+            self._set_origin(parent)
+            return result
+        return tracked
+
+    def _set_origin(self, origin):
+        if origin != self.origin:
+            self.origin = origin
+            self.sink.mark(origin)
 
     def create_label(self):
         """Gera uma etiqueta única (L0, L1...) para usar em JUMP/JZ."""
@@ -28,43 +155,52 @@ class CodeGenerator:
         return label
 
     # Padrão Visitor
-    def visit(self, node):
-        if not node: return
-        method_name = f'generate_{node.type}'
-        visitor = getattr(self, method_name, self.generic_visit)
-        return visitor(node)
-
-    def generic_visit(self, node):
-        for child in node.children:
-            self.visit(child)
+    # 'visit' e 'generic_visit' vêm do NodeVisitor: despacham para generate_TipoDoNo.
+    # Os métodos que visitam filhos fazem 'yield filho' (ou 'yield from' nos helpers)
+    # para que a travessia use a pilha explícita do NodeVisitor em vez de recursão.
 
     # Helpers de Contexto e Memória
     def _is_local(self):
         """
-        Deteta se estamos a gerar código para dentro de uma função.
-        Lógica: Se a variável especial '$return' existe no mapa de offsets, 
-        é porque estamos no escopo de uma função.
+        Deteta se estamos a gerar código para dentro de uma função ou procedimento.
+        Aí as variáveis (locais e parâmetros) são relativas ao FP.
         """
-        return '$return' in self.variable_offsets
+        return self.subprogram is not None
 
-    def _emit_var_addr(self, offset):
+    def _emit_var_addr(self, binding):
         """
         Gera instruções para colocar o endereço de memória de uma variável na pilha.
         Usa FP (Frame Pointer) para locais/params e GP (Global Pointer) para globais.
         """
-        if offset < 0 or self._is_local():
+        if binding.depth:
             self.emit("PUSHFP") 
         else:
             self.emit("PUSHGP")
-        self.emit(f"PUSHI {offset}")
+        self.emit(f"PUSHI {binding.slot}")
         self.emit("PADD") # Soma Base + Offset para obter o endereço final
 
+    def _emit_load(self, binding, offset=0):
+        """
+        Valor de uma variável: PUSHL no frame de um subprograma, PUSHG nas globais.
+        'offset' é a posição dentro da variável (elemento de um array com índice constante).
+        """
+        if binding.depth:
+            self.emit(f"PUSHL {binding.slot + offset}")
+        else:
+            self.emit(f"PUSHG {binding.slot + offset}")
+
+    def _emit_store(self, binding, offset=0):
+        if binding.depth:
+            self.emit(f"STOREL {binding.slot + offset}")
+        else:
+            self.emit(f"STOREG {binding.slot + offset}")
+
     # Estrutura do Programa
     def generate_Program(self, node):
         self.emit("PUSHI 0") # Espaço para valor de retorno do programa (não usado, mas padrão)
         self.emit("PUSHI 0") # Espaço para argumentos de linha de comando
         self.emit("START")
-        self.visit(node.children[0]) # Visita o bloco principal
+        yield node.children[0] # Visita o bloco principal
         self.emit("STOP")
 
     def generate_Block(self, node):
@@ -74,15 +210,24 @@ class CodeGenerator:
         # 3. Definir as funções.
         # 4. Executar o corpo principal (Main).
         
-        self.visit(node.children[1]) # Processa Declarações Globais (aloca espaço)
+        yield node.children[1] # Processa Declarações Globais (aloca espaço)
+
+        # Espaços escondidos para os limites dos ciclos for (um por nível de aninhamento)
+        limit_base = self.current_offset
+        limit_slots = _limit_slots(node.children[2])
+        if limit_slots:
+            self.current_offset += limit_slots
+            self.emit(f"PUSHN {limit_slots}")
         
         lbl_main = self.create_label()
         self.emit(f"JUMP {lbl_main}")
         
-        self.visit(node.children[0]) # Gera código das Funções/Procedimentos
+        yield node.children[0] # Gera código das Funções/Procedimentos
         
         self.emit(f"{lbl_main}:") # Início do Main
-        self.visit(node.children[2]) # Gera código do corpo principal
+        self.limit_base = limit_base
+        self.limit_depth = 0
+        yield node.children[2] # Gera código do corpo principal
 
     def generate_Declarations(self, node):
         """Calcula espaço total necessário para variáveis e reserva na pilha (PUSHN)."""
@@ -97,22 +242,17 @@ class CodeGenerator:
             self.emit(f"PUSHN {total_space}")
 
     def process_declaration(self, node):
-        """Regista offsets das variáveis e calcula tamanho (suporta arrays)."""
+        """Atribui os offsets das variáveis e calcula o tamanho (suporta arrays)."""
         id_list = node.children[0]
-        type_node = node.children[1]
-        
-        # Calcula tamanho do tipo (1 para simples, N para arrays)
-        size = 1 
-        if type_node.type == 'ArrayType':
-             r_min, r_max = type_node.leaf
-             size = (r_max - r_min) + 1
-
         ids = id_list.children if id_list.type == 'IDList' else [id_list]
+        # Tamanho do tipo (1 para simples, N para arrays), já calculado no typesystem
+        size = ids[0].binding.type.size
         
-        # Atribui offset a cada variável declarada
+        # Atribui offset a cada variável declarada. A análise semântica já deu um, mas o
+        # Otimizador pode ter removido ou acrescentado variáveis: arruma-se outra vez.
+        # A ligação é partilhada por todos os usos, que passam a ver o offset final.
         for id_node in ids:
-            var_name = id_node.leaf
-            self.variable_offsets[var_name] = self.current_offset
+            id_node.binding.slot = self.current_offset
             self.current_offset += size
             
         return size * len(ids) # Retorna espaço total usado nesta declaração
@@ -120,13 +260,13 @@ class CodeGenerator:
     # Subprogramas
     def generate_FunctionDeclarations(self, node):
         for child in node.children:
-            self.visit(child)
+            yield child
 
     def generate_ProcedureDeclaration(self, node):
-        self._generate_subprogram(node, is_function=False)
+        yield from self._generate_subprogram(node, is_function=False)
 
     def generate_FunctionDeclaration(self, node):
-        self._generate_subprogram(node, is_function=True)
+        yield from self._generate_subprogram(node, is_function=True)
 
     def _generate_subprogram(self, node, is_function):
         name = node.leaf
@@ -135,71 +275,83 @@ class CodeGenerator:
 
         # 1. Label e Registo
         lbl = self.create_label()
-        self.procedure_starts[name] = lbl
+        self.procedure_starts[node.binding] = lbl
         self.emit(f"{lbl}:")
 
         # 2. Context Switch (Salvar estado anterior)
         old_offset = self.current_offset
-        old_vars = self.variable_offsets.copy()
-        self.variable_offsets = {} 
+        old_subprogram = self.subprogram
+        old_parameters = self.parameters
+        self.subprogram = name
 
         # 3. Extrair Lista de Parâmetros
+        # Os offsets (negativos: o último em -1, o penúltimo em -2, ...) e o do
+        # resultado das funções, -(numero_de_argumentos + 1), vêm da análise semântica
         flat_params = []
         if params.children:
              for param in params.children:
                  id_list = param.children[0]
                  ids = id_list.children if id_list.type == 'IDList' else [id_list]
                  for id_node in ids:
-                     flat_params.append(id_node.leaf)
+                     flat_params.append(id_node.binding)
         
-        # 4. Mapear Parâmetros (Offsets Negativos: -1, -2...)
-        # Exemplo: Se tiveres 2 argumentos, eles ficam em -1 e -2.
-        p_offset = -1
-        for param_name in reversed(flat_params):
-            self.variable_offsets[param_name] = p_offset
-            p_offset -= 1
-
-        # 5. Mapear Retorno (Dica do Prof)
-        if is_function:
-            # O espaço reservado pelo chamador (PUSHI 0) está logo abaixo dos argumentos.
-            # O offset é: -(numero_de_argumentos + 1)
-            return_offset = -(len(flat_params) + 1)
-            
-            # Mapeamos o nome da função e o alias $return para esse offset
-            self.variable_offsets[name] = return_offset
-            self.variable_offsets['$return'] = return_offset 
+        self.parameters = flat_params
 
-        # 6. Variáveis locais (Offsets Positivos começam em 0)
+        # 4. Variáveis locais (Offsets Positivos começam em 0)
         self.current_offset = 0 
 
-        # 7. Gerar Corpo
-        self.visit(body) 
+        # 5. Gerar Corpo
+        yield body 
 
-        # 8. Epílogo
+        # 6. Epílogo
         self.emit("RETURN")
         
-        # 9. Restaurar Contexto
+        # 7. Restaurar Contexto
         self.current_offset = old_offset
-        self.variable_offsets = old_vars
+        self.subprogram = old_subprogram
+        self.parameters = old_parameters
+
+    # Chamadas finais (tailcall.py)
+    def generate_TailLoop(self, node):
+        """Corpo de um subprograma com chamadas finais: etiqueta depois da reserva das locais."""
+        old_entry = self.tail_entry
+        self.tail_entry = self.create_label()
+        self.emit(f"{self.tail_entry}:")
+        yield node.children[0]
+        self.tail_entry = old_entry
+
+    def generate_TailCall(self, node):
+        """
+        Chamada a si próprio no fim do corpo: argumentos -> parâmetros, locais a 0 (como
+        o PUSHN de uma chamada nova) e salto para o início.
+        """
+        args = node.children[0].children
+        # Todos os argumentos são avaliados antes de alterar qualquer parâmetro
+        yield from self._push_args(node.binding, args)
+        for param in reversed(self.parameters):
+            self.emit(f"STOREL {param.slot}")
+        for id_node in node.children[1].children:
+            self.emit("PUSHI 0")
+            self._emit_store(id_node.binding)
+        self.emit(f"JUMP {self.tail_entry}")
 
     # Estruturas de Controlo
     def generate_CompoundStatement(self, node):
         for child in node.children:
-            self.visit(child)
+            yield child
 
     def generate_IfStatement(self, node):
         lbl_else = self.create_label()
         lbl_end = self.create_label()
         
-        self.visit(node.children[0]) # Gera código da condição
-        self.emit(f"JZ {lbl_else}")  # Se 0 (falso), salta para o Else
+        yield self._jump_if(node.children[0], lbl_else, False) # Se falso, salta para o Else
         
-        self.visit(node.children[1]) # Bloco Then
+        yield node.children[1] # Bloco Then
         self.emit(f"JUMP {lbl_end}") # Salta por cima do Else
         
         self.emit(f"{lbl_else}:")
         if len(node.children) > 2:
-            self.visit(node.children[2]) # Bloco Else
+            yield node.children[2] # Bloco Else
             
         self.emit(f"{lbl_end}:")
 
@@ -208,27 +360,39 @@ class CodeGenerator:
         lbl_end = self.create_label()
         
         self.emit(f"{lbl_start}:")
-        self.visit(node.children[0]) # Condição
-        self.emit(f"JZ {lbl_end}")   # Se falso, sai do loop
+        yield self._jump_if(node.children[0], lbl_end, False) # Se falso, sai do loop
         
-        self.visit(node.children[1]) # Corpo
+        yield node.children[1] # Corpo
         self.emit(f"JUMP {lbl_start}") # Volta ao início
         
         self.emit(f"{lbl_end}:")
 
     def generate_ForStatement(self, node):
         # Inicialização
-        var_node = node.children[0]
-        name = var_node.leaf
-        offset = self.variable_offsets.get(name)
+        var = node.children[0].binding
         direction = node.leaf # 'to' ou 'downto'
+        limit = node.children[2]
         
         # Determina se é variável local ou global
-        is_stack = self._is_local() or offset < 0
-        instr_store = f"STOREL {offset}" if is_stack else f"STOREG {offset}"
-        instr_push = f"PUSHL {offset}" if is_stack else f"PUSHG {offset}"
+        is_stack = var.depth > 0
+        instr_store = f"STOREL {var.slot}" if is_stack else f"STOREG {var.slot}"
+        instr_push = f"PUSHL {var.slot}" if is_stack else f"PUSHG {var.slot}"
 
-        self.visit(node.children[1]) # Valor inicial
+        yield node.children[1] # Valor inicial
+        if _is_literal(limit):
+            instr_limit = None
+        else:
+            # O limite é avaliado uma só vez, antes da atribuição inicial (como em Pascal),
+            # e guardado num espaço escondido; o teste só o volta a carregar
+            slot = self.limit_base + self.limit_depth
+            self.limit_depth += 1
+            yield limit
+            if self._is_local():
+                self.emit(f"STOREL {slot}")
+                instr_limit = f"PUSHL {slot}"
+            else:
+                self.emit(f"STOREG {slot}")
+                instr_limit = f"PUSHG {slot}"
         self.emit(instr_store)
 
         # Teste e Corpo
@@ -237,14 +401,17 @@ class CodeGenerator:
 
         self.emit(f"{lbl_loop}:")
         self.emit(instr_push)        # Carrega variável de controlo
-        self.visit(node.children[2]) # Carrega limite
+        if instr_limit is None:
+            yield limit # Constante: carrega-a diretamente
+        else:
+            self.emit(instr_limit) # Carrega limite
         
         # Comparação (<= para to, >= para downto)
         if direction == 'to': self.emit("INFEQ")
         else: self.emit("SUPEQ")
         self.emit(f"JZ {lbl_end}") # Se condição falhar, sai
 
-        self.visit(node.children[3]) # Executa corpo
+        yield node.children[3] # Executa corpo
 
         # Atualização (Passo)
         self.emit(instr_push)
@@ -255,112 +422,122 @@ class CodeGenerator:
         
         self.emit(f"JUMP {lbl_loop}")
         self.emit(f"{lbl_end}:")
+        if instr_limit is not None:
+            self.limit_depth -= 1
 
     # Acessos (Arrays e Strings)
     def generate_ArrayAccess(self, node):
-        name = node.leaf
-        info = self.symbol_table.lookup(name)
+        binding = node.binding
         
         # Caso Especial: Strings (Usa CHARAT em vez de LOAD)
-        if info and info.get('type') == 'string':
-            offset = self.variable_offsets.get(name)
-            if self._is_local() or offset < 0:
-                self.emit(f"PUSHL {offset}")
-            else:
-                self.emit(f"PUSHG {offset}")
+        if binding.type is STRING:
+            self._emit_load(binding)
             
             # Índice (ajuste 1-based do Pascal)
-            self.visit(node.children[0])
+            yield node.children[0]
             self.emit("PUSHI 1")
             self.emit("SUB")
             
             self.emit("CHARAT") 
             return
 
+        # Índice constante: o endereço do elemento já se sabe
+        offset = self._element_offset(node)
+        if offset is not None:
+            self._emit_load(binding, offset)
+            return
+
         # Arrays Normais: Calcula endereço e carrega valor
-        self._calc_array_addr(node)
+        yield from self._calc_array_addr(node)
         self.emit("LOAD 0") 
 
+    def _element_offset(self, node):
+        """
+        Posição do elemento dentro do array quando o índice é uma constante dentro dos
+        limites ((índice - LimiteInferior) * Passo, calculado aqui); None caso contrário.
+        """
+        index = node.children[0]
+        t = node.binding.type
+        if not t.is_array or index.type not in ('IntegerConstant', 'NumericConst'):
+            return None
+        if not t.low <= index.leaf <= t.high:
+            return None # Fora dos limites: fica o cálculo normal do endereço
+        return (index.leaf - t.low) * t.stride
+
     def _calc_array_addr(self, node):
         """Calcula o endereço de memória absoluto de um elemento do array."""
-        name = node.leaf
-        offset = self.variable_offsets.get(name)
-        self._emit_var_addr(offset) # Coloca endereço base na pilha
+        binding = node.binding
+        self._emit_var_addr(binding) # Coloca endereço base na pilha
         
-        self.visit(node.children[0]) # Coloca índice na pilha
+        yield node.children[0] # Coloca índice na pilha
         
         # Ajuste do limite inferior (ex: array[10..20], índice 10 vira offset 0)
-        info = self.symbol_table.lookup(name)
-        if info and isinstance(info.get('type'), dict):
-             r_min = info['type']['range'][0]
-             if r_min != 0:
-                 self.emit(f"PUSHI {r_min}")
-                 self.emit("SUB")
+        r_min = binding.low
+        if r_min != 0:
+            self.emit(f"PUSHI {r_min}")
+            self.emit("SUB")
+        # Elementos com mais de um espaço (arrays de arrays): passo já calculado no tipo
+        stride = binding.type.stride if binding.type.is_array else 1
+        if stride != 1:
+            self.emit(f"PUSHI {stride}")
+            self.emit("MUL")
         
-        self.emit("PADD") # Endereço Final = Base + (Índice - LimiteInferior)
+        self.emit("PADD") # Endereço Final = Base + (Índice - LimiteInferior) * Passo
 
     # Operações e Atribuições
     def generate_AssignmentStatement(self, node):
         var_node = node.children[0]
         expr = node.children[1]
 
-        if var_node.type == 'ArrayAccess':
+        offset = self._element_offset(var_node) if var_node.type == 'ArrayAccess' else None
+        if offset is not None:
+            # Elemento com índice constante: guarda-se diretamente na sua posição
+            yield expr
+            self._coerce(var_node.value_type, expr)
+            self._emit_store(var_node.binding, offset)
+        elif var_node.type == 'ArrayAccess':
             # Atribuição a Array: array[i] := expr
-            self._calc_array_addr(var_node) # Calcula destino
-            self.visit(expr)                # Calcula valor
+            yield from self._calc_array_addr(var_node) # Calcula destino
+            yield expr                                 # Calcula valor
+            self._coerce(var_node.value_type, expr)
             self.emit("STORE 0")            # Guarda valor no endereço
         else:
             # Atribuição Simples: var := expr
-            self.visit(expr)
-            name = var_node.leaf
-            off = self.variable_offsets.get(name)
-            if self._is_local() or off < 0:
-                self.emit(f"STOREL {off}")
-            else:
-                self.emit(f"STOREG {off}")
+            yield expr
+            self._coerce(var_node.value_type, expr)
+            self._emit_store(var_node.binding)
+
+    def _coerce(self, expected, expr):
+        """Converte o valor de 'expr' (já na pilha) para real se for um inteiro onde se espera um real."""
+        if expected is REAL and expr.value_type is INTEGER:
+            self.emit("ITOF")
 
     def generate_ReadStatement(self, node):
         for var in node.children:
-            if var.type == 'ArrayAccess':
-                self._calc_array_addr(var) # Prepara endereço se for array
+            offset = self._element_offset(var) if var.type == 'ArrayAccess' else None
+            if var.type == 'ArrayAccess' and offset is None:
+                yield from self._calc_array_addr(var) # Prepara endereço se for array
             
             self.emit("READ") # Lê input do utilizador
             
-            # Converte para inteiro se necessário (simplificação)
-            var_name = var.leaf
-            info = self.symbol_table.lookup(var_name)
-            is_int = True
-            if info:
-                t = info['type']
-                if isinstance(t, dict) and t.get('kind') == 'array':
-                    if t.get('elem_type') != 'integer': is_int = False
-                elif t == 'string': is_int = False
-            
-            if is_int: self.emit("ATOI") # ASCII to Integer
+            # Converte a linha lida para o tipo da variável (as strings ficam como estão)
+            conversion = READ_CONVERSIONS.get(var.value_type)
+            if conversion: self.emit(conversion) # ASCII to Integer / Float
 
-            if var.type == 'ArrayAccess':
+            if var.type == 'ArrayAccess' and offset is None:
                 self.emit("STORE 0")
             else:
-                off = self.variable_offsets.get(var_name)
-                if self._is_local() or off < 0:
-                    self.emit(f"STOREL {off}")
-                else:
-                    self.emit(f"STOREG {off}")
+                self._emit_store(var.binding, offset or 0)
 
     def generate_VariableAccess(self, node):
-        name = node.leaf
-        offset = self.variable_offsets.get(name)
-        if offset is not None:
-            if self._is_local() or offset < 0:
-                self.emit(f"PUSHL {offset}")
-            else:
-                self.emit(f"PUSHG {offset}")
+        self._emit_load(node.binding)
 
     def generate_WriteStatement(self, node):
         for expr in node.children:
-            self.visit(expr)
-            # Decide se escreve String ou Inteiro
-            if expr.type == 'StringConstant': self.emit("WRITES")
+            yield expr
+            # Decide pelo tipo da expressão (um caráter de string, via CHARAT, é um código inteiro)
+            if expr.value_type is STRING and expr.type != 'ArrayAccess': self.emit("WRITES")
+            elif expr.value_type is REAL: self.emit("WRITEF")
             else: self.emit("WRITEI")
 
     def generate_FunctionCall(self, node):
@@ -370,16 +547,14 @@ class CodeGenerator:
         if name == 'length':
             # (Mantém o teu código original do length aqui)
             if node.children:
-                self.visit(node.children[0].children[0])
+                yield node.children[0].children[0]
             self.emit("STRLEN")
             return
 
         # 1. Verificar se é Função para reservar espaço
         # Precisamos de saber se é function (retorna valor) ou procedure
-        symbol = self.symbol_table.lookup(name)
-        is_function = False
-        if symbol and symbol.get('kind') == 'function':
-            is_function = True
+        binding = node.binding
+        is_function = binding is not None and binding.kind == 'function'
             
         # O Chamador reserva o espaço na pilha
         if is_function:
@@ -394,11 +569,10 @@ class CodeGenerator:
             args = args_node.children if hasattr(args_node, 'children') else []
             
             num_args = len(args)
-            for arg in args:
-                self.visit(arg)
+            yield from self._push_args(binding, args)
         
         # 3. Chamar a Função
-        lbl = self.procedure_starts.get(name)
+        lbl = self.procedure_starts.get(binding)
         if lbl:
             self.emit(f"PUSHA {lbl}")
             self.emit("CALL")
@@ -408,40 +582,107 @@ class CodeGenerator:
             if num_args > 0:
                 self.emit(f"POP {num_args}")
     
+    def _push_args(self, binding, args):
+        """Empilha os argumentos, convertendo para real os inteiros passados a parâmetros reais."""
+        params = binding.type.params if binding is not None else ()
+        for i, arg in enumerate(args):
+            yield arg
+            if i < len(params):
+                self._coerce(params[i], arg)
+
     def generate_ProcedureCall(self, node):
         # Como a lógica de chamada é igual (empilhar args, call, pop), e a generate_FunctionCall já verifica se deve reservar espaço ou não, podemos reutilizar a mesma função
-        self.generate_FunctionCall(node)
+        yield from self.generate_FunctionCall(node)
 
 
     def generate_BinaryOp(self, node):
+        if node.leaf in ('AND', 'OR') and not _is_safe(node.children[1]):
+            # O segundo operando só é avaliado se o primeiro não decidir o resultado
+            lbl_false = self.create_label()
+            lbl_end = self.create_label()
+            yield self._jump_if(node, lbl_false, False)
+            self.emit("PUSHI 1")
+            self.emit(f"JUMP {lbl_end}")
+            self.emit(f"{lbl_false}:")
+            self.emit("PUSHI 0")
+            self.emit(f"{lbl_end}:")
+            return
+        yield from self._operation(node, node.leaf)
+
+    def _operation(self, node, op):
+        """Avalia os operandos de 'node' e aplica-lhes o operador 'op'."""
         left = node.children[0]
         right = node.children[1]
         
         # Otimização: Comparação direta com Char literal em Strings
         # Ex: str[i] = 'a'
-        if (node.leaf == '=' or node.leaf == '<>') and \
+        if (op == '=' or op == '<>') and \
            right.type == 'StringConstant' and len(right.leaf) == 1:
-                self.visit(left)
+                yield left
                 self.emit(f"PUSHI {ord(right.leaf)}") # Converte char para int
-                if node.leaf == '=': self.emit("EQUAL")
+                if op == '=': self.emit("EQUAL")
                 else: 
                     self.emit("EQUAL")
                     self.emit("NOT")
                 return
 
-        self.visit(left)
-        self.visit(right)
-        ops = {'+':'ADD', '-':'SUB', '*':'MUL', 'DIV':'DIV', 'MOD':'MOD', 
-               '=':'EQUAL', '<':'INF', '>':'SUP', '<=': 'INFEQ', '>=':'SUPEQ', 
-               'AND':'AND', 'OR':'OR'}
-        if node.leaf in ops: self.emit(ops[node.leaf])
-        elif node.leaf == '<>': 
+        # Operação real se um dos operandos for real (ou '/'): o inteiro passa a real
+        is_real = op == '/' or left.value_type is REAL or right.value_type is REAL
+        yield left
+        if is_real: self._coerce(REAL, left)
+        yield right
+        if is_real: self._coerce(REAL, right)
+        ops = REAL_OPS if is_real else INTEGER_OPS
+        if op in ops: self.emit(ops[op])
+        elif op == '<>': 
             self.emit("EQUAL")
             self.emit("NOT")
 
+    # Condições como saltos
+    # Um nó Condition (criado aqui, não vem do parser) salta para uma etiqueta quando a
+    # expressão tem um dado valor e continua no caso contrário. and/or/not passam a
+    # cadeias de saltos, sem calcular o 0/1 intermédio que o JZ testaria logo a seguir.
+    def _jump_if(self, expr, target, when):
+        """Nó que salta para 'target' se 'expr' for 'when' (True/False)."""
+        return Node('Condition', [expr], (target, when), lineno=expr.lineno)
+
+    def generate_Condition(self, node):
+        expr = node.children[0]
+        target, when = node.leaf
+        kind = expr.type
+        if kind == 'UnaryOp' and expr.leaf == 'NOT':
+            # not x: salta quando x tem o valor oposto (not not x volta ao original)
+            yield self._jump_if(expr.children[0], target, not when)
+        elif kind == 'BinaryOp' and expr.leaf in ('AND', 'OR'):
+            left, right = expr.children
+            if (expr.leaf == 'OR') == when:
+                # Qualquer operando com este valor decide (and falso, or verdadeiro)
+                yield self._jump_if(left, target, when)
+                yield self._jump_if(right, target, when)
+            else:
+                # O primeiro operando com o outro valor decide sem avaliar o segundo
+                lbl_skip = self.create_label()
+                yield self._jump_if(left, lbl_skip, not when)
+                yield self._jump_if(right, target, when)
+                self.emit(f"{lbl_skip}:")
+        elif kind == 'BooleanConstant':
+            if (str(expr.leaf).lower() == 'true') == when:
+                self.emit(f"JUMP {target}")
+        elif kind == 'BinaryOp' and expr.leaf in NEGATED_COMPARISON:
+            # Saltar quando é verdadeira = saltar quando a comparação oposta dá 0
+            yield from self._operation(expr, NEGATED_COMPARISON[expr.leaf] if when else expr.leaf)
+            self.emit(f"JZ {target}")
+        else:
+            yield expr
+            if when: self.emit("NOT")
+            self.emit(f"JZ {target}")
+
     def generate_UnaryOp(self, node):
-        self.visit(node.children[0])
+        yield node.children[0]
         if node.leaf == 'NOT': self.emit("NOT")
+        elif node.leaf == 'MINUS' and node.value_type is REAL:
+            self.emit("PUSHF -1.0")
+            self.emit("FMUL")
         elif node.leaf == 'MINUS': 
             self.emit("PUSHI -1")
             self.emit("MUL")
@@ -452,4 +693,5 @@ class CodeGenerator:
     def generate_BooleanConstant(self, node): 
         val = 1 if str(node.leaf).lower() == 'true' else 0
         self.emit(f"PUSHI {val}")
+    def generate_RealConstant(self, node): self.emit(f"PUSHF {float(node.leaf)!r}")
     def generate_StringConstant(self, node): self.emit(f'PUSHS "{node.leaf}"')
\ No newline at end of file
@@ -0,0 +1,420 @@
+"""
+Eliminação de código morto guiada pela vivacidade (liveness) das variáveis.
+
+Corre no fim do Otimizador, depois da propagação de constantes (que deixa muitas
+atribuições sem leitores). Remove:
+  dead_store         - atribuições a variáveis escalares que não são lidas antes da
+                       próxima escrita (ou do fim), se a expressão não tiver efeitos
+  dead_loop          - 'while false do' e 'for' sem corpo (com limites sem efeitos)
+  empty_if           - if sem nada nos dois ramos (com condição sem efeitos)
+  unused_variable    - declarações de variáveis que deixaram de ser usadas, o que
+                       reduz o PUSHN das globais e das locais
+  unused_subprogram  - funções/procedimentos que nunca são chamados a partir do
+                       programa principal
+
+A análise é feita para trás, comando a comando, com o conjunto das variáveis vivas
+('live'). Os ciclos usam uma aproximação conservadora em vez de um ponto fixo: à
+entrada do corpo estão vivas todas as variáveis lidas em qualquer ponto do ciclo.
+Nos subprogramas só as locais e os parâmetros são analisados (as globais e o valor
+de retorno podem ser lidos depois do RETURN); no programa principal, uma chamada
+torna vivas as globais que o subprograma chamado (ou os que ele chama) lê.
+As variáveis e os subprogramas são identificados pela ligação (node.binding) e não
+pelo nome: uma local nunca se confunde com uma global com o mesmo nome.
+"""
+from parser import Node
+from visitor import NodeVisitor, walk
+from semantic import Binding
+
+CALLS = ('FunctionCall', 'ProcedureCall')
+SUBPROGRAMS = ('FunctionDeclaration', 'ProcedureDeclaration')
+LOOPS = ('WhileStatement', 'ForStatement')
+
+
+def is_pure(node):
+    """
+    True se avaliar a expressão não tem efeitos visíveis: sem chamadas de funções e
+    sem divisões cujo divisor possa ser zero (um erro de execução também é um efeito).
+    Só estas expressões podem ser descartadas (ex: x * 0 -> 0, x := e sem leitores).
+    """
+    pending = [node]
+    while pending:
+        n = pending.pop()
+        if n.type in CALLS:
+            return False
+        if n.type == 'BinaryOp' and n.leaf in ('DIV', 'MOD', '/'):
+            divisor = n.children[1]
+            if divisor.type not in ('IntegerConstant', 'RealConstant') or divisor.leaf == 0:
+                return False
+        pending.extend(n.children)
+    return True
+
+
+def same_expression(a, b):
+    """Igualdade estrutural de duas expressões (mesmos tipos, folhas, ligações e filhos)."""
+    pending = [(a, b)]
+    while pending:
+        x, y = pending.pop()
+        if (x.type != y.type or x.leaf != y.leaf or x.binding is not y.binding
+                or len(x.children) != len(y.children)):
+            return False
+        pending.extend(zip(x.children, y.children))
+    return True
+
+
+def _uses(node, calls=None):
+    """
+    Ligações lidas numa expressão ou comando (variáveis, arrays e strings). Os destinos
+    de atribuições, leituras e ciclos for são escritas, não leituras (mas os índices
+    dos arrays de destino são lidos). Se 'calls' for dado, junta-lhe as ligações das
+    funções/procedimentos chamados (na mesma travessia; None nos pré-definidos).
+    """
+    names = set()
+    pending = [node]
+    while pending:
+        item = pending.pop()
+        kind = getattr(item, 'type', None)
+        if kind is None:
+            continue
+        if kind in CALLS and calls is not None:
+            calls.add(item.binding)
+        if kind in ('VariableAccess', 'ArrayAccess'):
+            names.add(item.binding)
+            pending.extend(item.children)
+        elif kind == 'AssignmentStatement':
+            target = item.children[0]
+            if target.type == 'ArrayAccess':
+                pending.append(target)
+            pending.append(item.children[1])
+        elif kind == 'ReadStatement':
+            pending.extend(var.children[0] for var in item.children if var.type == 'ArrayAccess')
+        elif kind == 'ForStatement':
+            pending.extend(item.children[1:])
+        else:
+            pending.extend(item.children)
+    return names
+
+
+def _is_empty(node):
+    return node.type == 'Empty' or (node.type == 'CompoundStatement' and not node.children)
+
+
+def _called(node):
+    """Ligações das funções/procedimentos chamados dentro de 'node'."""
+    names = set()
+    pending = [node]
+    while pending:
+        item = pending.pop()
+        if getattr(item, 'type', None) in CALLS:
+            names.add(item.binding)
+        pending.extend(getattr(item, 'children', ()))
+    return names
+
+
+def declared_variables(declarations):
+    """(Declaration, nó ID) de cada variável declarada num nó Declarations."""
+    for decl in declarations.children:
+        if getattr(decl, 'type', None) != 'Declaration':
+            continue
+        id_list = decl.children[0]
+        for id_node in (id_list.children if id_list.type == 'IDList' else [id_list]):
+            yield decl, id_node
+
+
+def declare_variable(declarations, name, type, depth, lineno):
+    """
+    Acrescenta a 'declarations' uma variável escalar escondida (criada por uma passagem
+    do Otimizador) do tipo 'type' (typesystem) e devolve a sua ligação; o offset é
+    dado pelo gerador de código.
+    """
+    binding = Binding(name, depth, None, type, 'variable')
+    declarations.children.append(Node('Declaration', [
+        Node('IDList', [Node('ID', [], name, lineno=lineno, binding=binding)]),
+        Node('BasicType', [], type.name, lineno=lineno),
+    ], lineno=lineno))
+    return binding
+
+
+def variable(binding, lineno):
+    """Nó que lê (ou é destino de) uma variável já ligada."""
+    return Node('VariableAccess', [], binding.name, lineno=lineno, binding=binding, value_type=binding.type)
+
+
+def parameter_bindings(sub):
+    """Ligações dos parâmetros de um subprograma, pela ordem da declaração."""
+    bindings = []
+    for param in sub.children[0].children:
+        id_list = param.children[0]
+        bindings.extend(i.binding for i in (id_list.children if id_list.type == 'IDList' else [id_list]))
+    return bindings
+
+
+def block_parts(block):
+    """(FunctionDeclarations, Declarations, CompoundStatement) de um Block, pelo tipo."""
+    funcs = decls = body = None
+    for child in block.children:
+        if child.type == 'FunctionDeclarations':
+            funcs = child
+        elif child.type == 'Declarations':
+            decls = child
+        elif child.type == 'CompoundStatement':
+            body = child
+    return funcs, decls, body
+
+
+class DeadCodeEliminator(NodeVisitor):
+    """
+    Passagem de eliminação de código morto sobre a AST otimizada. As regras aplicadas
+    são contadas no Otimizador ('optimizer').
+    """
+    visit_prefix = 'eliminate_'
+
+    def __init__(self, optimizer):
+        self.optimizer = optimizer
+        self.live = set()
+        self.tracked = set() # Ligações analisadas no corpo atual (as outras estão sempre vivas)
+        self.globals = set()
+        self.in_subprogram = False
+        self.call_reads = {} # Subprograma -> globais que pode ler (incluindo nos que chama)
+        self.loop_reads = {} # id do ciclo -> variáveis lidas no ciclo (ver _reads)
+
+    def eliminate(self, ast):
+        if ast is None or ast.type != 'Program' or not ast.children:
+            return ast
+        block = ast.children[0]
+        funcs, decls, body = block_parts(block)
+        if decls is not None:
+            self.globals = {id_node.binding for _, id_node in declared_variables(decls)}
+
+        if funcs is not None:
+            self._remove_unused_subprograms(funcs, body)
+            self._compute_call_reads(funcs)
+            for sub in funcs.children:
+                self._eliminate_subprogram(sub)
+
+        self.in_subprogram = False
+        self.tracked = set(self.globals)
+        self.live = set() # No fim do programa nenhuma variável é observável
+        if body is not None:
+            self.visit(body)
+        if decls is not None:
+            # As globais podem ser usadas nos subprogramas que ficaram
+            self._remove_unused_declarations(decls, block)
+        return ast
+
+    def _eliminate_subprogram(self, node):
+        _, decls, body = block_parts(node.children[2])
+        locals_ = {id_node.binding for _, id_node in declared_variables(decls)} if decls is not None else set()
+        params = set(parameter_bindings(node))
+
+        self.in_subprogram = True
+        # O nome da função guarda o valor de retorno: está vivo no fim
+        result = {node.binding.result} if node.type == 'FunctionDeclaration' else set()
+        self.tracked = locals_ | params | result
+        self.live = set(result)
+        if body is not None:
+            self.visit(body)
+        if decls is not None:
+            self._remove_unused_declarations(decls, node.children[2])
+
+    # Declarações e subprogramas não usados
+    def _remove_unused_declarations(self, decls, scope):
+        used = set()
+
+        def visit(item, depth):
+            kind = getattr(item, 'type', None)
+            if kind in ('VariableAccess', 'ArrayAccess'):
+                used.add(item.binding)
+            elif kind == 'Declarations':
+                return False # As declarações não contam como uso
+
+        walk(scope, pre=visit)
+        kept = []
+        for decl in decls.children:
+            if getattr(decl, 'type', None) != 'Declaration':
+                kept.append(decl)
+                continue
+            id_list = decl.children[0]
+            ids = id_list.children if id_list.type == 'IDList' else [id_list]
+            alive = [id_node for id_node in ids if id_node.binding in used]
+            for _ in range(len(ids) - len(alive)):
+                self.optimizer._applied('unused_variable')
+            if not alive:
+                continue
+            if len(alive) != len(ids):
+                decl.children[0] = Node('IDList', alive, lineno=id_list.lineno)
+            kept.append(decl)
+        decls.children[:] = kept
+
+    def _remove_unused_subprograms(self, funcs, body):
+        """Mantém só os subprogramas alcançáveis (pelo grafo de chamadas) a partir do corpo principal."""
+        subprograms = {sub.binding: sub for sub in funcs.children if getattr(sub, 'type', None) in SUBPROGRAMS}
+        if not subprograms:
+            return
+
+        called = _called
+        reachable = set()
+        pending = [name for name in called(body) if name in subprograms] if body is not None else []
+        while pending:
+            name = pending.pop()
+            if name in reachable:
+                continue
+            reachable.add(name)
+            pending.extend(n for n in called(subprograms[name]) if n in subprograms and n not in reachable)
+
+        kept = []
+        for sub in funcs.children:
+            if getattr(sub, 'type', None) in SUBPROGRAMS and sub.binding not in reachable:
+                self.optimizer._applied('unused_subprogram')
+                continue
+            kept.append(sub)
+        funcs.children[:] = kept
+
+    def _compute_call_reads(self, funcs):
+        """Globais lidas por cada subprograma, diretamente ou pelos que chama (ponto fixo no grafo de chamadas)."""
+        subprograms = [sub for sub in funcs.children if getattr(sub, 'type', None) in SUBPROGRAMS]
+        reads = {}
+        calls = {}
+        for sub in subprograms:
+            called = set()
+            reads[sub.binding] = _uses(sub, called) & self.globals
+            calls[sub.binding] = called
+        calls = {name: called & reads.keys() for name, called in calls.items()}
+        changed = True
+        while changed:
+            changed = False
+            for name, callees in calls.items():
+                for callee in callees:
+                    if not reads[callee] <= reads[name]:
+                        reads[name] |= reads[callee]
+                        changed = True
+        self.call_reads = reads
+
+    # Vivacidade (para trás)
+    def _reads(self, node):
+        """
+        Variáveis lidas por 'node' e, no programa principal, as globais que os
+        subprogramas chamados podem ler. Os ciclos são consultados duas vezes
+        (antes e depois do corpo): o resultado fica guardado.
+        """
+        key = id(node)
+        names = self.loop_reads.get(key)
+        if names is not None:
+            return names
+        if self.in_subprogram:
+            names = _uses(node)
+        else:
+            called = set()
+            names = _uses(node, called)
+            for name in called:
+                names |= self.call_reads.get(name, frozenset()) # Os pré-definidos (ex: length) não leem globais
+        if node.type in LOOPS:
+            self.loop_reads[key] = names
+        return names
+
+    def _read(self, node):
+        """As variáveis lidas por 'node' (e pelos subprogramas que chama) ficam vivas."""
+        if not node:
+            return
+        self.live |= self._reads(node)
+
+    def generic_visit(self, node):
+        # Comando desconhecido: tudo o que lê fica vivo
+        self._read(node)
+        return node
+
+    def eliminate_Empty(self, node):
+        return node
+
+    def eliminate_CompoundStatement(self, node):
+        children = node.children
+        for i in range(len(children) - 1, -1, -1):
+            children[i] = yield children[i]
+        # Os comandos removidos ficam como Empty: já não precisam de estar na lista
+        children[:] = [child for child in children if not _is_empty(child)]
+        return node
+
+    def eliminate_AssignmentStatement(self, node):
+        target = node.children[0]
+        expr = node.children[1]
+        if target.type == 'VariableAccess':
+            name = target.binding
+            if name in self.tracked and name not in self.live and is_pure(expr):
+                self.optimizer._applied('dead_store')
+                return Node('Empty', [], lineno=node.lineno)
+            self.live.discard(name)
+        else:
+            self._read(target.children[0]) # Índice do array (os arrays nunca são removidos)
+        self._read(expr)
+        return node
+
+    def eliminate_ReadStatement(self, node):
+        # A leitura consome a entrada: nunca é removida, mas define as variáveis
+        for var in node.children:
+            if var.type == 'VariableAccess':
+                self.live.discard(var.binding)
+            else:
+                self._read(var.children[0])
+        return node
+
+    def eliminate_WriteStatement(self, node):
+        self._read(node)
+        return node
+
+    def eliminate_ProcedureCall(self, node):
+        self._read(node)
+        return node
+
+    def eliminate_IfStatement(self, node):
+        after = self.live
+        self.live = set(after)
+        node.children[1] = yield node.children[1]
+        live_then = self.live
+        if len(node.children) > 2:
+            self.live = set(after)
+            node.children[2] = yield node.children[2]
+            self.live |= live_then
+            if _is_empty(node.children[2]):
+                node.children.pop()
+        else:
+            # Sem else, a condição falsa passa diretamente para depois do if
+            self.live = live_then | after
+        cond = node.children[0]
+        if len(node.children) == 2 and _is_empty(node.children[1]) and is_pure(cond):
+            self.optimizer._applied('empty_if')
+            self.live = after
+            return Node('Empty', [], lineno=node.lineno)
+        self._read(cond)
+        return node
+
+    def _loop_live(self, node):
+        """Vivas em todo o ciclo: as de depois do ciclo mais tudo o que o ciclo lê."""
+        return self.live | self._reads(node)
+
+    def eliminate_WhileStatement(self, node):
+        cond = node.children[0]
+        if cond.type == 'BooleanConstant' and str(cond.leaf).lower() == 'false':
+            self.optimizer._applied('dead_loop')
+            return Node('Empty', [], lineno=node.lineno)
+        # Se o ciclo não der nenhuma volta, o que está vivo depois vem de antes dele:
+        # as variáveis que o corpo escreve continuam vivas à entrada
+        after = self.live
+        self.live = self._loop_live(node)
+        node.children[1] = yield node.children[1]
+        self.live = self._loop_live(node) | after
+        return node
+
+    def eliminate_ForStatement(self, node):
+        var, start, end, body = node.children
+        after = self.live
+        self.live = self._loop_live(node) | {var.binding}
+        node.children[3] = body = yield body
+        if _is_empty(body) and var.binding not in after and is_pure(start) and is_pure(end):
+            self.optimizer._applied('dead_loop')
+            self.live = after
+            return Node('Empty', [], lineno=node.lineno)
+        # A variável de controlo é escrita pela inicialização, antes de qualquer leitura do
+        # ciclo; o valor inicial e o limite são avaliados antes dela
+        self.live = (self._loop_live(node) | after) - {var.binding}
+        self._read(end)
+        self._read(start)
+        return node
@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+"""
+Interpretador local da EWVM (subconjunto usado pelo codegen.py).
+
+Permite executar e medir o código gerado sem a EWVM do browser. O texto é
+descodificado uma única vez para dois arrays paralelos (opcode inteiro e argumento
+já convertido; as etiquetas passam a índices) e depois executado num ciclo de
+despacho com as variáveis quentes em locais.
+
+Modelo de memória: uma única pilha (lista Python). gp = 0, por isso PUSHG n lê a
+posição n; os endereços (PUSHGP/PUSHFP/PADD) são índices nesta pilha. As strings
+são valores Python diretamente na pilha, tal como os reais (float) das
+instruções F*. DIV e MOD seguem a semântica do C (divisão truncada para zero).
+
+Uso: python ewvm.py programa.ewvm [--input FICHEIRO] [--stats] [--max-steps N]
+"""
+import sys
+
+
+class EWVMError(Exception):
+    """Erro de execução (ou de descodificação) com a posição da instrução."""
+    def __init__(self, msg, pc=None):
+        self.pc = pc
+        super().__init__(msg if pc is None else f"{msg} (instrução {pc})")
+
+
+# Opcodes, por ordem aproximada de frequência (o ciclo testa-os por esta ordem)
+OPCODES = (
+    'PUSHI', 'PUSHG', 'PUSHL', 'STOREG', 'STOREL', 'ADD', 'SUB', 'MUL', 'JZ', 'JUMP',
+    'INF', 'INFEQ', 'SUP', 'SUPEQ', 'EQUAL', 'NOT', 'AND', 'OR', 'DIV', 'MOD',
+    'PADD', 'LOAD', 'STORE', 'PUSHGP', 'PUSHFP', 'DUP', 'POP', 'PUSHN', 'PUSHA', 'CALL',
+    'RETURN', 'CHARAT', 'STRLEN', 'PUSHS', 'WRITEI', 'WRITES', 'WRITELN', 'READ', 'ATOI',
+    'SWAP', 'START', 'STOP', 'NOP', 'ERR',
+    'PUSHF', 'FADD', 'FSUB', 'FMUL', 'FDIV', 'FINF', 'FINFEQ', 'FSUP', 'FSUPEQ', 'ITOF',
+    'WRITEF', 'ATOF',
+)
+(PUSHI, PUSHG, PUSHL, STOREG, STOREL, ADD, SUB, MUL, JZ, JUMP,
+ INF, INFEQ, SUP, SUPEQ, EQUAL, NOT, AND, OR, DIV, MOD,
+ PADD, LOAD, STORE, PUSHGP, PUSHFP, DUP, POP, PUSHN, PUSHA, CALL,
+ RETURN, CHARAT, STRLEN, PUSHS, WRITEI, WRITES, WRITELN, READ, ATOI,
+ SWAP, START, STOP, NOP, ERR,
+ PUSHF, FADD, FSUB, FMUL, FDIV, FINF, FINFEQ, FSUP, FSUPEQ, ITOF,
+ WRITEF, ATOF) = range(len(OPCODES))
+
+OPCODE_OF = {name: code for code, name in enumerate(OPCODES)}
+LABEL_ARGS = (JZ, JUMP, PUSHA)
+STRING_ARGS = (PUSHS, ERR)
+
+
+class Program:
+    """
+    Código EWVM descodificado: 'ops' e 'args' (arrays paralelos), 'source' (texto de
+    cada instrução, para mensagens e perfis), 'positions' (índice da linha de texto de
+    cada instrução, para cruzar com o mapa de origem) e 'labels' (nome -> índice).
+    """
+    def __init__(self, ops, args, source, labels, positions=None):
+        self.ops = ops
+        self.args = args
+        self.source = source
+        self.labels = labels
+        self.positions = positions
+
+    def __len__(self):
+        return len(self.ops)
+
+
+def decode(lines):
+    """Converte linhas de texto EWVM num Program (as etiquetas resolvem-se aqui, uma vez)."""
+    instructions = []
+    labels = {}
+    for position, line in enumerate(lines):
+        line = line.strip()
+        if not line:
+            continue
+        if line.endswith(':'):
+            labels[line[:-1]] = len(instructions)
+            continue
+        name, _, arg = line.partition(' ')
+        instructions.append((name.upper(), arg.strip(), line, position))
+
+    ops = []
+    args = []
+    source = []
+    positions = []
+    for pc, (name, arg, line, position) in enumerate(instructions):
+        op = OPCODE_OF.get(name)
+        if op is None:
+            raise EWVMError(f"Instrução desconhecida '{name}'", pc)
+        if op in LABEL_ARGS:
+            if arg not in labels:
+                raise EWVMError(f"Etiqueta '{arg}' não definida", pc)
+            value = labels[arg]
+        elif op in STRING_ARGS:
+            value = arg[1:-1] if len(arg) >= 2 and arg[0] == arg[-1] == '"' else arg
+        elif arg:
+            try:
+                value = float(arg) if op == PUSHF else int(arg)
+            except ValueError:
+                raise EWVMError(f"Argumento inválido '{arg}' em {name}", pc)
+        else:
+            value = 0
+        ops.append(op)
+        args.append(value)
+        source.append(line)
+        positions.append(position)
+    return Program(ops, args, source, labels, positions)
+
+
+def load(path):
+    with open(path) as f:
+        return decode(f)
+
+
+class ExecutionResult:
+    """Saída produzida, número de instruções executadas e (opcional) contagem por instrução."""
+    def __init__(self, output, steps, hits=None, program=None, stack=None):
+        self.output = output
+        self.steps = steps
+        self.hits = hits # hits[pc] = número de execuções da instrução pc (ou None)
+        self.program = program
+        self.stack = stack # Pilha no fim da execução (as globais estão no início)
+
+    def opcode_counts(self):
+        """Histograma opcode -> execuções (precisa de hits)."""
+        counts = {}
+        if self.hits is None:
+            return counts
+        for op, n in zip(self.program.ops, self.hits):
+            if n:
+                name = OPCODES[op]
+                counts[name] = counts.get(name, 0) + n
+        return counts
+
+
+def _c_div(a, b):
+    q = abs(a) // abs(b)
+    return q if (a >= 0) == (b >= 0) else -q
+
+
+def run(program, stdin=(), max_steps=None, count_hits=False):
+    """
+    Executa um Program. 'stdin' é uma string (dividida em linhas) ou uma sequência de
+    linhas, consumidas por READ. 'max_steps' limita as instruções executadas (proteção
+    contra ciclos infinitos). Com 'count_hits' conta as execuções de cada instrução.
+    """
+    if isinstance(stdin, str):
+        stdin = stdin.splitlines()
+    inputs = iter(stdin)
+    ops = program.ops
+    args = program.args
+    hits = [0] * len(ops) if count_hits else None
+    limit = max_steps if max_steps is not None else -1
+
+    stack = []
+    push = stack.append
+    pop = stack.pop
+    frames = [] # (pc de retorno, fp) de cada CALL
+    out = []
+    write = out.append
+    pc = 0
+    fp = 0
+    steps = 0
+    end = len(ops)
+
+    try:
+        while pc < end:
+            op = ops[pc]
+            arg = args[pc]
+            if hits is not None:
+                hits[pc] += 1
+            pc += 1
+            steps += 1
+
+            if op == PUSHI: push(arg)
+            elif op == PUSHG: push(stack[arg])
+            elif op == PUSHL: push(stack[fp + arg])
+            elif op == STOREG: stack[arg] = pop()
+            elif op == STOREL: stack[fp + arg] = pop()
+            elif op == ADD:
+                b = pop(); stack[-1] += b
+            elif op == SUB:
+                b = pop(); stack[-1] -= b
+            elif op == MUL:
+                b = pop(); stack[-1] *= b
+            elif op == JZ:
+                if pop() == 0:
+                    pc = arg
+                    if steps >= limit >= 0:
+                        raise EWVMError(f"Limite de {max_steps} instruções excedido", pc)
+            elif op == JUMP:
+                pc = arg
+                if steps >= limit >= 0:
+                    raise EWVMError(f"Limite de {max_steps} instruções excedido", pc)
+            elif op == INF:
+                b = pop(); stack[-1] = 1 if stack[-1] < b else 0
+            elif op == INFEQ:
+                b = pop(); stack[-1] = 1 if stack[-1] <= b else 0
+            elif op == SUP:
+                b = pop(); stack[-1] = 1 if stack[-1] > b else 0
+            elif op == SUPEQ:
+                b = pop(); stack[-1] = 1 if stack[-1] >= b else 0
+            elif op == EQUAL:
+                b = pop(); stack[-1] = 1 if stack[-1] == b else 0
+            elif op == NOT:
+                stack[-1] = 1 if stack[-1] == 0 else 0
+            elif op == AND:
+                b = pop(); stack[-1] = 1 if stack[-1] and b else 0
+            elif op == OR:
+                b = pop(); stack[-1] = 1 if stack[-1] or b else 0
+            elif op == DIV:
+                b = pop()
+                if b == 0:
+                    raise EWVMError("Divisão por zero", pc - 1)
+                stack[-1] = _c_div(stack[-1], b)
+            elif op == MOD:
+                b = pop()
+                if b == 0:
+                    raise EWVMError("Divisão por zero", pc - 1)
+                a = stack[-1]
+                stack[-1] = a - b * _c_div(a, b)
+            elif op == PADD:
+                b = pop(); stack[-1] += b
+            elif op == LOAD:
+                address = pop() + arg
+                if address < 0:
+                    raise EWVMError(f"Endereço inválido {address}", pc - 1)
+                push(stack[address])
+            elif op == STORE:
+                value = pop()
+                address = pop() + arg
+                if address < 0:
+                    raise EWVMError(f"Endereço inválido {address}", pc - 1)
+                stack[address] = value
+            elif op == PUSHGP: push(0)
+            elif op == PUSHFP: push(fp)
+            elif op == DUP:
+                stack.extend(stack[-arg:])
+            elif op == POP:
+                if arg > len(stack):
+                    raise EWVMError("Pilha vazia", pc - 1)
+                del stack[len(stack) - arg:]
+            elif op == PUSHN:
+                stack.extend([0] * arg)
+            elif op == PUSHA: push(arg)
+            elif op == CALL:
+                frames.append((pc, fp))
+                pc = pop()
+                fp = len(stack)
+                if steps >= limit >= 0:
+                    raise EWVMError(f"Limite de {max_steps} instruções excedido", pc)
+            elif op == RETURN:
+                if not frames:
+                    raise EWVMError("RETURN sem CALL", pc - 1)
+                del stack[fp:]
+                pc, fp = frames.pop()
+            elif op == CHARAT:
+                index = pop()
+                text = pop()
+                if not 0 <= index < len(text):
+                    raise EWVMError(f"Índice {index} fora da string", pc - 1)
+                push(ord(text[index]))
+            elif op == STRLEN: push(len(pop()))
+            elif op == PUSHS: push(arg)
+            elif op == WRITEI: write(str(pop()))
+            elif op == WRITES: write(pop())
+            elif op == WRITELN: write("\n")
+            elif op == READ:
+                try:
+                    push(next(inputs))
+                except StopIteration:
+                    raise EWVMError("READ sem mais linhas de entrada", pc - 1)
+            elif op == ATOI:
+                text = pop()
+                try:
+                    push(int(text))
+                except ValueError:
+                    raise EWVMError(f"ATOI: '{text}' não é um inteiro", pc - 1)
+            elif op == SWAP:
+                stack[-1], stack[-2] = stack[-2], stack[-1]
+            elif op == START: fp = len(stack)
+            elif op == STOP: break
+            elif op == NOP: pass
+            elif op == ERR:
+                raise EWVMError(f"ERR: {arg}", pc - 1)
+            elif op == PUSHF: push(arg)
+            elif op == FADD:
+                b = pop(); stack[-1] += b
+            elif op == FSUB:
+                b = pop(); stack[-1] -= b
+            elif op == FMUL:
+                b = pop(); stack[-1] *= b
+            elif op == FDIV:
+                b = pop()
+                if b == 0:
+                    raise EWVMError("Divisão por zero", pc - 1)
+                stack[-1] /= b
+            elif op == FINF:
+                b = pop(); stack[-1] = 1 if stack[-1] < b else 0
+            elif op == FINFEQ:
+                b = pop(); stack[-1] = 1 if stack[-1] <= b else 0
+            elif op == FSUP:
+                b = pop(); stack[-1] = 1 if stack[-1] > b else 0
+            elif op == FSUPEQ:
+                b = pop(); stack[-1] = 1 if stack[-1] >= b else 0
+            elif op == ITOF: stack[-1] = float(stack[-1])
+            elif op == WRITEF: write(str(pop()))
+            elif op == ATOF:
+                text = pop()
+                try:
+                    push(float(text))
+                except ValueError:
+                    raise EWVMError(f"ATOF: '{text}' não é um real", pc - 1)
+    except IndexError:
+        raise EWVMError("Acesso fora da pilha (pilha vazia ou endereço inválido)", pc - 1)
+    except TypeError as e:
+        raise EWVMError(f"Tipos incompatíveis: {e}", pc - 1)
+
+    return ExecutionResult("".join(out), steps, hits, program, stack)
+
+
+def main():
+    import argparse
+
+    ap = argparse.ArgumentParser(description='Interpretador local da EWVM')
+    ap.add_argument('program', help='Ficheiro .ewvm')
+    ap.add_argument('--input', metavar='FICHEIRO', help='Linhas para o READ (omissão: stdin)')
+    ap.add_argument('--stats', action='store_true', help='Mostra instruções executadas por opcode (stderr)')
+    ap.add_argument('--max-steps', type=int, help='Limite de instruções executadas')
+    options = ap.parse_args()
+
+    program = load(options.program)
+    if options.input:
+        with open(options.input) as f:
+            stdin = f.read()
+    else:
+        stdin = sys.stdin if not sys.stdin.isatty() else ()
+        stdin = [line.rstrip("\n") for line in stdin]
+
+    try:
+        result = run(program, stdin, options.max_steps, count_hits=options.stats)
+    except EWVMError as e:
+        print(f"Erro de execução: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    sys.stdout.write(result.output)
+    if result.output and not result.output.endswith("\n"):
+        sys.stdout.write("\n")
+    if options.stats:
+        print(f"Instruções executadas: {result.steps}", file=sys.stderr)
+        for name, count in sorted(result.opcode_counts().items(), key=lambda kv: -kv[1]):
+            print(f"  {name:<8} {count}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Perfil de execução por linha Pascal ("hot lines").
+
+Executa o código gerado no interpretador local (ewvm.py) a contar as execuções de
+cada instrução e agrega-as com o mapa de origem do CodeGenerator (sourcemap.py):
+  - por linha      - instruções executadas geradas por essa linha
+  - por ciclo      - instruções executadas dentro do ciclo (inclui ciclos interiores)
+  - por subprograma - instruções executadas no corpo da função/procedimento
+Os custos são próprios (self): as instruções de uma função chamada dentro de um
+ciclo contam para a função, não para o ciclo.
+"""
+from ewvm import decode, run
+from sourcemap import NO_ORIGIN
+
+MAIN = '(principal)' # Nome usado para o programa principal
+
+
+class HotSpotReport:
+    """Instruções executadas agregadas por linha, ciclo e subprograma."""
+    def __init__(self, execution):
+        self.execution = execution
+        self.total = execution.steps
+        self.lines = {} # (linha, subprograma) -> instruções executadas
+        self.loops = {} # (linha do ciclo, subprograma) -> instruções executadas (inclusivo)
+        self.subprograms = {} # subprograma -> instruções executadas
+        self.unmapped = 0 # Instruções sem origem (ex: prólogo antes do primeiro comando)
+
+    @property
+    def output(self):
+        return self.execution.output
+
+    def add(self, origin, steps):
+        subprogram = origin.subprogram or MAIN
+        self.subprograms[subprogram] = self.subprograms.get(subprogram, 0) + steps
+        if origin.line is None:
+            self.unmapped += steps
+            return
+        key = (origin.line, subprogram)
+        self.lines[key] = self.lines.get(key, 0) + steps
+        for loop in origin.loops:
+            key = (loop, subprogram)
+            self.loops[key] = self.loops.get(key, 0) + steps
+
+    def hot_lines(self, top=None):
+        """[(linha, subprograma, instruções)] por ordem decrescente de custo."""
+        return _ranked(self.lines, top)
+
+    def hot_loops(self, top=None):
+        return _ranked(self.loops, top)
+
+    def hot_subprograms(self):
+        return sorted(self.subprograms.items(), key=lambda kv: -kv[1])
+
+    def as_dict(self, top=None):
+        return {
+            'total_steps': self.total,
+            'unmapped_steps': self.unmapped,
+            'lines': [{'line': line, 'subprogram': sub, 'steps': steps} for line, sub, steps in self.hot_lines(top)],
+            'loops': [{'line': line, 'subprogram': sub, 'steps': steps} for line, sub, steps in self.hot_loops(top)],
+            'subprograms': dict(self.hot_subprograms()),
+        }
+
+
+def _ranked(table, top):
+    items = sorted(((line, sub, steps) for (line, sub), steps in table.items()), key=lambda item: (-item[2], item[0]))
+    return items[:top] if top else items
+
+
+def profile_execution(code, source_map, stdin=(), max_steps=None):
+    """
+    Executa 'code' (linhas EWVM) com 'stdin' e devolve um HotSpotReport.
+    'source_map' é o mapa de origem produzido com o código (índices das linhas de 'code').
+    Propaga ewvm.EWVMError se a execução falhar.
+    """
+    program = decode(code)
+    execution = run(program, stdin, max_steps, count_hits=True)
+    origins = source_map.expand(len(code)) if source_map is not None else [NO_ORIGIN] * len(code)
+    report = HotSpotReport(execution)
+    for position, steps in zip(program.positions, execution.hits):
+        if steps:
+            report.add(origins[position], steps)
+    return report
@@ -0,0 +1,299 @@
+"""
+Expansão em linha (inlining) de funções e procedimentos pequenos.
+
+Corre no início do Otimizador, antes da dobragem de constantes, para que o código
+expandido seja simplificado e propagado como o resto. Os subprogramas são
+tratados pelo grafo de chamadas, dos chamados para os que chamam (um subprograma
+já tem as suas chamadas expandidas quando é copiado), e nunca se expande um
+subprograma recursivo (que se alcança a si próprio no grafo).
+
+  procedimentos - a chamada passa a um bloco com uma atribuição por parâmetro
+                  ($p1_x := argumento, pela ordem dos argumentos), a inicialização
+                  das locais a 0 (como o PUSHN) e uma cópia do corpo com os
+                  parâmetros e as locais renomeados para variáveis escondidas do
+                  bloco que chama
+  funções       - só as de uma expressão ('f := expressão'): a chamada é trocada
+                  pela expressão com os argumentos no lugar dos parâmetros; um
+                  parâmetro usado mais de uma vez só aceita variáveis e constantes
+                  (para não repetir cálculos) e os argumentos têm de ser puros
+
+Um subprograma é expandido se o corpo tiver no máximo INLINE_BUDGET nós ou se
+tiver uma só chamada. Ficam de fora os que têm parâmetros ou locais que não são
+inteiros ou booleanos (arrays e strings dependem do tipo no gerador de código).
+Os subprogramas que ficam sem chamadas são removidos depois pela eliminação de
+código morto (unused_subprogram). As cópias mantêm as ligações (node.binding) das
+globais que o corpo usa, por isso uma local do bloco que chama com o mesmo nome
+não as esconde.
+"""
+from operator import attrgetter
+
+from parser import Node
+from visitor import transform_postorder
+from deadcode import is_pure, block_parts, declared_variables, declare_variable, variable
+from typesystem import INTEGER, BOOLEAN, SCALARS
+
+CALLS = ('FunctionCall', 'ProcedureCall')
+SUBPROGRAMS = ('FunctionDeclaration', 'ProcedureDeclaration')
+NAMED = ('VariableAccess', 'ArrayAccess')
+INLINE_BUDGET = 40 # Nós do corpo
+
+
+def _size(node):
+    count = 0
+    pending = [node]
+    while pending:
+        item = pending.pop()
+        count += 1
+        pending.extend(item.children)
+    return count
+
+
+def _copy(node, rename):
+    """Cópia da subárvore; 'rename(ligação)' devolve a ligação nova de uma variável (ou None)."""
+    root = Node(node.type, [], node.leaf, lineno=node.lineno, binding=node.binding, value_type=node.value_type)
+    pending = [(node, root)]
+    while pending:
+        original, copy = pending.pop()
+        if original.type in NAMED:
+            binding = rename(original.binding)
+            if binding is not None:
+                copy.leaf = binding.name
+                copy.binding = binding
+        for child in original.children:
+            child_copy = Node(child.type, [], child.leaf, lineno=child.lineno, binding=child.binding,
+                              value_type=child.value_type)
+            copy.children.append(child_copy)
+            pending.append((child, child_copy))
+    return root
+
+
+def _names(node):
+    """Ligações das variáveis (lidas ou escritas) e dos subprogramas chamados em 'node'."""
+    variables = set()
+    calls = set()
+    pending = [node]
+    while pending:
+        item = pending.pop()
+        if item.type in NAMED:
+            variables.add(item.binding)
+        elif item.type in CALLS:
+            calls.add(item.binding)
+        pending.extend(item.children)
+    return variables, calls
+
+
+class Candidate:
+    """Subprograma que pode ser expandido: parâmetros, locais e corpo."""
+    def __init__(self, node, params, locals_):
+        self.node = node
+        self.name = node.leaf
+        self.is_function = node.type == 'FunctionDeclaration'
+        self.params = params # Ligações pela ordem da declaração
+        self.locals = locals_ # Ligações
+        self.body = block_parts(node.children[2])[2]
+        self.expression = None # Funções: a expressão atribuída ao resultado
+        self.uses = {} # Funções: parâmetro -> número de usos na expressão
+
+
+def _scalar_bindings(items):
+    """Ligações de parâmetros ou declarações; None se alguma não for escalar."""
+    bindings = []
+    for _, id_node in items:
+        if id_node.binding.type not in SCALARS:
+            return None
+        bindings.append(id_node.binding)
+    return bindings
+
+
+def _parameters(node):
+    for param in node.children[0].children:
+        id_list = param.children[0]
+        for id_node in (id_list.children if id_list.type == 'IDList' else [id_list]):
+            yield param, id_node
+
+
+class Inliner:
+    """Expande as chamadas na AST (antes de qualquer outra passagem do Otimizador)."""
+    def __init__(self, optimizer, budget=INLINE_BUDGET):
+        self.optimizer = optimizer
+        self.budget = budget
+        self.candidates = {} # Nome -> Candidate
+        self.counter = 0
+
+    def inline(self, ast):
+        if ast is None or ast.type != 'Program' or not ast.children:
+            return ast
+        block = ast.children[0]
+        funcs, decls, body = block_parts(block)
+        if funcs is None or body is None:
+            return ast
+        subprograms = {sub.binding: sub for sub in funcs.children if getattr(sub, 'type', None) in SUBPROGRAMS}
+        if not subprograms:
+            return ast
+
+        callees = {name: _names(sub.children[2])[1] & subprograms.keys() for name, sub in subprograms.items()}
+        call_counts = self._count_calls(block, subprograms)
+        # Dos chamados para os que chamam: quando um subprograma é copiado já está expandido
+        for name in self._bottom_up(callees):
+            sub = subprograms[name]
+            self._inline_scope(sub.children[2], sub.binding.depth + 1)
+            if not self._reaches(name, name, callees):
+                self._consider(sub, call_counts.get(name, 0))
+        self._inline_scope(block, 0)
+        return ast
+
+    # Grafo de chamadas
+    def _count_calls(self, block, subprograms):
+        counts = {}
+        pending = [block]
+        while pending:
+            item = pending.pop()
+            if getattr(item, 'type', None) in CALLS and item.binding in subprograms:
+                counts[item.binding] = counts.get(item.binding, 0) + 1
+            pending.extend(getattr(item, 'children', ()))
+        return counts
+
+    def _reaches(self, start, target, callees):
+        seen = set()
+        pending = list(callees[start])
+        while pending:
+            name = pending.pop()
+            if name == target:
+                return True
+            if name not in seen:
+                seen.add(name)
+                pending.extend(callees[name])
+        return False
+
+    def _bottom_up(self, callees):
+        """
+        Ligações em pós-ordem do grafo de chamadas (os ciclos de recursão são cortados).
+        Os chamados são ordenados pelo nome para que as variáveis escondidas saiam
+        sempre com os mesmos números.
+        """
+        order = []
+        done = set()
+        by_name = attrgetter('name')
+        for root in callees:
+            if root in done:
+                continue
+            done.add(root)
+            stack = [(root, iter(sorted(callees[root], key=by_name)))]
+            while stack:
+                name, pending = stack[-1]
+                for callee in pending:
+                    if callee not in done:
+                        done.add(callee)
+                        stack.append((callee, iter(sorted(callees[callee], key=by_name))))
+                        break
+                else:
+                    stack.pop()
+                    order.append(name)
+        return order
+
+    # Candidatos
+    def _consider(self, sub, calls):
+        if calls == 0:
+            return
+        params = _scalar_bindings(_parameters(sub))
+        _, decls, body = block_parts(sub.children[2])
+        locals_ = _scalar_bindings(declared_variables(decls)) if decls is not None else []
+        if params is None or locals_ is None or body is None:
+            return
+        candidate = Candidate(sub, params, locals_)
+
+        if candidate.is_function:
+            statements = [s for s in body.children if s.type != 'Empty']
+            if len(statements) != 1 or locals_:
+                return
+            statement = statements[0]
+            result = sub.binding.result
+            if (statement.type != 'AssignmentStatement' or statement.children[0].type != 'VariableAccess'
+                    or statement.children[0].binding is not result):
+                return
+            expression = statement.children[1]
+            if expression.value_type is not result.type:
+                return # A coerção para o tipo do resultado perdia-se na expansão
+            used, _ = _names(expression)
+            if result in used:
+                return
+            candidate.expression = expression
+            param_bindings = set(params)
+            counts = {}
+            pending = [expression]
+            while pending:
+                item = pending.pop()
+                if item.type == 'ArrayAccess' and item.binding in param_bindings:
+                    return # Um parâmetro com índice é uma string: depende do tipo no gerador
+                if item.type == 'VariableAccess' and item.binding in param_bindings:
+                    counts[item.binding] = counts.get(item.binding, 0) + 1
+                pending.extend(item.children)
+            candidate.uses = counts
+            size = _size(expression)
+        else:
+            size = _size(body)
+        if size <= self.budget or calls == 1:
+            self.candidates[sub.binding] = candidate
+
+    # Expansão
+    def _inline_scope(self, block, depth):
+        """Expande as chamadas no corpo de um bloco (principal ou de um subprograma) com profundidade 'depth'."""
+        if not self.candidates:
+            return
+        _, decls, body = block_parts(block)
+        if body is None or decls is None:
+            return
+
+        def expand(node):
+            kind = node.type
+            if kind not in CALLS:
+                return node
+            candidate = self.candidates.get(node.binding)
+            if candidate is None or candidate.is_function != (kind == 'FunctionCall'):
+                return node
+            args = node.children[0].children if node.children else []
+            if len(args) != len(candidate.params):
+                return node
+            if candidate.is_function:
+                return self._inline_function(node, candidate, args)
+            return self._inline_procedure(node, candidate, args, decls, depth)
+
+        block.children[2] = transform_postorder(body, expand)
+
+    def _inline_function(self, call, candidate, args):
+        values = {}
+        for param, arg in zip(candidate.params, args):
+            if not is_pure(arg):
+                return call
+            if candidate.uses.get(param, 0) > 1 and arg.type not in ('VariableAccess', 'IntegerConstant', 'BooleanConstant'):
+                return call
+            values[param] = arg
+        self.optimizer._applied('inlined_call')
+
+        def substitute(n):
+            if n.type == 'VariableAccess' and n.binding in values:
+                return _copy(values[n.binding], lambda binding: None)
+            return n
+
+        expression = _copy(candidate.expression, lambda binding: None)
+        return transform_postorder(expression, substitute)
+
+    def _inline_procedure(self, call, candidate, args, decls, depth):
+        self.counter += 1
+        prefix = f"${candidate.name}{self.counter}_"
+        renamed = {}
+        for binding in candidate.params + candidate.locals:
+            renamed[binding] = declare_variable(decls, prefix + binding.name, binding.type, depth, call.lineno)
+        self.optimizer._applied('inlined_call')
+
+        statements = [Node('AssignmentStatement', [variable(renamed[param], call.lineno), arg], lineno=call.lineno)
+                      for param, arg in zip(candidate.params, args)]
+        for binding in candidate.locals:
+            if binding.type is INTEGER:
+                zero = Node('IntegerConstant', [], 0, lineno=call.lineno, value_type=INTEGER)
+            else:
+                zero = Node('BooleanConstant', [], 'false', lineno=call.lineno, value_type=BOOLEAN)
+            statements.append(Node('AssignmentStatement', [variable(renamed[binding], call.lineno), zero],
+                                   lineno=call.lineno))
+        statements.append(_copy(candidate.body, renamed.get))
+        return Node('CompoundStatement', statements, lineno=call.lineno)
@@ -1,3 +1,4 @@
+import os
 import ply.lex as lex
 
 # Palavras Reservadas 
@@ -7,6 +8,7 @@ reserved = {
     'end': 'END',
     'var': 'VAR',
     'integer': 'INTEGER',
+    'real': 'REAL',
     'boolean': 'BOOLEAN',
     'string': 'STRING',
     'array': 'ARRAY',
@@ -134,22 +136,88 @@ def t_error(t):
 
 
 # Construção do Lexer
-lexer = lex.lex()
+# Por omissão as tabelas são lidas de lextab.py/parsetab.pickle (pré-geradas) em modo
+# 'optimize' do PLY, sem validar as regras nem a gramática em cada arranque.
+# Depois de alterar tokens ou regras, correr uma vez com PLC_REBUILD_TABLES=1
+# para validar e regenerar as duas tabelas.
+REBUILD_TABLES = os.environ.get('PLC_REBUILD_TABLES') == '1'
+TABLES_DIR = os.path.dirname(os.path.abspath(__file__))
+
+if REBUILD_TABLES:
+    lexer = lex.lex()
+    lexer.writetab('lextab', TABLES_DIR)
+else:
+    lexer = lex.lex(optimize=1, lextab='lextab', outputdir=TABLES_DIR)
 
 # Guardar erros 
 lexer.errors = [] 
 
+
+class TokenBuffer:
+    """
+    Tokeniza o código uma única vez e guarda os tokens e os erros léxicos.
+    O mesmo buffer serve a verificação léxica, o parser (via 'tokenfunc' do yacc)
+    e o modo -t, evitando voltar a correr o lexer sobre a mesma fonte.
+    """
+    def __init__(self, data, tokens=None, errors=None, backend='ply'):
+        """'backend' escolhe o scanner: 'ply' (este módulo) ou 'fast' (scanner.py)."""
+        self.lexdata = data # Usado pelo parser para calcular colunas nos erros (p.lexer.lexdata)
+        if tokens is None and backend == 'fast':
+            from scanner import scan # Importação tardia: scanner.py importa este módulo
+            tokens, errors = scan(data)
+        elif tokens is None:
+            lexer.errors = []
+            lexer.lineno = 1 # O lexer é global: recomeçar a contagem em cada fonte
+            lexer.input(data)
+            tokens = list(lexer)
+            errors = lexer.errors
+        self.tokens = tokens
+        self.errors = list(errors or [])
+        self.pos = 0
+
+    @classmethod
+    def from_tuples(cls, data, tuples, errors=None):
+        """Reconstrói o buffer a partir de tuplos (type, value, lineno, lexpos), ex: vindos da cache."""
+        tokens = []
+        for tok_type, value, lineno, lexpos in tuples:
+            tok = lex.LexToken()
+            tok.type = tok_type
+            tok.value = value
+            tok.lineno = lineno
+            tok.lexpos = lexpos
+            tokens.append(tok)
+        return cls(data, tokens, errors)
+
+    def as_tuples(self):
+        return [(tok.type, tok.value, tok.lineno, tok.lexpos) for tok in self.tokens]
+
+    def token(self):
+        """Devolve o próximo token (interface 'tokenfunc' do PLY) ou None no fim."""
+        pos = self.pos
+        if pos < len(self.tokens):
+            self.pos = pos + 1
+            return self.tokens[pos]
+        return None
+
+    def rewind(self):
+        self.pos = 0
+
+    # Sem __len__ de propósito: o yacc faz 'if not lexer' e um buffer vazio seria tratado
+    # como "sem lexer", passando a usar o lexer global.
+    def __iter__(self):
+        return iter(self.tokens)
+
+
 # Função utilitária para imprimir os tokens encontrados numa string.
-def test_lexer(data):
+def test_lexer(data, buffer=None, backend='ply'):
     """
     Função utilitária para imprimir os tokens encontrados numa string.
+    Aceita um TokenBuffer já construído para não voltar a tokenizar.
     """
-    lexer.input(data)
+    if buffer is None:
+        buffer = TokenBuffer(data, backend=backend)
     print(f"{'TOKEN TYPE':<20} {'VALUE':<20} {'LINE':<5} {'COL':<5}")
     print("-" * 50)
-    while True:
-        tok = lexer.token()
-        if not tok:
-            break
+    for tok in buffer:
         col = find_column(data, tok)
         print(f"{tok.type:<20} {str(tok.value):<20} {tok.lineno:<5} {col:<5}")
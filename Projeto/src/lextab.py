@@ -0,0 +1,10 @@
+# lextab.py. This file automatically created by PLY (version 3.11). Don't edit!
+_tabversion   = '3.10'
+_lextokens    = set(('AND', 'ARRAY', 'ASSIGN', 'BEGIN', 'BOOLEAN', 'COLON', 'COMMA', 'DIV', 'DIVIDE', 'DO', 'DOT', 'DOTDOT', 'DOWNTO', 'ELSE', 'END', 'EQUAL', 'FALSE', 'FOR', 'FUNCTION', 'GREATEREQUAL', 'GREATERTHAN', 'ID', 'IF', 'INTEGER', 'INTEGER_CONST', 'LBRACKET', 'LESSEQUAL', 'LESSTHAN', 'LPAREN', 'MINUS', 'MOD', 'NOT', 'NOTEQUAL', 'OF', 'OR', 'PLUS', 'PROCEDURE', 'PROGRAM', 'RBRACKET', 'READ', 'READLN', 'REAL', 'REAL_CONST', 'RPAREN', 'SEMICOLON', 'STRING', 'STRING_CONST', 'THEN', 'TIMES', 'TO', 'TRUE', 'VAR', 'WHILE', 'WRITE', 'WRITELN'))
+_lexreflags   = 64
+_lexliterals  = ''
+_lexstateinfo = {'INITIAL': 'inclusive'}
+_lexstatere   = {'INITIAL': [("(?P<t_ID>[a-zA-Z][a-zA-Z0-9_]*)|(?P<t_REAL_CONST>\\d+(\\.\\d+)([eE][-+]?\\d+)?|\\d+[eE][-+]?\\d+)|(?P<t_INTEGER_CONST>\\d+)|(?P<t_STRING_CONST>'([^']|'')*')|(?P<t_COMMENT>(\\{[^}]*\\})|(\\(\\*.*?\\*\\)))|(?P<t_newline>\\n+)|(?P<t_DOTDOT>\\.\\.)|(?P<t_PLUS>\\+)|(?P<t_TIMES>\\*)|(?P<t_DIVIDE>\\/)|(?P<t_ASSIGN>:=)|(?P<t_NOTEQUAL><>)|(?P<t_LESSEQUAL><=)|(?P<t_GREATEREQUAL>>=)|(?P<t_LPAREN>\\()|(?P<t_RPAREN>\\))|(?P<t_LBRACKET>\\[)|(?P<t_RBRACKET>\\])|(?P<t_DOT>\\.)|(?P<t_MINUS>-)|(?P<t_EQUAL>=)|(?P<t_LESSTHAN><)|(?P<t_GREATERTHAN>>)|(?P<t_COMMA>,)|(?P<t_SEMICOLON>;)|(?P<t_COLON>:)", [None, ('t_ID', 'ID'), ('t_REAL_CONST', 'REAL_CONST'), None, None, ('t_INTEGER_CONST', 'INTEGER_CONST'), ('t_STRING_CONST', 'STRING_CONST'), None, ('t_COMMENT', 'COMMENT'), None, None, ('t_newline', 'newline'), (None, 'DOTDOT'), (None, 'PLUS'), (None, 'TIMES'), (None, 'DIVIDE'), (None, 'ASSIGN'), (None, 'NOTEQUAL'), (None, 'LESSEQUAL'), (None, 'GREATEREQUAL'), (None, 'LPAREN'), (None, 'RPAREN'), (None, 'LBRACKET'), (None, 'RBRACKET'), (None, 'DOT'), (None, 'MINUS'), (None, 'EQUAL'), (None, 'LESSTHAN'), (None, 'GREATERTHAN'), (None, 'COMMA'), (None, 'SEMICOLON'), (None, 'COLON')])]}
+_lexstateignore = {'INITIAL': ' \t'}
+_lexstateerrorf = {'INITIAL': 't_error'}
+_lexstateeoff = {}
@@ -0,0 +1,229 @@
+"""
+Movimento de código invariante dos ciclos (loop-invariant code motion).
+
+Uma expressão dentro de um ciclo cujas variáveis não são alteradas no ciclo tem
+sempre o mesmo valor: é calculada uma vez antes do ciclo para uma variável
+escondida ($inv0, $inv1, ...) declarada no bloco atual, e o ciclo passa a ler a
+variável. Só se movem expressões sem efeitos e que não podem falhar, porque passam
+a ser avaliadas mesmo que o ciclo não dê nenhuma volta ou que estejam num ramo que
+não é executado:
+  - operadores sobre variáveis escalares e constantes (sem acessos a arrays nem a
+    strings, que podem sair dos limites, e sem div, mod ou '/' por algo que não
+    seja uma constante diferente de zero)
+  - com pelo menos um operador e uma variável (as constantes já foram dobradas)
+A variável escondida tem o tipo que a análise semântica deu à expressão.
+Os ciclos com chamadas de funções/procedimentos (também no valor inicial ou no
+limite de um for) ficam como estão: a chamada pode alterar qualquer global. Os ciclos interiores são tratados primeiro, por isso uma
+expressão invariante em vários níveis sobe de ciclo em ciclo.
+"""
+from parser import Node
+from visitor import NodeVisitor
+from deadcode import same_expression, declare_variable, variable
+
+CALLS = ('FunctionCall', 'ProcedureCall')
+OPERATORS = ('BinaryOp', 'UnaryOp')
+# Folhas que podem fazer parte de uma expressão invariante (além das variáveis)
+INVARIANT_LEAVES = ('IntegerConstant', 'RealConstant', 'BooleanConstant', 'StringConstant')
+DIVISIONS = ('DIV', 'MOD', '/')
+
+
+def _safe_operator(node):
+    """O operador não pode falhar (uma divisão só por uma constante diferente de zero)."""
+    if node.leaf in DIVISIONS:
+        divisor = node.children[1]
+        return divisor.type in ('IntegerConstant', 'RealConstant') and divisor.leaf != 0
+    return True
+
+
+def _loop_writes(loop):
+    """(ligações alteradas em cada volta do ciclo, True se o ciclo tem chamadas)."""
+    if loop.type == 'ForStatement':
+        # O valor inicial e o limite são avaliados antes do ciclo, mas depois das
+        # atribuições movidas para fora dele: uma chamada aí também impede o LICM
+        written = {loop.children[0].binding}
+        pending = loop.children[1:]
+    else:
+        written = set()
+        pending = [loop]
+    while pending:
+        item = pending.pop()
+        kind = getattr(item, 'type', None)
+        if kind is None:
+            continue
+        if kind in CALLS:
+            return written, True
+        if kind == 'AssignmentStatement':
+            written.add(item.children[0].binding)
+        elif kind == 'ReadStatement':
+            written.update(var.binding for var in item.children)
+        elif kind == 'ForStatement':
+            written.add(item.children[0].binding)
+        pending.extend(item.children)
+    return written, False
+
+
+class InvariantHoister(NodeVisitor):
+    """
+    Passagem de LICM sobre a AST otimizada. Cada expressão movida conta como
+    'loop_invariant' no Otimizador ('optimizer').
+    """
+    visit_prefix = 'hoist_'
+
+    def __init__(self, optimizer):
+        self.optimizer = optimizer
+        self.declarations = None # Declarations do bloco atual (recebem as variáveis escondidas)
+        self.depth = 0 # Profundidade do bloco atual (0 = programa principal)
+        self.counter = 0
+        self.hidden = set() # Ligações das variáveis escondidas (cada uma é atribuída num só sítio)
+
+    def hoist(self, ast):
+        return self.visit(ast)
+
+    def generic_visit(self, node):
+        return node
+
+    # Estrutura
+    def hoist_Program(self, node):
+        children = node.children
+        for i, child in enumerate(children):
+            children[i] = yield child
+        return node
+
+    hoist_FunctionDeclarations = hoist_Program
+    hoist_CompoundStatement = hoist_Program
+
+    def hoist_Block(self, node):
+        outer = self.declarations
+        node.children[0] = yield node.children[0]
+        self.declarations = node.children[1]
+        node.children[2] = yield node.children[2]
+        self.declarations = outer
+        return node
+
+    def hoist_FunctionDeclaration(self, node):
+        self.depth += 1
+        node.children[2] = yield node.children[2]
+        self.depth -= 1
+        return node
+
+    hoist_ProcedureDeclaration = hoist_FunctionDeclaration
+
+    def hoist_IfStatement(self, node):
+        children = node.children
+        for i in range(1, len(children)):
+            children[i] = yield children[i]
+        return node
+
+    # Ciclos
+    def hoist_WhileStatement(self, node):
+        node.children[1] = yield node.children[1]
+        # A condição é avaliada em cada volta: também pode ter partes invariantes
+        return self._hoist_loop(node, (0, 1))
+
+    def hoist_ForStatement(self, node):
+        node.children[3] = yield node.children[3]
+        # O valor inicial e o limite já são avaliados uma só vez
+        return self._hoist_loop(node, (3,))
+
+    def _hoist_loop(self, loop, parts):
+        if self.declarations is None:
+            return loop
+        written, has_call = _loop_writes(loop)
+        if has_call:
+            return loop
+        hoisted = [] # [(expressão, variável escondida)] deste ciclo
+        for i in parts:
+            self._hoist_statement(loop, i, written, hoisted)
+        if not hoisted:
+            return loop
+        assignments = [
+            Node('AssignmentStatement', [variable(binding, expr.lineno), expr], lineno=loop.lineno)
+            for expr, binding in hoisted
+        ]
+        return Node('CompoundStatement', assignments + [loop], lineno=loop.lineno)
+
+    def _hoist_statement(self, parent, index, written, hoisted):
+        """Substitui as expressões invariantes em todos os comandos de parent.children[index]."""
+        pending = [(parent, index)]
+        while pending:
+            owner, i = pending.pop()
+            node = owner.children[i]
+            kind = getattr(node, 'type', None)
+            if kind is None:
+                continue
+            if kind == 'AssignmentStatement':
+                target = node.children[0]
+                if target.binding in self.hidden and self._is_invariant(node.children[1], written):
+                    # Valor movido de um ciclo interior que também não muda neste:
+                    # a atribuição inteira sai do ciclo (a variável só é escrita aqui)
+                    hoisted.append((node.children[1], target.binding))
+                    owner.children[i] = Node('Empty', [], lineno=node.lineno)
+                    continue
+                if target.type == 'ArrayAccess':
+                    pending.append((target, 0))
+                pending.append((node, 1))
+            elif kind == 'ReadStatement':
+                pending.extend((var, 0) for var in node.children if var.type == 'ArrayAccess')
+            elif kind in ('WriteStatement', 'CompoundStatement', 'IfStatement', 'WhileStatement'):
+                pending.extend((node, j) for j in range(len(node.children)))
+            elif kind == 'ForStatement':
+                pending.extend((node, j) for j in (1, 2, 3))
+            elif kind in OPERATORS or kind == 'ArrayAccess':
+                self._hoist_expression(owner, i, written, hoisted)
+
+    def _hoist_expression(self, owner, index, written, hoisted):
+        """Troca as maiores subexpressões invariantes de owner.children[index] por variáveis escondidas."""
+        invariant = self._invariant_nodes(owner.children[index], written)
+        pending = [(owner, index)]
+        while pending:
+            owner, i = pending.pop()
+            node = owner.children[i]
+            if id(node) in invariant and node.type in OPERATORS:
+                owner.children[i] = self._variable_for(node, hoisted)
+            else:
+                pending.extend((node, j) for j in range(len(node.children)))
+
+    def _is_invariant(self, expr, written):
+        if expr.type == 'VariableAccess':
+            return expr.binding not in written
+        return id(expr) in self._invariant_nodes(expr, written)
+
+    def _invariant_nodes(self, expr, written):
+        """ids dos nós de 'expr' que são invariantes no ciclo e podem ser avaliados antes dele."""
+        invariant = set()
+        has_variable = {} # id -> a subárvore lê alguma variável
+        order = []
+        pending = [expr]
+        while pending:
+            node = pending.pop()
+            order.append(node)
+            pending.extend(node.children)
+        for node in reversed(order): # Filhos antes dos pais
+            kind = node.type
+            key = id(node)
+            if kind == 'VariableAccess':
+                if node.binding not in written:
+                    invariant.add(key)
+                    has_variable[key] = True
+            elif kind in INVARIANT_LEAVES:
+                invariant.add(key)
+            elif kind in OPERATORS and _safe_operator(node):
+                if all(id(child) in invariant for child in node.children):
+                    invariant.add(key)
+                    has_variable[key] = any(has_variable.get(id(child)) for child in node.children)
+        # Sem variáveis é uma constante: não vale a pena mover
+        return {key for key in invariant if has_variable.get(key)}
+
+    def _variable_for(self, expr, hoisted):
+        """Variável escondida com o valor de 'expr' (a mesma para expressões iguais no ciclo)."""
+        for other, binding in hoisted:
+            if same_expression(expr, other):
+                break
+        else:
+            binding = declare_variable(self.declarations, f"$inv{self.counter}", expr.value_type, self.depth,
+                                       expr.lineno)
+            self.counter += 1
+            self.hidden.add(binding)
+            hoisted.append((expr, binding))
+        self.optimizer._applied('loop_invariant')
+        return variable(binding, expr.lineno)
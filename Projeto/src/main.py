@@ -2,32 +2,45 @@
 import sys
 import os
 import argparse
-from rich.console import Console
-from rich.panel import Panel
-from rich.syntax import Syntax
-from rich.theme import Theme
-from rich import box
 
 # Importações dos módulos do compilador
-from lexer import lexer, test_lexer
-from parser import parser, parse
-from semantic import SemanticAnalyzer
-from codegen import CodeGenerator
-from optimizer import Optimizer
+from lexer import test_lexer
+from pipeline import compile_source, compile_batch, collect_sources, default_output_path, format_errors
+from cache import ArtifactCache, DEFAULT_CACHE_DIR, DEFAULT_MAX_BYTES
+from profiling import Profiler, NULL_PROFILER
 
 # Configuração do Tema Visual (Cores)
-custom_theme = Theme({
+THEME_STYLES = {
     "info": "dim cyan",
     "warning": "bold yellow",
     "error": "bold red",
     "success": "bold green",
     "step": "bold blue",
-})
-console = Console(theme=custom_theme)
+}
+
+
+class LazyConsole:
+    """
+    Consola do rich criada apenas no primeiro uso.
+    Importar o rich (e o pygments, usado pelo Syntax) é a parte mais lenta do arranque;
+    assim o modo batch, o --help e o modo silencioso nunca chegam a importá-lo.
+    """
+    _console = None
+
+    def __getattr__(self, name):
+        if self._console is None:
+            from rich.console import Console
+            from rich.theme import Theme
+            LazyConsole._console = Console(theme=Theme(THEME_STYLES))
+        return getattr(self._console, name)
+
+
+console = LazyConsole()
 
 def print_banner():
     """Limpa o ecrã e mostra o logótipo do compilador."""
-    os.system('cls' if os.name == 'nt' else 'clear')
+    from rich.panel import Panel
+    console.clear() # Sequência ANSI em vez de lançar uma shell com 'clear'
     title = r"""[bold magenta]
    ____                      _ _           _            
   / ___|___  _ __ ___  _ __ (_) | __ _  __| | ___  _ __ 
@@ -42,30 +55,130 @@ def print_banner():
 
 def show_source_preview(code, filename):
     """Mostra o código fonte Pascal com cores (syntax highlighting)."""
+    from rich.panel import Panel
+    from rich.syntax import Syntax
     display_name = os.path.basename(filename)
     syntax = Syntax(code, "pascal", theme="monokai", line_numbers=True)
     console.print(Panel(syntax, title=f"📄 [bold]{display_name}[/]", border_style="blue", expand=False))
 
-def run_lexical_check(code):
-    """Executa o Lexer para encontrar caracteres inválidos."""
-    lexer.errors = [] 
-    lexer.input(code)
-    for _ in lexer: 
-        pass 
-    
-    if lexer.errors:
-        error_lines = []
-        for err in lexer.errors:
-            msg = f"• Linha {err['lineno']}, Coluna {err['col']}: Caractere inválido '[bold yellow]{err['value']}[/]'"
-            error_lines.append(msg)
-            
-        error_text = "\n".join(error_lines)
-        console.print(Panel(error_text, title="❌ [error]Erros Léxicos[/]", border_style="red"))
-        return True 
-    return False 
+def report_lexical_errors(errors):
+    """Mostra os caracteres inválidos encontrados pelo Lexer."""
+    from rich.panel import Panel
+    error_lines = []
+    for err in errors:
+        msg = f"• Linha {err['lineno']}, Coluna {err['col']}: Caractere inválido '[bold yellow]{err['value']}[/]'"
+        error_lines.append(msg)
+
+    error_text = "\n".join(error_lines)
+    console.print(Panel(error_text, title="❌ [error]Erros Léxicos[/]", border_style="red"))
+
+def make_profiler(options):
+    """Profiler ligado só com --profile/--profile-json (caso contrário não mede nada)."""
+    if options.profile or options.profile_json:
+        return Profiler()
+    return NULL_PROFILER
+
+def report_profile(profiler, options, plain=False):
+    """Mostra as métricas do --profile: JSON (ficheiro ou stdout) ou uma tabela rich."""
+    if not profiler.enabled:
+        return
+    import json
+    data = profiler.as_dict()
+    if options.profile_json and options.profile_json != '-':
+        with open(options.profile_json, 'w') as f:
+            json.dump(data, f, indent=2)
+    if options.profile_json == '-' or (options.profile and plain):
+        json.dump(data, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+        return
+    if not options.profile:
+        return
+
+    from rich.table import Table
+    table = Table(title="⏱️  Perfil da Compilação", box=None, header_style="bold magenta")
+    table.add_column("Fase")
+    table.add_column("Tempo (ms)", justify="right")
+    table.add_column("CPU (ms)", justify="right")
+    table.add_column("Pico Memória (KiB)", justify="right")
+    for name, stats in profiler.phases.items():
+        peak = stats['peak_bytes']
+        table.add_row(name, f"{stats['wall'] * 1000:.2f}", f"{stats['cpu'] * 1000:.2f}",
+                      f"{peak / 1024:.0f}" if peak is not None else "-")
+    console.print(table)
+
+    counters = profiler.counters
+    lines = [f"Tokens: {counters.get('tokens', 0)}",
+             f"Nós da AST: {counters.get('ast_nodes', 0)}",
+             f"Instruções: {counters.get('instructions', 0)}",
+             f"Etiquetas: {counters.get('labels', 0)}",
+             f"Otimizações: {counters.get('optimizations', 0)}",
+             f"Peephole: -{counters.get('peephole_removed', 0)} instruções"]
+    for rule, count in counters.get('optimizations_by_rule', {}).items():
+        lines.append(f"  • {rule}: {count}")
+    top_types = list(counters.get('ast_nodes_by_type', {}).items())[:8]
+    if top_types:
+        lines.append("Nós por tipo: " + ", ".join(f"{name}={count}" for name, count in top_types))
+    console.print("[info]" + "\n".join(lines) + "[/]\n")
+
+def run_hotspots(result, options):
+    """Executa o código gerado no interpretador local e agrega o custo por linha (--hotspots)."""
+    from hotspots import profile_execution
+    code = result.code
+    if code is None:
+        with open(result.output_file) as f:
+            code = f.read().splitlines()
+    stdin = ()
+    if options.input:
+        with open(options.input) as f:
+            stdin = f.read()
+    return profile_execution(code, result.source_map, stdin, options.max_steps)
+
+def report_hotspots(result, source_code, options, plain=False):
+    """Mostra as linhas, ciclos e subprogramas onde o programa gasta mais instruções."""
+    from ewvm import EWVMError
+    try:
+        report = run_hotspots(result, options)
+    except (EWVMError, OSError) as e:
+        if plain:
+            print(f"Erro de execução: {e}", file=sys.stderr)
+        else:
+            console.print(f"[error]❌ Erro na execução local: {e}[/]")
+        return False
+    if plain:
+        import json
+        json.dump(report.as_dict(options.top), sys.stdout, indent=2, ensure_ascii=False)
+        sys.stdout.write("\n")
+        return True
+
+    from rich.table import Table
+    source_lines = source_code.splitlines()
+    total = report.total or 1
+    if report.output:
+        console.print(f"[info]Saída do programa:[/] {report.output.rstrip()}")
+    table = Table(title=f"🔥 Linhas Quentes ({report.total} instruções executadas)", box=None, header_style="bold magenta")
+    table.add_column("Linha", justify="right")
+    table.add_column("Subprograma")
+    table.add_column("Instruções", justify="right")
+    table.add_column("%", justify="right")
+    table.add_column("Código")
+    for line, subprogram, steps in report.hot_lines(options.top):
+        text = source_lines[line - 1].strip() if 0 < line <= len(source_lines) else ""
+        table.add_row(str(line), subprogram, str(steps), f"{steps / total:.1%}", text)
+    console.print(table)
+
+    loops = report.hot_loops(options.top)
+    if loops:
+        console.print("[info]Ciclos (inclui ciclos interiores): " + ", ".join(
+            f"linha {line} ({subprogram}) {steps / total:.1%}" for line, subprogram, steps in loops) + "[/]")
+    console.print("[info]Subprogramas: " + ", ".join(
+        f"{name} {steps / total:.1%}" for name, steps in report.hot_subprograms()) + "[/]\n")
+    return True
 
 def compile_file(file_path, options):
     """Função principal que coordena todas as fases da compilação."""
+    from rich.panel import Panel
+    from rich import box
+    profiler = make_profiler(options)
     try:
         with open(file_path, 'r') as f:
             source_code = f.read()
@@ -81,76 +194,101 @@ def compile_file(file_path, options):
         console.print("  [step]⚙️ Executando Lexer...[/]")
         if options.tokens_only:
             console.rule("[bold blue]Análise Léxica (Tokens)[/]")
-            test_lexer(source_code)
+            test_lexer(source_code, backend=options.lexer)
             return
 
-        if run_lexical_check(source_code):
+        output_file = None
+        if not options.no_code and not options.ast_only:
+            output_file = options.output
+            if not output_file:
+                output_dir = "../outputs"
+                os.makedirs(output_dir, exist_ok=True)
+                output_file = default_output_path(file_path, output_dir)
+
+        cache = None
+        if not options.no_cache:
+            cache = ArtifactCache(options.cache_dir, options.cache_size * 1024 * 1024)
+
+        #  Iniciar o Processo de Compilação (o pipeline corre sem interface; aqui só se apresenta)
+        with console.status("[bold green]A compilar...[/]", spinner="dots"):
+            result = compile_source(
+                source_code,
+                no_opt=options.no_opt,
+                no_code=options.no_code,
+                stop_after='parse' if options.ast_only else None,
+                cache=cache,
+                output_file=output_file,
+                preview_lines=options.preview,
+                lexer_backend=options.lexer,
+                profiler=profiler,
+                source_map=options.hotspots,
+            )
+
+        if result.cached:
+            console.print("  [info]♻️  Resultado servido a partir da cache.[/]")
+
+        if result.lexical_errors:
+            report_lexical_errors(result.lexical_errors)
             console.print("[error]❌ Compilação abortada devido a erros léxicos.[/]\n")
             return
 
-        #  Iniciar o Processo de Compilação
-        with console.status("[bold green]A compilar...[/]", spinner="dots"):
+        # Fase de Parsing
+        console.print("  [step]⚙️ Executando Parser...[/]")
+        ast = result.ast
+
+        # Mostrar Erros Fatais
+        # É a informação mais importante para o utilizador corrigir
+        if result.syntax_errors:
+            error_lines = []
+            for err in result.syntax_errors:
+                msg = f"• Linha {err['lineno']}, Coluna {err['col']}: {err['msg']}"
+                if err['dica']:
+                    msg += f" [dim italic]({err['dica']})[/]"
+                error_lines.append(msg)
             
-            # Fase de Parsing
-            console.print("  [step]⚙️ Executando Parser...[/]")
+            error_text = "\n".join(error_lines)
+            console.print(Panel(error_text, title="❌ [error]Erros Sintáticos[/]", border_style="red"))
+
+        # Recuperação
+        # Informação complementar sobre o que o compilador decidiu ignorar
+        if result.recovery_warnings:
+            rec_lines = []
+            for warn in result.recovery_warnings:
+                msg = f"• Linha {warn['lineno']}: {warn['msg']}"
+                rec_lines.append(msg)
             
-            ast, syntax_errors, recovery_warnings = parse(source_code)
-
-            # Mostrar Erros Fatais
-            # É a informação mais importante para o utilizador corrigir
-            if syntax_errors:
-                error_lines = []
-                for err in syntax_errors:
-                    msg = f"• Linha {err['lineno']}, Coluna {err['col']}: {err['msg']}"
-                    if err['dica']:
-                        msg += f" [dim italic]({err['dica']})[/]"
-                    error_lines.append(msg)
-                
-                error_text = "\n".join(error_lines)
-                console.print(Panel(error_text, title="❌ [error]Erros Sintáticos[/]", border_style="red"))
-
-            # Recuperação
-            # Informação complementar sobre o que o compilador decidiu ignorar
-            if recovery_warnings:
-                rec_lines = []
-                for warn in recovery_warnings:
-                    msg = f"• Linha {warn['lineno']}: {warn['msg']}"
-                    rec_lines.append(msg)
-                
-                warn_text = "\n".join(rec_lines)   
-                console.print(Panel(
-                    warn_text, 
-                    title="⚠️ [warning]Recuperação dos Erros Sintáticos[/]", # Título ligeiramente mais descritivo
-                    border_style="yellow",
-                    box=box.ROUNDED
-                ))
-                
-            if syntax_errors:
-                if not ast:
-                    console.print("[error]❌ Compilação abortada devido a erros sintáticos.[/]\n")
-                    return
-                else:
-                    console.print("[warning]⚠️ O parser recuperou de erros, mas a compilação pode estar instável.[/]\n")
-
-            if not ast and not syntax_errors:
-                console.print("[error]❌ Erro Crítico: Falha desconhecida no Parser.[/]")
-                return
+            warn_text = "\n".join(rec_lines)   
+            console.print(Panel(
+                warn_text, 
+                title="⚠️ [warning]Recuperação dos Erros Sintáticos[/]", # Título ligeiramente mais descritivo
+                border_style="yellow",
+                box=box.ROUNDED
+            ))
             
-            if options.ast_only:
-                console.print(ast)
+        if result.syntax_errors:
+            if not ast:
+                console.print("[error]❌ Compilação abortada devido a erros sintáticos.[/]\n")
                 return
+            else:
+                console.print("[warning]⚠️ O parser recuperou de erros, mas a compilação pode estar instável.[/]\n")
 
-            # Fase Semântica
-            console.print("  [step]🧠 Verificando Semântica...[/]")
-            analyzer = SemanticAnalyzer()
-            is_valid, errors, warnings = analyzer.analyze(ast)
+        if not ast and not result.syntax_errors:
+            console.print("[error]❌ Erro Crítico: Falha desconhecida no Parser.[/]")
+            return
+        
+        if options.ast_only:
+            console.print(ast)
+            return
+
+        # Fase Semântica
+        console.print("  [step]🧠 Verificando Semântica...[/]")
 
         # Mostrar Resultados Semânticos
-        if warnings:
-            console.print(Panel("\n".join(warnings), title="⚠️ Avisos", border_style="yellow"))
+        if result.semantic_warnings:
+            console.print(Panel("\n".join(result.semantic_warnings), title="⚠️ Avisos", border_style="yellow"))
         
-        if not is_valid:
-            error_text = "\n".join([f"• {err}" for err in errors])
+        if not result.is_valid:
+            error_text = "\n".join([f"• {err}" for err in result.semantic_errors])
             console.print(Panel(error_text, title="❌ [error]Erros Semânticos[/]", border_style="red"))
             console.print("[error]❌ Compilação abortada devido a erros semânticos.[/]\n")
             return
@@ -158,48 +296,27 @@ def compile_file(file_path, options):
             console.print("     ✅[success] Semântica Válida[/]")
 
         # Fase de Otimização
-        if not options.no_opt:
-            with console.status("[bold magenta]A otimizar código...[/]", spinner="bouncingBall"):
-                opt = Optimizer()
-                ast = opt.optimize(ast)
-                if opt.optimizations_count > 0:
-                    console.print(f"     ⚡[bold yellow] Otimização:[/][success] {opt.optimizations_count} Simplificações[/]")
+        if not options.no_opt and result.optimizations_count > 0:
+            console.print(f"     ⚡[bold yellow] Otimização:[/][success] {result.optimizations_count} Simplificações[/]")
 
         # Fase da Geração de Código
-        output_file = ""
         if not options.no_code:
-            with console.status("[bold cyan]A gerar Assembly EWVM...[/]", spinner="earth"):
-                generator = CodeGenerator(analyzer.global_scope) 
-                code = generator.generate(ast)
-                
-                output_file = options.output
-                if not output_file:
-                    output_dir = "../outputs"
-                    
-                    os.makedirs(output_dir, exist_ok=True)
-                    
-                    base_name = os.path.basename(file_path)
-                    
-                    name_only = os.path.splitext(base_name)[0]
-                    # Simplificação da construção do caminho
-                    output_file = os.path.join(output_dir, name_only + '.ewvm')
-                
-                with open(output_file, 'w') as f:
-                    for instruction in code:
-                        f.write(f"{instruction}\n")
-            
             console.print(f"     ✅[success] Código Gerado com Sucesso![/]")
+            if result.peephole_removed > 0:
+                console.print(f"     ⚡[bold yellow] Peephole:[/][success] -{result.peephole_removed} Instruções[/]")
             console.print("\n")
             
             # Visualização do Código Gerado
-            try:
-                with open(output_file, 'r') as f:
-                    ewvm_content = f.read()
+            # Usa as primeiras instruções guardadas durante a emissão (não relê o ficheiro)
+            if options.preview > 0 and result.preview:
+                from rich.syntax import Syntax
+                ewvm_content = "\n".join(result.preview)
+                omitted = result.instruction_count - len(result.preview)
                 
                 assembly_view = Syntax(ewvm_content, "nasm", theme="monokai", line_numbers=True, word_wrap=True)
                 
                 # Pegar apenas o nome do ficheiro para o título
-                display_name = os.path.basename(output_file)
+                display_name = os.path.basename(result.output_file)
 
                 code_panel = Panel(
                     assembly_view,
@@ -210,9 +327,12 @@ def compile_file(file_path, options):
                     expand=False
                 )
                 console.print(code_panel)
+                if omitted > 0:
+                    console.print(f"[info]... mais {omitted} instruções em {result.output_file} (use --preview N)[/]")
                 print("\n")
-            except Exception:
-                console.print("[warning]⚠️  Não foi possível ler o ficheiro gerado para pré-visualização.[/]")
+
+            if options.hotspots:
+                report_hotspots(result, source_code, options)
 
     except FileNotFoundError:
         console.print(f"[error]❌ Erro: O arquivo '{file_path}' não foi encontrado.[/]")
@@ -221,6 +341,68 @@ def compile_file(file_path, options):
         if options.verbose:
             import traceback
             traceback.print_exc()
+    finally:
+        report_profile(profiler, options)
+
+def compile_quiet(file_path, options):
+    """
+    Caminho rápido (-q): compila sem interface rich e sem limpar o ecrã.
+    Imprime só os erros (stderr) ou o ficheiro gerado; devolve o código de saída.
+    """
+    try:
+        with open(file_path, 'r') as f:
+            source_code = f.read()
+    except OSError as e:
+        print(f"Erro: {e}", file=sys.stderr)
+        return 1
+
+    output_file = None
+    if not options.no_code:
+        output_file = options.output
+        if not output_file:
+            os.makedirs("../outputs", exist_ok=True)
+            output_file = default_output_path(file_path)
+
+    cache = None
+    if not options.no_cache:
+        cache = ArtifactCache(options.cache_dir, options.cache_size * 1024 * 1024)
+
+    profiler = make_profiler(options)
+    result = compile_source(source_code, no_opt=options.no_opt, no_code=options.no_code, cache=cache,
+                            output_file=output_file, lexer_backend=options.lexer, profiler=profiler,
+                            source_map=options.hotspots)
+    if not result.ok:
+        for error in format_errors(result):
+            print(f"{file_path}: {error}", file=sys.stderr)
+    elif result.output_file:
+        print(result.output_file)
+    report_profile(profiler, options, plain=True)
+    if result.ok and options.hotspots and not options.no_code:
+        if not report_hotspots(result, source_code, options, plain=True):
+            return 1
+    return 0 if result.ok else 1
+
+def run_batch(options):
+    """Modo batch: compila vários ficheiros em paralelo e imprime um resumo em JSON (sem rich)."""
+    import json
+
+    paths = list(options.source)
+    if options.batch:
+        paths.append(options.batch)
+    files = collect_sources(paths)
+
+    summary = compile_batch(
+        files,
+        output_dir=options.output or "../outputs",
+        jobs=options.jobs,
+        no_opt=options.no_opt,
+        no_code=options.no_code,
+        cache_dir=None if options.no_cache else options.cache_dir,
+        lexer_backend=options.lexer,
+    )
+    json.dump(summary, sys.stdout, indent=2, ensure_ascii=False)
+    sys.stdout.write("\n")
+    return 0 if summary['failed'] == 0 else 1
 
 def main():
     parser_args = argparse.ArgumentParser(
@@ -228,25 +410,53 @@ def main():
         formatter_class=argparse.RawTextHelpFormatter
     )
     
-    parser_args.add_argument('source', help='Caminho do arquivo fonte (.pas)')
-    parser_args.add_argument('-o', '--output', help='Nome do arquivo de saída (.ewvm)')
+    parser_args.add_argument('source', nargs='*', help='Caminho do(s) arquivo(s) fonte (.pas)')
+    parser_args.add_argument('-o', '--output', help='Nome do arquivo de saída (.ewvm); em modo batch, diretoria de saída')
     
     group_debug = parser_args.add_argument_group('Debug e Visualização')
     group_debug.add_argument('-t', '--tokens-only', action='store_true', help='Mostra apenas os tokens (Lexer)')
     group_debug.add_argument('-a', '--ast-only', action='store_true', help='Mostra apenas a AST (Parser)')
     group_debug.add_argument('-v', '--verbose', action='store_true', help='Modo verboso (mostra código fonte e stack traces)')
+    group_debug.add_argument('--profile', action='store_true', help='Mostra tempos, memória e contadores de cada fase')
+    group_debug.add_argument('--profile-json', metavar='FICHEIRO', help="Guarda as métricas do --profile em JSON ('-' para stdout)")
+    group_debug.add_argument('-q', '--quiet', action='store_true', help='Sem interface: só erros ou o ficheiro gerado (arranque rápido)')
+    group_debug.add_argument('--preview', type=int, default=100, metavar='N', help='Mostra apenas as primeiras N instruções geradas (0 desativa)')
     
     group_config = parser_args.add_argument_group('Configurações')
     group_config.add_argument('--no-code', action='store_true', help='Não gerar código final')
     group_config.add_argument('--no-opt', action='store_true', help='Desativar otimizações')
+    group_config.add_argument('--lexer', choices=['ply', 'fast'], default='ply', help='Scanner a usar: PLY ou o scanner rápido (scanner.py)')
+    group_config.add_argument('--no-cache', action='store_true', help='Ignorar a cache de artefactos em disco')
+    group_config.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR, help=f'Diretoria da cache (omissão: {DEFAULT_CACHE_DIR})')
+    group_config.add_argument('--cache-size', type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024), help='Tamanho máximo da cache em MB (LRU)')
+
+    group_run = parser_args.add_argument_group('Execução Local (interpretador EWVM)')
+    group_run.add_argument('--hotspots', action='store_true', help='Executa o código gerado e mostra as linhas onde gasta mais instruções')
+    group_run.add_argument('--input', metavar='FICHEIRO', help='Linhas de entrada para os READ do programa')
+    group_run.add_argument('--top', type=int, default=15, metavar='N', help='Número de linhas/ciclos a mostrar (omissão: 15)')
+    group_run.add_argument('--max-steps', type=int, default=50_000_000, metavar='N', help='Limite de instruções executadas')
+
+    group_batch = parser_args.add_argument_group('Modo Batch')
+    group_batch.add_argument('--batch', metavar='DIR', help='Compila todos os .pas da diretoria em paralelo (resumo em JSON)')
+    group_batch.add_argument('-j', '--jobs', type=int, help='Número de processos (omissão: número de CPUs)')
     
     if len(sys.argv) == 1:
         parser_args.print_help()
         sys.exit(1)
         
     args = parser_args.parse_args()
-    
-    compile_file(args.source, args)
+
+    # Vários ficheiros ou --batch: compilação em paralelo sem interface
+    if args.batch or len(args.source) > 1:
+        sys.exit(run_batch(args))
+
+    if not args.source:
+        parser_args.error("indique um ficheiro fonte ou --batch DIR")
+
+    if args.quiet and not (args.tokens_only or args.ast_only):
+        sys.exit(compile_quiet(args.source[0], args))
+
+    compile_file(args.source[0], args)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
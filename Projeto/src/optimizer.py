@@ -1,94 +1,323 @@
 from parser import Node
+from visitor import NodeVisitor, transform_postorder
+from propagation import ConstantPropagator, CALLS
+from deadcode import DeadCodeEliminator, is_pure, same_expression
+from licm import InvariantHoister
+from inliner import Inliner
+from tailcall import TailCallEliminator
+from typesystem import INTEGER, REAL, BOOLEAN
 
-class Optimizer:
+# Tipos de constantes que o Otimizador sabe avaliar
+NUMERIC_CONSTANTS = ('IntegerConstant', 'RealConstant')
+CONSTANTS = NUMERIC_CONSTANTS + ('BooleanConstant', 'StringConstant')
+
+COMPARISONS = {
+    '=': lambda a, b: a == b,
+    '<>': lambda a, b: a != b,
+    '<': lambda a, b: a < b,
+    '>': lambda a, b: a > b,
+    '<=': lambda a, b: a <= b,
+    '>=': lambda a, b: a >= b,
+}
+# not (a < b) -> a >= b, etc.
+NEGATED_COMPARISON = {'=': '<>', '<>': '=', '<': '>=', '>=': '<', '>': '<=', '<=': '>'}
+
+
+def _c_div(a, b):
+    """Divisão inteira truncada para zero (Pascal e EWVM), ao contrário do // do Python."""
+    q = abs(a) // abs(b)
+    return q if (a >= 0) == (b >= 0) else -q
+
+
+def _constant_value(node):
+    """Valor Python de uma constante (booleanos -> True/False)."""
+    if node.type == 'BooleanConstant':
+        return str(node.leaf).lower() == 'true'
+    return node.leaf
+
+
+class Optimizer(NodeVisitor):
     """
     Realiza otimizações na AST antes da geração de código.
-    Estratégia: Constant Folding e Dead Code Elimination.
+    Estratégia: Inlining (inliner.py), Constant Folding, Simplificação Algébrica,
+    Propagação de Constantes (propagation.py), Loop-Invariant Code Motion (licm.py),
+    Dead Code Elimination (deadcode.py) e Tail Call Elimination (tailcall.py).
+    Cada regra é contada à parte em 'rule_counts':
+      constant_folding     - aritmética inteira entre constantes (3 + 4 -> 7)
+      real_folding         - aritmética com reais (2.5 * 2 -> 5.0, 7 / 2 -> 3.5)
+      comparison_folding   - comparações entre constantes (1 < 2 -> true)
+      boolean_folding      - and/or/not entre constantes (true and false -> false)
+      boolean_identity     - and/or com uma constante (x and true -> x, x or true -> true)
+      algebraic_identity   - elemento neutro (x + 0, x - 0, x * 1, x div 1 -> x)
+      annihilation         - elemento absorvente (x * 0, x mod 1 -> 0), só se x não tiver efeitos
+      self_cancel          - x - x -> 0 (x sem efeitos)
+      double_negation      - not not x -> x, -(-x) -> x
+      negated_comparison   - not (a < b) -> a >= b
+      reassociation        - junta constantes (x + 2) + 3 -> x + 5, 2 * (x * 3) -> x * 6
+      unary_folding        - menos unário de uma constante
+      dead_branch          - if com condição constante
+      constant_propagation - variável com valor constante conhecido substituída pelo valor
+      copy_propagation     - variável copiada (x := y) substituída pela original
+      inlined_call         - chamada substituída pelo corpo do subprograma (inliner.py)
+      loop_invariant       - expressão invariante calculada uma vez antes do ciclo (licm.py)
+      dead_store, dead_loop, empty_if, unused_variable, unused_subprogram - ver deadcode.py
+      tail_call            - chamada recursiva final trocada por um salto (tailcall.py)
+      accumulator          - função com recursão linear reescrita com um acumulador (tailcall.py)
     """
+    visit_prefix = 'fold_'
+
     def __init__(self):
         self.optimizations_count = 0
+        self.rule_counts = {} # Regra -> número de vezes que foi aplicada
+
+    def _applied(self, rule):
+        self.optimizations_count += 1
+        self.rule_counts[rule] = self.rule_counts.get(rule, 0) + 1
 
     def optimize(self, node):
         if not node or not isinstance(node, Node):
             return node
 
+        # Antes de tudo expande as chamadas pequenas: o código copiado é simplificado com o resto
+        node = Inliner(self).inline(node)
+
         # Otimizar filhos primeiro (Bottom-Up / Pós-Ordem)
-        # Isto é crucial: garante que (2+3)+4 vira 5+4 e depois 9 numa só passagem recursiva.
-        for i, child in enumerate(node.children):
-            node.children[i] = self.optimize(child)
-
-        # Tentar simplificar o nó atual com base nos filhos já otimizados
-        if node.type == 'BinaryOp':
-            return self.fold_binary_op(node)
-        elif node.type == 'UnaryOp':
-            return self.fold_unary_op(node)
-        elif node.type == 'IfStatement':
-            return self.fold_if_statement(node)
+        # Isto é crucial: garante que (2+3)+4 vira 5+4 e depois 9 numa só passagem.
+        # A travessia usa uma pilha explícita, por isso expressões com milhares de termos
+        # não rebentam o limite de recursão.
+        # Em cada nó tenta-se simplificar com base nos filhos já otimizados
+        # (tabela tipo -> fold_TipoDoNo do NodeVisitor; tipos sem regra ficam como estão)
+        # A mesma travessia resume cada subárvore para a propagação (chamadas, variáveis alteradas)
+        propagator = ConstantPropagator(self)
+        folds = self._dispatch
+        summarize = propagator.summarize
+
+        def fold(n):
+            rule = folds.get(n.type)
+            if rule:
+                n = rule(self, n)
+            if n.children or n.type in CALLS:
+                summarize(n)
+            return n
+
+        node = transform_postorder(node, fold)
 
+        # Depois, entre comandos: propaga os valores conhecidos e volta a simplificar
+        node = propagator.propagate(node)
+
+        # Tira dos ciclos as expressões que não mudam de volta para volta
+        node = InvariantHoister(self).hoist(node)
+
+        # Remove o que deixou de ser preciso (atribuições sem leitores, variáveis, ...)
+        node = DeadCodeEliminator(self).eliminate(node)
+
+        # Por fim troca as chamadas recursivas finais por saltos para o início do subprograma
+        return TailCallEliminator(self).eliminate(node)
+
+    def fold_node(self, n):
+        """Simplifica um só nó (os filhos já devem estar simplificados)."""
+        rule = self._dispatch.get(n.type)
+        return rule(self, n) if rule else n
+
+    def generic_visit(self, node):
         return node
 
-    def fold_binary_op(self, node):
-        """Tenta resolver operações binárias estáticas (ex: 3 + 4 -> 7)"""
+    # Construtores de nós (mantêm a linha do nó original e já levam o tipo do valor)
+    def _integer(self, value, node):
+        return Node('IntegerConstant', [], value, lineno=node.lineno, value_type=INTEGER)
+
+    def _boolean(self, value, node):
+        return Node('BooleanConstant', [], 'true' if value else 'false', lineno=node.lineno, value_type=BOOLEAN)
+
+    def _number(self, value, node):
+        if isinstance(value, float):
+            return Node('RealConstant', [], value, lineno=node.lineno, value_type=REAL)
+        return self._integer(value, node)
+
+    def _zero(self, node):
+        """O zero do tipo de 'node' (0.0 numa expressão real)."""
+        return self._number(0.0 if node.value_type is REAL else 0, node)
+
+    def fold_BinaryOp(self, node):
+        """Tenta resolver operações binárias estáticas (ex: 3 + 4 -> 7) e simplificar identidades."""
         left = node.children[0]
         right = node.children[1]
+
+        if left.type in CONSTANTS and right.type in CONSTANTS:
+            folded = self._fold_constants(node, left, right)
+            if folded is not None:
+                return folded
+
+        if node.leaf in ('AND', 'OR'):
+            return self._simplify_boolean(node, left, right)
+        if node.leaf in ('+', '-', '*', 'DIV', 'MOD'):
+            return self._simplify_arithmetic(node, left, right)
+        return node
+
+    def _fold_constants(self, node, left, right):
+        """Avalia a operação quando os dois operandos são constantes; None se não for possível."""
+        op = node.leaf
+        v1 = _constant_value(left)
+        v2 = _constant_value(right)
+
+        if op in COMPARISONS:
+            # Só se comparam valores do mesmo tipo (números entre si)
+            if (left.type == right.type) or (left.type in NUMERIC_CONSTANTS and right.type in NUMERIC_CONSTANTS):
+                self._applied('comparison_folding')
+                # Transforma a operação num nó booleano fixo
+                return self._boolean(COMPARISONS[op](v1, v2), node)
+            return None
+
+        if op in ('AND', 'OR'):
+            if left.type == right.type == 'BooleanConstant':
+                self._applied('boolean_folding')
+                return self._boolean(v1 and v2 if op == 'AND' else v1 or v2, node)
+            return None
+
+        if left.type not in NUMERIC_CONSTANTS or right.type not in NUMERIC_CONSTANTS:
+            return None
+        is_real = left.type == 'RealConstant' or right.type == 'RealConstant'
+        if op in ('DIV', 'MOD', '/') and v2 == 0:
+            return None # Divisão por zero: fica para o runtime
+        if op == '/':
+            res = v1 / v2 # Em Pascal '/' dá sempre real
+            is_real = True
+        elif op == '+': res = v1 + v2
+        elif op == '-': res = v1 - v2
+        elif op == '*': res = v1 * v2
+        elif op == 'DIV' and not is_real: res = _c_div(v1, v2) # Divisão inteira
+        elif op == 'MOD' and not is_real: res = v1 - v2 * _c_div(v1, v2)
+        else:
+            return None
+
+        if is_real:
+            self._applied('real_folding')
+            return self._number(float(res), node)
+        self._applied('constant_folding')
+        # Substitui a operação inteira pelo resultado
+        return self._integer(res, node)
+
+    def _simplify_boolean(self, node, left, right):
+        """and/or com um operando constante (o outro pode ser qualquer expressão)."""
+        op = node.leaf
+        # O elemento absorvente (false no and, true no or) decide o resultado
+        absorbing = op == 'OR'
+        for const, other in ((left, right), (right, left)):
+            if const.type != 'BooleanConstant':
+                continue
+            if _constant_value(const) != absorbing:
+                # x and true -> x ; x or false -> x
+                self._applied('boolean_identity')
+                return other
+            if is_pure(other):
+                # x and false -> false ; x or true -> true (x não é avaliado)
+                self._applied('boolean_identity')
+                return self._boolean(absorbing, node)
+        return node
+
+    def _simplify_arithmetic(self, node, left, right):
         op = node.leaf
 
-        # Só otimiza se ambos os operandos forem constantes inteiras
-        if left.type == 'IntegerConstant' and right.type == 'IntegerConstant':
-            v1 = left.leaf
-            v2 = right.leaf
-            res = None
-
-            try:
-                if op == '+': res = v1 + v2
-                elif op == '-': res = v1 - v2
-                elif op == '*': res = v1 * v2
-                elif op == 'DIV': res = v1 // v2 # Divisão inteira
-                elif op == 'MOD': res = v1 % v2
-                # Otimização extra: Resolve comparação estática (ex: if 1=1)
-                elif op == '=': 
-                    self.optimizations_count += 1
-                    # Transforma a operação num nó booleano fixo
-                    return Node('BooleanConstant', [], 'true' if v1 == v2 else 'false', lineno=node.lineno)
-            except ZeroDivisionError:
-                return node # Se houver divisão por zero, deixa para o runtime ou ignora
-
-            if res is not None:
-                self.optimizations_count += 1
-                # Substitui a operação inteira pelo resultado
-                return Node('IntegerConstant', [], res, lineno=node.lineno)
+        # Constante à esquerda num operador comutativo: c + x -> x + c (facilita as regras seguintes)
+        if op in ('+', '*') and left.type == 'IntegerConstant' and right.type != 'IntegerConstant':
+            left, right = right, left
+            node.children[0], node.children[1] = left, right
 
+        # Só constantes inteiras: com um real (x + 0.0) o resultado teria de passar a real
+        if right.type == 'IntegerConstant':
+            value = right.leaf
+            # Elemento neutro: x + 0, x - 0, x * 1, x div 1
+            if (value == 0 and op in ('+', '-')) or (value == 1 and op in ('*', 'DIV')):
+                self._applied('algebraic_identity')
+                return left
+            # Elemento absorvente: x * 0 -> 0 ; x mod 1 -> 0
+            if ((value == 0 and op == '*') or (value == 1 and op == 'MOD')) and is_pure(left):
+                self._applied('annihilation')
+                return self._zero(node)
+
+        # x - x -> 0
+        if op == '-' and is_pure(left) and same_expression(left, right):
+            self._applied('self_cancel')
+            return self._zero(node)
+
+        # Nos reais a ordem das operações pode mudar o arredondamento
+        if right.type == 'IntegerConstant' and node.value_type is not REAL:
+            return self._reassociate(node, left, right)
         return node
 
-    def fold_unary_op(self, node):
-        """Simplifica unários (ex: -5 estático)"""
+    def _reassociate(self, node, left, right):
+        """
+        Junta as constantes de cadeias inteiras: (x + a) + b -> x + (a+b),
+        (x - a) + b -> x + (b-a), (x * a) * b -> x * (a*b).
+        """
+        op = node.leaf
+        if left.type != 'BinaryOp' or left.children[1].type != 'IntegerConstant':
+            return node
+        inner = left.leaf
+        x = left.children[0]
+        a = left.children[1].leaf
+        b = right.leaf
+
+        if op in ('+', '-') and inner in ('+', '-'):
+            offset = (a if inner == '+' else -a) + (b if op == '+' else -b)
+            self._applied('reassociation')
+            if offset == 0:
+                return x
+            if offset > 0:
+                return Node('BinaryOp', [x, self._integer(offset, node)], '+', lineno=node.lineno,
+                            value_type=node.value_type)
+            return Node('BinaryOp', [x, self._integer(-offset, node)], '-', lineno=node.lineno,
+                        value_type=node.value_type)
+        if op == '*' and inner == '*':
+            self._applied('reassociation')
+            return Node('BinaryOp', [x, self._integer(a * b, node)], '*', lineno=node.lineno,
+                        value_type=node.value_type)
+        return node
+
+    def fold_UnaryOp(self, node):
+        """Simplifica unários (ex: -5 estático, not true, not not x)"""
         child = node.children[0]
         op = node.leaf
 
-        if child.type == 'IntegerConstant' and op == 'MINUS':
-            self.optimizations_count += 1
-            return Node('IntegerConstant', [], -child.leaf, lineno=node.lineno)
-        
+        if op == 'MINUS':
+            if child.type in NUMERIC_CONSTANTS:
+                self._applied('unary_folding')
+                return self._number(-child.leaf, node)
+            if child.type == 'UnaryOp' and child.leaf == 'MINUS':
+                self._applied('double_negation')
+                return child.children[0]
+        elif op == 'NOT':
+            if child.type == 'BooleanConstant':
+                self._applied('boolean_folding')
+                return self._boolean(not _constant_value(child), node)
+            if child.type == 'UnaryOp' and child.leaf == 'NOT':
+                self._applied('double_negation')
+                return child.children[0]
+            if child.type == 'BinaryOp' and child.leaf in NEGATED_COMPARISON:
+                self._applied('negated_comparison')
+                return Node('BinaryOp', child.children, NEGATED_COMPARISON[child.leaf], lineno=child.lineno,
+                            value_type=BOOLEAN)
+
         return node
 
-    def fold_if_statement(self, node):
+    def fold_IfStatement(self, node):
         """Eliminação de Código Morto em IFs"""
         cond = node.children[0]
-        
+
         # Só otimiza se a condição for uma constante booleana conhecida
         if cond.type == 'BooleanConstant':
             val = str(cond.leaf).lower()
-            
+
             if val == 'true':
-                self.optimizations_count += 1
+                self._applied('dead_branch')
                 # Se é sempre True, substitui o IF inteiro pelo conteúdo do THEN
-                return node.children[1] 
+                return node.children[1]
             elif val == 'false':
-                self.optimizations_count += 1
+                self._applied('dead_branch')
                 # Se é sempre False, substitui pelo ELSE (se existir) ou remove tudo
                 if len(node.children) > 2:
-                    return node.children[2] 
+                    return node.children[2]
                 else:
                     return Node('Empty', [], lineno=node.lineno)
-                    
+
         return node
@@ -1,6 +1,9 @@
 import ply.yacc as yacc
-from lexer import tokens, find_column
+from lexer import tokens, find_column, TokenBuffer, REBUILD_TABLES, TABLES_DIR
+from visitor import walk
+import os
 import sys
+from sys import intern
 
 # Ativa modo de depuração se necessário
 DEBUG = False
@@ -23,37 +26,53 @@ precedence = (
 
 # Classe Node (Estrutura da AST)
 class Node:
-    """Representa um nó na Árvore Sintática Abstrata (AST)."""
-    def __init__(self, type, children=None, leaf=None, lineno=None):
-        self.type = type
+    """
+    Representa um nó na Árvore Sintática Abstrata (AST).
+    Usa __slots__ (sem __dict__ por instância) porque a AST domina a memória em programas grandes.
+    """
+    __slots__ = ('type', 'children', 'leaf', 'lineno', 'binding', 'value_type')
+
+    def __init__(self, type, children=None, leaf=None, lineno=None, binding=None, value_type=None):
+        self.type = type # Os tipos vêm de literais do parser, já internados pelo Python
         self.lineno = lineno  # Guarda a linha de origem para mensagens de erro
+        # Preenchidos pela análise semântica: ligação do identificador (semantic.Binding)
+        # e, nas expressões, o tipo do valor (typesystem)
+        self.binding = binding
+        self.value_type = value_type
         
         # Garante que children é sempre uma lista válida
+        # (só se filtra quando há None, o caso comum é copiar a lista diretamente)
         if children is None:
             self.children = []
-        elif isinstance(children, list):
-            self.children = [c for c in children if c is not None]
+        elif children.__class__ is list:
+            self.children = [c for c in children if c is not None] if None in children else children[:]
         else:
             self.children = [children]
             
-        self.leaf = leaf
+        # Folhas textuais (identificadores, operadores) repetem-se muito: partilha-se uma só cópia
+        self.leaf = intern(leaf) if leaf.__class__ is str else leaf
 
     def __str__(self):
         return self.pretty()
 
     def pretty(self, level=0):
-        # Exibe linha no debug se existir
-        line_info = f" [L:{self.lineno}]" if self.lineno else ""
-        result = " " * (level * 2) + f"{self.type}{line_info}"
-        if self.leaf is not None:
-            result += f": {self.leaf}"
-        result += "\n"
-        for child in self.children:
-            if isinstance(child, Node):
-                result += child.pretty(level + 1)
-            else:
-                result += " " * ((level + 1) * 2) + str(child) + "\n"
-        return result
+        # Travessia iterativa (visitor.walk): ASTs muito profundas não esgotam a recursão
+        lines = []
+
+        def pre(item, depth):
+            indent = " " * ((level + depth) * 2)
+            if not isinstance(item, Node):
+                lines.append(indent + str(item) + "\n")
+                return False
+            # Exibe linha no debug se existir
+            line_info = f" [L:{item.lineno}]" if item.lineno else ""
+            line = indent + f"{item.type}{line_info}"
+            if item.leaf is not None:
+                line += f": {item.leaf}"
+            lines.append(line + "\n")
+
+        walk(self, pre)
+        return "".join(lines)
 
 def p_empty(p):
     'empty :'
@@ -136,6 +155,7 @@ def p_id_list(p):
 
 def p_type(p):
     '''type : INTEGER
+            | REAL
             | BOOLEAN
             | STRING
             | array_type'''
@@ -392,13 +412,23 @@ def p_error(p):
         })
 
 # Criação do Parser
-parser = yacc.yacc(debug=DEBUG, start='program')
+# Em modo 'optimize' a parsetab.pickle é usada sem comparar a assinatura com a gramática
+# (ver REBUILD_TABLES em lexer.py para a regenerar)
+parser = yacc.yacc(debug=DEBUG, start='program', optimize=not REBUILD_TABLES,
+                   picklefile=os.path.join(TABLES_DIR, 'parsetab.pickle'))
 
 # Função Wrapper para o main.py chamar
-def parse(data):
+def parse(data, token_buffer=None):
+    """
+    Faz o parsing a partir de um TokenBuffer (os tokens já produzidos pelo lexer).
+    Sem buffer, tokeniza 'data' uma vez e usa esse resultado.
+    """
     global errors, warnings
     errors.clear() # Limpa erros anteriores
     warnings.clear() # Limpa avisos anteriores
-    result = parser.parse(data)
+    if token_buffer is None:
+        token_buffer = TokenBuffer(data)
+    token_buffer.rewind()
+    result = parser.parse(lexer=token_buffer, tokenfunc=token_buffer.token)
     # Retorna 3 valores: AST, Erros Fatais e Avisos de Recuperação
     return result, errors, warnings
\ No newline at end of file
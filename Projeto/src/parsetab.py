@@ -1,119 +0,0 @@
-
-# parsetab.py
-# This file is automatically generated. Do not edit.
-# pylint: disable=W,C,R
-_tabversion = '3.10'
-
-_lr_method = 'LALR'
-
-_lr_signature = 'programrightELSErightASSIGNnonassocEQUALNOTEQUALLESSTHANLESSEQUALGREATERTHANGREATEREQUALleftORleftANDleftPLUSMINUSleftTIMESDIVIDEDIVMODrightNOTUMINUSAND ARRAY ASSIGN BEGIN BOOLEAN COLON COMMA DIV DIVIDE DO DOT DOTDOT DOWNTO ELSE END EQUAL FALSE FOR FUNCTION GREATEREQUAL GREATERTHAN ID IF INTEGER INTEGER_CONST LBRACKET LESSEQUAL LESSTHAN LPAREN MINUS MOD NOT NOTEQUAL OF OR PLUS PROCEDURE PROGRAM RBRACKET READ READLN REAL_CONST RPAREN SEMICOLON STRING STRING_CONST THEN TIMES TO TRUE VAR WHILE WRITE WRITELNempty :program : PROGRAM ID SEMICOLON program_block DOTprogram_block : declarations function_declarations compound_statementprogram_block : function_declarations declarations compound_statementprogram_block : declarations compound_statementprogram_block : function_declarations compound_statementprogram_block : compound_statementdeclarations : VAR declaration_list\n| emptydeclaration_list : declaration_list declaration\n| declarationdeclaration : id_list COLON type SEMICOLONdeclaration : error SEMICOLONid_list : id_list COMMA ID\n| IDtype : INTEGER\n| BOOLEAN\n| STRING\n| array_typearray_type : ARRAY LBRACKET INTEGER_CONST DOTDOT INTEGER_CONST RBRACKET OF typefunction_declarations : function_declarations function_declaration\n| function_declarations procedure_declaration\n| function_declaration\n| procedure_declarationfunction_declaration : FUNCTION ID formal_parameters COLON type SEMICOLON block SEMICOLONprocedure_declaration : PROCEDURE ID formal_parameters SEMICOLON block SEMICOLONblock : declarations compound_statementformal_parameters : LPAREN parameter_list RPAREN\n| emptyparameter_list : parameter_list SEMICOLON parameter\n| parameterparameter : id_list COLON typecompound_statement : BEGIN statement_list ENDstatement_list : statement_list SEMICOLON statement\n| statementstatement : assignment_statement\n| if_statement\n| while_statement\n| for_statement\n| procedure_call\n| compound_statement\n| read_statement\n| write_statement\n| emptystatement : error SEMICOLONassignment_statement : variable ASSIGN expressionif_statement : IF expression THEN statement\n| IF expression THEN statement ELSE statementwhile_statement : WHILE expression DO statementfor_statement : FOR ID ASSIGN expression TO expression DO statement\n| FOR ID ASSIGN expression DOWNTO expression DO statementread_statement : READ LPAREN variable_list RPAREN\n| READLN LPAREN variable_list RPARENwrite_statement : WRITE LPAREN expression_list RPAREN\n| WRITELN LPAREN expression_list RPARENprocedure_call : ID LPAREN expression_list RPAREN\n| ID LPAREN RPARENvariable_list : variable_list COMMA variable\n| variableexpression_list : expression_list COMMA expression\n| expressionexpression : expression PLUS expression\n| expression MINUS expression\n| expression TIMES expression\n| expression DIVIDE expression\n| expression DIV expression\n| expression MOD expression\n| expression OR expression\n| expression AND expression\n| expression EQUAL expression\n| expression NOTEQUAL expression\n| expression LESSTHAN expression\n| expression GREATERTHAN expression\n| expression LESSEQUAL expression\n| expression GREATEREQUAL expressionexpression : NOT expression\n| MINUS expression %prec UMINUSexpression : LPAREN expression RPARENexpression : variable\n| INTEGER_CONST\n| REAL_CONST\n| STRING_CONST\n| function_call\n| TRUE\n| FALSEfunction_call : ID LPAREN expression_list RPAREN\n| ID LPAREN RPARENvariable : ID\n| ID LBRACKET expression RBRACKET'
-    
-_lr_action_items = {'PROGRAM':([0,],[2,]),'$end':([1,16,],[0,-2,]),'ID':([2,9,13,14,15,23,24,41,42,43,53,55,56,58,60,62,63,64,75,76,77,78,79,80,82,94,95,96,97,98,99,100,101,102,103,104,105,106,107,108,112,113,114,130,153,156,162,167,169,170,184,185,],[3,27,44,49,50,27,-11,72,72,74,-10,91,-13,44,72,72,72,72,72,72,121,121,72,72,27,44,72,72,72,72,72,72,72,72,72,72,72,72,72,72,72,44,72,-12,72,121,27,44,72,72,44,44,]),'SEMICOLON':([3,13,26,28,29,30,31,32,33,34,35,36,37,38,39,50,57,58,59,65,66,67,68,69,70,71,72,83,84,85,86,87,88,89,92,93,94,109,110,113,116,126,127,132,133,134,135,136,137,138,139,140,141,142,143,144,145,146,147,149,150,152,154,155,157,158,159,160,161,164,167,168,174,175,177,179,182,184,185,188,189,191,],[4,-1,56,58,-35,-36,-37,-38,-39,-40,-41,-42,-43,-44,59,-1,-33,-1,-45,-79,-80,-81,-82,-83,-84,-85,-88,-29,129,130,-16,-17,-18,-19,-34,-46,-1,-77,-76,-1,-57,162,-31,-47,-62,-63,-64,-65,-66,-67,-68,-69,-70,-71,-72,-73,-74,-75,-78,-87,-49,-56,-89,-52,-53,-54,-55,173,-28,176,-1,-86,-30,-32,-27,-48,186,-1,-1,-50,-51,-20,]),'VAR':([4,7,11,12,21,22,129,173,176,186,],[9,9,-23,-24,-21,-22,9,9,-26,-25,]),'BEGIN':([4,6,7,10,11,12,13,17,19,21,22,23,24,53,56,58,94,113,129,130,165,167,173,176,184,185,186,],[13,13,13,-9,-23,-24,13,13,13,-21,-22,-8,-11,-10,-13,13,13,13,-1,-12,13,13,-1,-26,13,13,-25,]),'FUNCTION':([4,6,7,10,11,12,17,21,22,23,24,53,56,130,176,186,],[14,14,14,-9,-23,-24,14,-21,-22,-8,-11,-10,-13,-12,-26,-25,]),'PROCEDURE':([4,6,7,10,11,12,17,21,22,23,24,53,56,130,176,186,],[15,15,15,-9,-23,-24,15,-21,-22,-8,-11,-10,-13,-12,-26,-25,]),'DOT':([5,8,18,20,51,52,57,],[16,-7,-5,-6,-3,-4,-33,]),'error':([9,13,23,24,53,56,58,94,113,130,167,184,185,],[26,39,26,-11,-10,-13,39,39,39,-12,39,39,39,]),'IF':([13,58,94,113,167,184,185,],[41,41,41,41,41,41,41,]),'WHILE':([13,58,94,113,167,184,185,],[42,42,42,42,42,42,42,]),'FOR':([13,58,94,113,167,184,185,],[43,43,43,43,43,43,43,]),'READ':([13,58,94,113,167,184,185,],[45,45,45,45,45,45,45,]),'READLN':([13,58,94,113,167,184,185,],[46,46,46,46,46,46,46,]),'WRITE':([13,58,94,113,167,184,185,],[47,47,47,47,47,47,47,]),'WRITELN':([13,58,94,113,167,184,185,],[48,48,48,48,48,48,48,]),'END':([13,28,29,30,31,32,33,34,35,36,37,38,57,58,59,65,66,67,68,69,70,71,72,92,93,94,109,110,113,116,132,133,134,135,136,137,138,139,140,141,142,143,144,145,146,147,149,150,152,154,155,157,158,159,167,168,179,184,185,188,189,],[-1,57,-35,-36,-37,-38,-39,-40,-41,-42,-43,-44,-33,-1,-45,-79,-80,-81,-82,-83,-84,-85,-88,-34,-46,-1,-77,-76,-1,-57,-47,-62,-63,-64,-65,-66,-67,-68,-69,-70,-71,-72,-73,-74,-75,-78,-87,-49,-56,-89,-52,-53,-54,-55,-1,-86,-48,-1,-1,-50,-51,]),'COLON':([25,27,49,81,83,91,128,161,],[54,-15,-1,125,-29,-14,163,-28,]),'COMMA':([25,27,65,66,67,68,69,70,71,72,91,109,110,115,117,119,120,121,122,123,124,128,133,134,135,136,137,138,139,140,141,142,143,144,145,146,147,148,149,154,168,171,172,],[55,-15,-79,-80,-81,-82,-83,-84,-85,-88,-14,-77,-76,153,-61,156,-59,-88,156,153,153,55,-62,-63,-64,-65,-66,-67,-68,-69,-70,-71,-72,-73,-74,-75,-78,153,-87,-89,-86,-60,-58,]),'ELSE':([30,31,32,33,34,35,36,37,38,57,59,65,66,67,68,69,70,71,72,93,94,109,110,113,116,132,133,134,135,136,137,138,139,140,141,142,143,144,145,146,147,149,150,152,154,155,157,158,159,167,168,179,184,185,188,189,],[-36,-37,-38,-39,-40,-41,-42,-43,-44,-33,-45,-79,-80,-81,-82,-83,-84,-85,-88,-46,-1,-77,-76,-1,-57,167,-62,-63,-64,-65,-66,-67,-68,-69,-70,-71,-72,-73,-74,-75,-78,-87,-49,-56,-89,-52,-53,-54,-55,-1,-86,-48,-1,-1,-50,-51,]),'ASSIGN':([40,44,74,154,],[60,-88,114,-89,]),'NOT':([41,42,60,62,63,64,75,76,79,80,95,96,97,98,99,100,101,102,103,104,105,106,107,108,112,114,153,169,170,],[63,63,63,63,63,63,63,63,63,63,63,63,63,63,63,63,63,63,63,63,63,63,63,63,63,63,63,63,63,]),'MINUS':([41,42,60,61,62,63,64,65,66,67,68,69,70,71,72,73,75,76,79,80,93,95,96,97,98,99,100,101,102,103,104,105,106,107,108,109,110,111,112,114,117,118,133,134,135,136,137,138,139,140,141,142,143,144,145,146,147,149,151,153,154,168,169,170,171,180,181,],[62,62,62,96,62,62,62,-79,-80,-81,-82,-83,-84,-85,-88,96,62,62,62,62,96,62,62,62,62,62,62,62,62,62,62,62,62,62,62,-77,-76,96,62,62,96,96,-62,-63,-64,-65,-66,-67,96,96,96,96,96,96,96,96,-78,-87,96,62,-89,-86,62,62,96,96,96,]),'LPAREN':([41,42,44,45,46,47,48,49,50,60,62,63,64,72,75,76,79,80,95,96,97,98,99,100,101,102,103,104,105,106,107,108,112,114,153,169,170,],[64,64,75,77,78,79,80,82,82,64,64,64,64,112,64,64,64,64,64,64,64,64,64,64,64,64,64,64,64,64,64,64,64,64,64,64,64,]),'INTEGER_CONST':([41,42,60,62,63,64,75,76,79,80,95,96,97,98,99,100,101,102,103,104,105,106,107,108,112,114,131,153,169,170,178,],[66,66,66,66,66,66,66,66,66,66,66,66,66,66,66,66,66,66,66,66,66,66,66,66,66,66,166,66,66,66,183,]),'REAL_CONST':([41,42,60,62,63,64,75,76,79,80,95,96,97,98,99,100,101,102,103,104,105,106,107,108,112,114,153,169,170,],[67,67,67,67,67,67,67,67,67,67,67,67,67,67,67,67,67,67,67,67,67,67,67,67,67,67,67,67,67,]),'STRING_CONST':([41,42,60,62,63,64,75,76,79,80,95,96,97,98,99,100,101,102,103,104,105,106,107,108,112,114,153,169,170,],[68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,]),'TRUE':([41,42,60,62,63,64,75,76,79,80,95,96,97,98,99,100,101,102,103,104,105,106,107,108,112,114,153,169,170,],[70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,70,]),'FALSE':([41,42,60,62,63,64,75,76,79,80,95,96,97,98,99,100,101,102,103,104,105,106,107,108,112,114,153,169,170,],[71,71,71,71,71,71,71,71,71,71,71,71,71,71,71,71,71,71,71,71,71,71,71,71,71,71,71,71,71,]),'LBRACKET':([44,72,90,121,],[76,76,131,76,]),'INTEGER':([54,125,163,190,],[86,86,86,86,]),'BOOLEAN':([54,125,163,190,],[87,87,87,87,]),'STRING':([54,125,163,190,],[88,88,88,88,]),'ARRAY':([54,125,163,190,],[90,90,90,90,]),'THEN':([61,65,66,67,68,69,70,71,72,109,110,133,134,135,136,137,138,139,140,141,142,143,144,145,146,147,149,154,168,],[94,-79,-80,-81,-82,-83,-84,-85,-88,-77,-76,-62,-63,-64,-65,-66,-67,-68,-69,-70,-71,-72,-73,-74,-75,-78,-87,-89,-86,]),'PLUS':([61,65,66,67,68,69,70,71,72,73,93,109,110,111,117,118,133,134,135,136,137,138,139,140,141,142,143,144,145,146,147,149,151,154,168,171,180,181,],[95,-79,-80,-81,-82,-83,-84,-85,-88,95,95,-77,-76,95,95,95,-62,-63,-64,-65,-66,-67,95,95,95,95,95,95,95,95,-78,-87,95,-89,-86,95,95,95,]),'TIMES':([61,65,66,67,68,69,70,71,72,73,93,109,110,111,117,118,133,134,135,136,137,138,139,140,141,142,143,144,145,146,147,149,151,154,168,171,180,181,],[97,-79,-80,-81,-82,-83,-84,-85,-88,97,97,-77,-76,97,97,97,97,97,-64,-65,-66,-67,97,97,97,97,97,97,97,97,-78,-87,97,-89,-86,97,97,97,]),'DIVIDE':([61,65,66,67,68,69,70,71,72,73,93,109,110,111,117,118,133,134,135,136,137,138,139,140,141,142,143,144,145,146,147,149,151,154,168,171,180,181,],[98,-79,-80,-81,-82,-83,-84,-85,-88,98,98,-77,-76,98,98,98,98,98,-64,-65,-66,-67,98,98,98,98,98,98,98,98,-78,-87,98,-89,-86,98,98,98,]),'DIV':([61,65,66,67,68,69,70,71,72,73,93,109,110,111,117,118,133,134,135,136,137,138,139,140,141,142,143,144,145,146,147,149,151,154,168,171,180,181,],[99,-79,-80,-81,-82,-83,-84,-85,-88,99,99,-77,-76,99,99,99,99,99,-64,-65,-66,-67,99,99,99,99,99,99,99,99,-78,-87,99,-89,-86,99,99,99,]),'MOD':([61,65,66,67,68,69,70,71,72,73,93,109,110,111,117,118,133,134,135,136,137,138,139,140,141,142,143,144,145,146,147,149,151,154,168,171,180,181,],[100,-79,-80,-81,-82,-83,-84,-85,-88,100,100,-77,-76,100,100,100,100,100,-64,-65,-66,-67,100,100,100,100,100,100,100,100,-78,-87,100,-89,-86,100,100,100,]),'OR':([61,65,66,67,68,69,70,71,72,73,93,109,110,111,117,118,133,134,135,136,137,138,139,140,141,142,143,144,145,146,147,149,151,154,168,171,180,181,],[101,-79,-80,-81,-82,-83,-84,-85,-88,101,101,-77,-76,101,101,101,-62,-63,-64,-65,-66,-67,-68,-69,101,101,101,101,101,101,-78,-87,101,-89,-86,101,101,101,]),'AND':([61,65,66,67,68,69,70,71,72,73,93,109,110,111,117,118,133,134,135,136,137,138,139,140,141,142,143,144,145,146,147,149,151,154,168,171,180,181,],[102,-79,-80,-81,-82,-83,-84,-85,-88,102,102,-77,-76,102,102,102,-62,-63,-64,-65,-66,-67,102,-69,102,102,102,102,102,102,-78,-87,102,-89,-86,102,102,102,]),'EQUAL':([61,65,66,67,68,69,70,71,72,73,93,109,110,111,117,118,133,134,135,136,137,138,139,140,141,142,143,144,145,146,147,149,151,154,168,171,180,181,],[103,-79,-80,-81,-82,-83,-84,-85,-88,103,103,-77,-76,103,103,103,-62,-63,-64,-65,-66,-67,-68,-69,None,None,None,None,None,None,-78,-87,103,-89,-86,103,103,103,]),'NOTEQUAL':([61,65,66,67,68,69,70,71,72,73,93,109,110,111,117,118,133,134,135,136,137,138,139,140,141,142,143,144,145,146,147,149,151,154,168,171,180,181,],[104,-79,-80,-81,-82,-83,-84,-85,-88,104,104,-77,-76,104,104,104,-62,-63,-64,-65,-66,-67,-68,-69,None,None,None,None,None,None,-78,-87,104,-89,-86,104,104,104,]),'LESSTHAN':([61,65,66,67,68,69,70,71,72,73,93,109,110,111,117,118,133,134,135,136,137,138,139,140,141,142,143,144,145,146,147,149,151,154,168,171,180,181,],[105,-79,-80,-81,-82,-83,-84,-85,-88,105,105,-77,-76,105,105,105,-62,-63,-64,-65,-66,-67,-68,-69,None,None,None,None,None,None,-78,-87,105,-89,-86,105,105,105,]),'GREATERTHAN':([61,65,66,67,68,69,70,71,72,73,93,109,110,111,117,118,133,134,135,136,137,138,139,140,141,142,143,144,145,146,147,149,151,154,168,171,180,181,],[106,-79,-80,-81,-82,-83,-84,-85,-88,106,106,-77,-76,106,106,106,-62,-63,-64,-65,-66,-67,-68,-69,None,None,None,None,None,None,-78,-87,106,-89,-86,106,106,106,]),'LESSEQUAL':([61,65,66,67,68,69,70,71,72,73,93,109,110,111,117,118,133,134,135,136,137,138,139,140,141,142,143,144,145,146,147,149,151,154,168,171,180,181,],[107,-79,-80,-81,-82,-83,-84,-85,-88,107,107,-77,-76,107,107,107,-62,-63,-64,-65,-66,-67,-68,-69,None,None,None,None,None,None,-78,-87,107,-89,-86,107,107,107,]),'GREATEREQUAL':([61,65,66,67,68,69,70,71,72,73,93,109,110,111,117,118,133,134,135,136,137,138,139,140,141,142,143,144,145,146,147,149,151,154,168,171,180,181,],[108,-79,-80,-81,-82,-83,-84,-85,-88,108,108,-77,-76,108,108,108,-62,-63,-64,-65,-66,-67,-68,-69,None,None,None,None,None,None,-78,-87,108,-89,-86,108,108,108,]),'DO':([65,66,67,68,69,70,71,72,73,109,110,133,134,135,136,137,138,139,140,141,142,143,144,145,146,147,149,154,168,180,181,],[-79,-80,-81,-82,-83,-84,-85,-88,113,-77,-76,-62,-63,-64,-65,-66,-67,-68,-69,-70,-71,-72,-73,-74,-75,-78,-87,-89,-86,184,185,]),'RPAREN':([65,66,67,68,69,70,71,72,75,86,87,88,89,109,110,111,112,115,117,119,120,121,122,123,124,126,127,133,134,135,136,137,138,139,140,141,142,143,144,145,146,147,148,149,154,168,171,172,174,175,191,],[-79,-80,-81,-82,-83,-84,-85,-88,116,-16,-17,-18,-19,-77,-76,147,149,152,-61,155,-59,-88,157,158,159,161,-31,-62,-63,-64,-65,-66,-67,-68,-69,-70,-71,-72,-73,-74,-75,-78,168,-87,-89,-86,-60,-58,-30,-32,-20,]),'RBRACKET':([65,66,67,68,69,70,71,72,109,110,118,133,134,135,136,137,138,139,140,141,142,143,144,145,146,147,149,154,168,183,],[-79,-80,-81,-82,-83,-84,-85,-88,-77,-76,154,-62,-63,-64,-65,-66,-67,-68,-69,-70,-71,-72,-73,-74,-75,-78,-87,-89,-86,187,]),'TO':([65,66,67,68,69,70,71,72,109,110,133,134,135,136,137,138,139,140,141,142,143,144,145,146,147,149,151,154,168,],[-79,-80,-81,-82,-83,-84,-85,-88,-77,-76,-62,-63,-64,-65,-66,-67,-68,-69,-70,-71,-72,-73,-74,-75,-78,-87,169,-89,-86,]),'DOWNTO':([65,66,67,68,69,70,71,72,109,110,133,134,135,136,137,138,139,140,141,142,143,144,145,146,147,149,151,154,168,],[-79,-80,-81,-82,-83,-84,-85,-88,-77,-76,-62,-63,-64,-65,-66,-67,-68,-69,-70,-71,-72,-73,-74,-75,-78,-87,170,-89,-86,]),'DOTDOT':([166,],[178,]),'OF':([187,],[190,]),}
-
-_lr_action = {}
-for _k, _v in _lr_action_items.items():
-   for _x,_y in zip(_v[0],_v[1]):
-      if not _x in _lr_action:  _lr_action[_x] = {}
-      _lr_action[_x][_k] = _y
-del _lr_action_items
-
-_lr_goto_items = {'program':([0,],[1,]),'program_block':([4,],[5,]),'declarations':([4,7,129,173,],[6,19,165,165,]),'function_declarations':([4,6,],[7,17,]),'compound_statement':([4,6,7,13,17,19,58,94,113,165,167,184,185,],[8,18,20,35,51,52,35,35,35,177,35,35,35,]),'empty':([4,7,13,49,50,58,94,113,129,167,173,184,185,],[10,10,38,83,83,38,38,38,10,38,10,38,38,]),'function_declaration':([4,6,7,17,],[11,11,21,21,]),'procedure_declaration':([4,6,7,17,],[12,12,22,22,]),'declaration_list':([9,],[23,]),'declaration':([9,23,],[24,53,]),'id_list':([9,23,82,162,],[25,25,128,128,]),'statement_list':([13,],[28,]),'statement':([13,58,94,113,167,184,185,],[29,92,132,150,179,188,189,]),'assignment_statement':([13,58,94,113,167,184,185,],[30,30,30,30,30,30,30,]),'if_statement':([13,58,94,113,167,184,185,],[31,31,31,31,31,31,31,]),'while_statement':([13,58,94,113,167,184,185,],[32,32,32,32,32,32,32,]),'for_statement':([13,58,94,113,167,184,185,],[33,33,33,33,33,33,33,]),'procedure_call':([13,58,94,113,167,184,185,],[34,34,34,34,34,34,34,]),'read_statement':([13,58,94,113,167,184,185,],[36,36,36,36,36,36,36,]),'write_statement':([13,58,94,113,167,184,185,],[37,37,37,37,37,37,37,]),'variable':([13,41,42,58,60,62,63,64,75,76,77,78,79,80,94,95,96,97,98,99,100,101,102,103,104,105,106,107,108,112,113,114,153,156,167,169,170,184,185,],[40,65,65,40,65,65,65,65,65,65,120,120,65,65,40,65,65,65,65,65,65,65,65,65,65,65,65,65,65,65,40,65,65,172,40,65,65,40,40,]),'expression':([41,42,60,62,63,64,75,76,79,80,95,96,97,98,99,100,101,102,103,104,105,106,107,108,112,114,153,169,170,],[61,73,93,109,110,111,117,118,117,117,133,134,135,136,137,138,139,140,141,142,143,144,145,146,117,151,171,180,181,]),'function_call':([41,42,60,62,63,64,75,76,79,80,95,96,97,98,99,100,101,102,103,104,105,106,107,108,112,114,153,169,170,],[69,69,69,69,69,69,69,69,69,69,69,69,69,69,69,69,69,69,69,69,69,69,69,69,69,69,69,69,69,]),'formal_parameters':([49,50,],[81,84,]),'type':([54,125,163,190,],[85,160,175,191,]),'array_type':([54,125,163,190,],[89,89,89,89,]),'expression_list':([75,79,80,112,],[115,123,124,148,]),'variable_list':([77,78,],[119,122,]),'parameter_list':([82,],[126,]),'parameter':([82,162,],[127,174,]),'block':([129,173,],[164,182,]),}
-
-_lr_goto = {}
-for _k, _v in _lr_goto_items.items():
-   for _x, _y in zip(_v[0], _v[1]):
-       if not _x in _lr_goto: _lr_goto[_x] = {}
-       _lr_goto[_x][_k] = _y
-del _lr_goto_items
-_lr_productions = [
-  ("S' -> program","S'",1,None,None,None),
-  ('empty -> <empty>','empty',0,'p_empty','parser.py',63),
-  ('program -> PROGRAM ID SEMICOLON program_block DOT','program',5,'p_program','parser.py',71),
-  ('program_block -> declarations function_declarations compound_statement','program_block',3,'p_program_block_vars_funcs','parser.py',79),
-  ('program_block -> function_declarations declarations compound_statement','program_block',3,'p_program_block_funcs_vars','parser.py',84),
-  ('program_block -> declarations compound_statement','program_block',2,'p_program_block_vars_only','parser.py',89),
-  ('program_block -> function_declarations compound_statement','program_block',2,'p_program_block_funcs_only','parser.py',94),
-  ('program_block -> compound_statement','program_block',1,'p_program_block_simple','parser.py',99),
-  ('declarations -> VAR declaration_list','declarations',2,'p_declarations','parser.py',108),
-  ('declarations -> empty','declarations',1,'p_declarations','parser.py',109),
-  ('declaration_list -> declaration_list declaration','declaration_list',2,'p_declaration_list','parser.py',116),
-  ('declaration_list -> declaration','declaration_list',1,'p_declaration_list','parser.py',117),
-  ('declaration -> id_list COLON type SEMICOLON','declaration',4,'p_declaration','parser.py',125),
-  ('declaration -> error SEMICOLON','declaration',2,'p_declaration_error','parser.py',131),
-  ('id_list -> id_list COMMA ID','id_list',3,'p_id_list','parser.py',137),
-  ('id_list -> ID','id_list',1,'p_id_list','parser.py',138),
-  ('type -> INTEGER','type',1,'p_type','parser.py',150),
-  ('type -> BOOLEAN','type',1,'p_type','parser.py',151),
-  ('type -> STRING','type',1,'p_type','parser.py',152),
-  ('type -> array_type','type',1,'p_type','parser.py',153),
-  ('array_type -> ARRAY LBRACKET INTEGER_CONST DOTDOT INTEGER_CONST RBRACKET OF type','array_type',8,'p_array_type','parser.py',160),
-  ('function_declarations -> function_declarations function_declaration','function_declarations',2,'p_function_declarations','parser.py',169),
-  ('function_declarations -> function_declarations procedure_declaration','function_declarations',2,'p_function_declarations','parser.py',170),
-  ('function_declarations -> function_declaration','function_declarations',1,'p_function_declarations','parser.py',171),
-  ('function_declarations -> procedure_declaration','function_declarations',1,'p_function_declarations','parser.py',172),
-  ('function_declaration -> FUNCTION ID formal_parameters COLON type SEMICOLON block SEMICOLON','function_declaration',8,'p_function_declaration','parser.py',180),
-  ('procedure_declaration -> PROCEDURE ID formal_parameters SEMICOLON block SEMICOLON','procedure_declaration',6,'p_procedure_declaration','parser.py',185),
-  ('block -> declarations compound_statement','block',2,'p_block','parser.py',190),
-  ('formal_parameters -> LPAREN parameter_list RPAREN','formal_parameters',3,'p_formal_parameters','parser.py',196),
-  ('formal_parameters -> empty','formal_parameters',1,'p_formal_parameters','parser.py',197),
-  ('parameter_list -> parameter_list SEMICOLON parameter','parameter_list',3,'p_parameter_list','parser.py',204),
-  ('parameter_list -> parameter','parameter_list',1,'p_parameter_list','parser.py',205),
-  ('parameter -> id_list COLON type','parameter',3,'p_parameter','parser.py',213),
-  ('compound_statement -> BEGIN statement_list END','compound_statement',3,'p_compound_statement','parser.py',221),
-  ('statement_list -> statement_list SEMICOLON statement','statement_list',3,'p_statement_list','parser.py',225),
-  ('statement_list -> statement','statement_list',1,'p_statement_list','parser.py',226),
-  ('statement -> assignment_statement','statement',1,'p_statement','parser.py',235),
-  ('statement -> if_statement','statement',1,'p_statement','parser.py',236),
-  ('statement -> while_statement','statement',1,'p_statement','parser.py',237),
-  ('statement -> for_statement','statement',1,'p_statement','parser.py',238),
-  ('statement -> procedure_call','statement',1,'p_statement','parser.py',239),
-  ('statement -> compound_statement','statement',1,'p_statement','parser.py',240),
-  ('statement -> read_statement','statement',1,'p_statement','parser.py',241),
-  ('statement -> write_statement','statement',1,'p_statement','parser.py',242),
-  ('statement -> empty','statement',1,'p_statement','parser.py',243),
-  ('statement -> error SEMICOLON','statement',2,'p_statement_error','parser.py',248),
-  ('assignment_statement -> variable ASSIGN expression','assignment_statement',3,'p_assignment_statement','parser.py',256),
-  ('if_statement -> IF expression THEN statement','if_statement',4,'p_if_statement','parser.py',260),
-  ('if_statement -> IF expression THEN statement ELSE statement','if_statement',6,'p_if_statement','parser.py',261),
-  ('while_statement -> WHILE expression DO statement','while_statement',4,'p_while_statement','parser.py',268),
-  ('for_statement -> FOR ID ASSIGN expression TO expression DO statement','for_statement',8,'p_for_statement','parser.py',272),
-  ('for_statement -> FOR ID ASSIGN expression DOWNTO expression DO statement','for_statement',8,'p_for_statement','parser.py',273),
-  ('read_statement -> READ LPAREN variable_list RPAREN','read_statement',4,'p_read_statement','parser.py',280),
-  ('read_statement -> READLN LPAREN variable_list RPAREN','read_statement',4,'p_read_statement','parser.py',281),
-  ('write_statement -> WRITE LPAREN expression_list RPAREN','write_statement',4,'p_write_statement','parser.py',285),
-  ('write_statement -> WRITELN LPAREN expression_list RPAREN','write_statement',4,'p_write_statement','parser.py',286),
-  ('procedure_call -> ID LPAREN expression_list RPAREN','procedure_call',4,'p_procedure_call','parser.py',290),
-  ('procedure_call -> ID LPAREN RPAREN','procedure_call',3,'p_procedure_call','parser.py',291),
-  ('variable_list -> variable_list COMMA variable','variable_list',3,'p_variable_list','parser.py',299),
-  ('variable_list -> variable','variable_list',1,'p_variable_list','parser.py',300),
-  ('expression_list -> expression_list COMMA expression','expression_list',3,'p_expression_list','parser.py',308),
-  ('expression_list -> expression','expression_list',1,'p_expression_list','parser.py',309),
-  ('expression -> expression PLUS expression','expression',3,'p_expression_binop','parser.py',321),
-  ('expression -> expression MINUS expression','expression',3,'p_expression_binop','parser.py',322),
-  ('expression -> expression TIMES expression','expression',3,'p_expression_binop','parser.py',323),
-  ('expression -> expression DIVIDE expression','expression',3,'p_expression_binop','parser.py',324),
-  ('expression -> expression DIV expression','expression',3,'p_expression_binop','parser.py',325),
-  ('expression -> expression MOD expression','expression',3,'p_expression_binop','parser.py',326),
-  ('expression -> expression OR expression','expression',3,'p_expression_binop','parser.py',327),
-  ('expression -> expression AND expression','expression',3,'p_expression_binop','parser.py',328),
-  ('expression -> expression EQUAL expression','expression',3,'p_expression_binop','parser.py',329),
-  ('expression -> expression NOTEQUAL expression','expression',3,'p_expression_binop','parser.py',330),
-  ('expression -> expression LESSTHAN expression','expression',3,'p_expression_binop','parser.py',331),
-  ('expression -> expression GREATERTHAN expression','expression',3,'p_expression_binop','parser.py',332),
-  ('expression -> expression LESSEQUAL expression','expression',3,'p_expression_binop','parser.py',333),
-  ('expression -> expression GREATEREQUAL expression','expression',3,'p_expression_binop','parser.py',334),
-  ('expression -> NOT expression','expression',2,'p_expression_unary','parser.py',338),
-  ('expression -> MINUS expression','expression',2,'p_expression_unary','parser.py',339),
-  ('expression -> LPAREN expression RPAREN','expression',3,'p_expression_group','parser.py',344),
-  ('expression -> variable','expression',1,'p_expression_simple','parser.py',348),
-  ('expression -> INTEGER_CONST','expression',1,'p_expression_simple','parser.py',349),
-  ('expression -> REAL_CONST','expression',1,'p_expression_simple','parser.py',350),
-  ('expression -> STRING_CONST','expression',1,'p_expression_simple','parser.py',351),
-  ('expression -> function_call','expression',1,'p_expression_simple','parser.py',352),
-  ('expression -> TRUE','expression',1,'p_expression_simple','parser.py',353),
-  ('expression -> FALSE','expression',1,'p_expression_simple','parser.py',354),
-  ('function_call -> ID LPAREN expression_list RPAREN','function_call',4,'p_function_call','parser.py',381),
-  ('function_call -> ID LPAREN RPAREN','function_call',3,'p_function_call','parser.py',382),
-  ('variable -> ID','variable',1,'p_variable','parser.py',389),
-  ('variable -> ID LBRACKET expression RBRACKET','variable',4,'p_variable','parser.py',390),
-]
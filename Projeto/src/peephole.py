@@ -0,0 +1,260 @@
+"""
+Otimizador peephole sobre o fluxo de instruções EWVM.
+
+Corre depois do CodeGenerator, como um filtro entre o gerador e o destino (sink):
+cada instrução emitida entra numa janela e as regras da tabela RULES são aplicadas
+ao fim da janela. Quando uma regra reescreve, o novo fim volta a ser testado, por
+isso as regras encadeiam-se até não haver mais alterações (ponto fixo) numa só
+passagem. As instruções que saem da janela seguem para o destino real.
+
+Cada regra é (nome, padrão, condição, reescrita):
+  padrão    - tuplo com os opcodes a reconhecer no fim da janela; cada elemento é um
+              opcode, um tuplo de alternativas ou ANY (qualquer instrução)
+  condição  - função sobre a lista de (opcode, argumento) reconhecida (ou None)
+  reescrita - função que devolve as instruções (opcode, argumento) que as substituem
+"""
+from sinks import ListSink
+
+LABEL = ':' # Opcode usado internamente para as etiquetas ("L3:" -> (':', 'L3'))
+ANY = None
+
+COMPARISONS = ('EQUAL', 'INF', 'INFEQ', 'SUP', 'SUPEQ')
+# Instruções depois das quais o fluxo nunca continua para a instrução seguinte
+NO_FALLTHROUGH = ('JUMP', 'RETURN', 'STOP')
+
+
+def decode(instruction):
+    """'PUSHI 5' -> ('PUSHI', '5'); 'L3:' -> (LABEL, 'L3'); 'ADD' -> ('ADD', '')"""
+    if instruction.endswith(':'):
+        return (LABEL, instruction[:-1])
+    op, _, arg = instruction.partition(' ')
+    return (op, arg)
+
+
+def encode(op, arg):
+    if op == LABEL:
+        return f"{arg}:"
+    return f"{op} {arg}" if arg else op
+
+
+def _int(arg):
+    try:
+        return int(arg)
+    except ValueError:
+        return None
+
+
+def _fold(m):
+    a, b, op = _int(m[0][1]), _int(m[1][1]), m[2][0]
+    value = a + b if op == 'ADD' else a - b if op == 'SUB' else a * b
+    return [('PUSHI', str(value))]
+
+
+RULES = (
+    # PUSHI a; PUSHI b; ADD -> PUSHI a+b (inclui o menos unário de uma constante: PUSHI -1; MUL)
+    ('constant_fold', ('PUSHI', 'PUSHI', ('ADD', 'SUB', 'MUL')),
+     lambda m: _int(m[0][1]) is not None and _int(m[1][1]) is not None,
+     _fold),
+    # Coerção de uma constante inteira: PUSHI 2; ITOF -> PUSHF 2.0
+    ('constant_conversion', ('PUSHI', 'ITOF'),
+     lambda m: _int(m[0][1]) is not None,
+     lambda m: [('PUSHF', repr(float(_int(m[0][1]))))]),
+    # x; PUSHI -1; MUL; PUSHI -1; MUL -> x
+    ('double_negation', ('PUSHI', 'MUL', 'PUSHI', 'MUL'),
+     lambda m: m[0][1] == '-1' and m[2][1] == '-1',
+     lambda m: []),
+    # Elemento neutro: PUSHI 0; ADD/SUB/PADD e PUSHI 1; MUL/DIV não alteram o topo
+    ('identity', ('PUSHI', ('ADD', 'SUB', 'PADD', 'MUL', 'DIV')),
+     lambda m: (m[0][1] == '0' and m[1][0] in ('ADD', 'SUB', 'PADD')) or (m[0][1] == '1' and m[1][0] in ('MUL', 'DIV')),
+     lambda m: []),
+    # Uma comparação já produz 0/1, por isso NOT; NOT é redundante
+    ('double_not', (COMPARISONS, 'NOT', 'NOT'),
+     None,
+     lambda m: [m[0]]),
+    # STOREG n; PUSHG n -> DUP 1; STOREG n (evita reler a variável acabada de guardar)
+    ('store_load', (('STOREG', 'STOREL'), ('PUSHG', 'PUSHL')),
+     lambda m: m[0][1] == m[1][1] and m[0][0][-1] == m[1][0][-1],
+     lambda m: [('DUP', '1'), m[0]]),
+    # Condição constante: PUSHI 1; JZ L nunca salta e PUSHI 0; JZ L salta sempre
+    ('constant_branch', ('PUSHI', 'JZ'),
+     lambda m: _int(m[0][1]) is not None,
+     lambda m: [] if _int(m[0][1]) != 0 else [('JUMP', m[1][1])]),
+    # Código inalcançável: o que vem depois de JUMP/RETURN/STOP até à próxima etiqueta
+    ('unreachable', (NO_FALLTHROUGH, ANY),
+     lambda m: m[1][0] != LABEL,
+     lambda m: [m[0]]),
+    # JUMP Lx seguido (só com etiquetas pelo meio) de Lx: -> remove o salto
+    ('jump_to_next', ('JUMP', LABEL),
+     None,
+     None), # Tratada à parte em _jump_to_next (o número de etiquetas é variável)
+)
+
+
+class PeepholeSink:
+    """
+    Filtro peephole com a interface de um sink (emit/close/count): recebe as
+    instruções do CodeGenerator, otimiza-as numa janela e entrega o resultado ao
+    destino 'target' (ListSink por omissão). 'removed' conta as instruções
+    eliminadas e 'rule_counts' quantas vezes cada regra foi aplicada.
+    """
+    def __init__(self, target=None, rules=RULES, window=32):
+        self.target = target if target is not None else ListSink()
+        self.window = window
+        self.received = 0
+        self.sent = 0
+        self.rule_counts = {}
+        self._pending = [] # Janela: instruções (opcode, argumento) ainda não entregues
+        # Origem (sourcemap.Origin) de cada instrução da janela; só existe se o gerador marcar origens
+        self._origins = None
+        self._origin = None
+        self._sent_origin = None
+        # Índice: último opcode do padrão -> regras (as que acabam em ANY aplicam-se sempre)
+        self._by_last = {}
+        self._generic = []
+        for name, pattern, condition, rewrite in rules:
+            if rewrite is None:
+                continue
+            # Cada elemento do padrão passa a um conjunto de opcodes (None = qualquer)
+            compiled = tuple(None if p is ANY else frozenset(p if isinstance(p, tuple) else (p,)) for p in pattern)
+            rule = (name, compiled, condition, rewrite)
+            if compiled[-1] is None:
+                self._generic.append(rule)
+            else:
+                for op in compiled[-1]:
+                    self._by_last.setdefault(op, []).append(rule)
+        for op in self._by_last:
+            self._by_last[op] += self._generic
+        # Opcodes que, na penúltima posição, podem ativar uma regra genérica (None = qualquer)
+        self._generic_heads = frozenset()
+        for _, pattern, _, _ in self._generic:
+            head = pattern[-2] if len(pattern) > 1 else None
+            if head is None:
+                self._generic_heads = None
+                break
+            self._generic_heads |= head
+        self._jump_to_next = any(rule[0] == 'jump_to_next' for rule in rules)
+
+    @property
+    def code(self):
+        return getattr(self.target, 'code', None)
+
+    @property
+    def count(self):
+        return self.target.count
+
+    @property
+    def removed(self):
+        return self.received - self.sent
+
+    @property
+    def source_map(self):
+        return self.target.source_map
+
+    def mark(self, origin):
+        """As instruções seguintes vêm de 'origin'; a marca segue para o destino junto com elas."""
+        if self._origins is None:
+            self._origins = [self._origin] * len(self._pending)
+        self._origin = origin
+
+    def emit(self, instruction):
+        self.received += 1
+        pending = self._pending
+        entry = decode(instruction)
+        pending.append(entry)
+        if self._origins is not None:
+            self._origins.append(self._origin)
+        # Só vale a pena procurar regras se o opcode fecha algum padrão
+        heads = self._generic_heads
+        if (entry[0] in self._by_last or entry[0] == LABEL or heads is None
+                or (len(pending) > 1 and pending[-2][0] in heads)):
+            self._reduce()
+        if len(pending) > 2 * self.window:
+            # Entrega em blocos: as regras só olham para o fim da janela
+            self._flush(len(pending) - self.window)
+
+    def close(self):
+        self._flush(len(self._pending))
+        self.target.close()
+
+    def _flush(self, n):
+        pending = self._pending
+        emit = self.target.emit
+        origins = self._origins
+        if origins is None:
+            for op, arg in pending[:n]:
+                emit(encode(op, arg))
+        else:
+            mark = self.target.mark
+            for (op, arg), origin in zip(pending[:n], origins):
+                if origin != self._sent_origin:
+                    mark(origin)
+                    self._sent_origin = origin
+                emit(encode(op, arg))
+            del origins[:n]
+        self.sent += n
+        del pending[:n]
+
+    def _applied(self, name):
+        self.rule_counts[name] = self.rule_counts.get(name, 0) + 1
+
+    def _reduce(self):
+        """Aplica regras ao fim da janela até nenhuma reconhecer o padrão (ponto fixo)."""
+        pending = self._pending
+        changed = True
+        while changed and pending:
+            changed = False
+            last_op = pending[-1][0]
+            if last_op == LABEL and self._jump_to_next and self._remove_jump_to_next():
+                changed = True
+                continue
+            for name, pattern, condition, rewrite in self._by_last.get(last_op, self._generic):
+                size = len(pattern)
+                if size > len(pending) or not _matches(pattern, pending):
+                    continue
+                match = pending[-size:]
+                if condition is not None and not condition(match):
+                    continue
+                replacement = rewrite(match)
+                pending[-size:] = replacement
+                if self._origins is not None:
+                    # O resultado da reescrita fica com a origem da primeira instrução reconhecida
+                    origins = self._origins
+                    origins[-size:] = [origins[-size]] * len(replacement)
+                self._applied(name)
+                changed = True
+                break
+
+    def _remove_jump_to_next(self):
+        """Procura, para trás do fim, uma sequência de etiquetas precedida de 'JUMP' para uma delas."""
+        pending = self._pending
+        labels = set()
+        i = len(pending) - 1
+        while i >= 0 and pending[i][0] == LABEL:
+            labels.add(pending[i][1])
+            i -= 1
+        if i >= 0 and pending[i][0] == 'JUMP' and pending[i][1] in labels:
+            del pending[i]
+            if self._origins is not None:
+                del self._origins[i]
+            self._applied('jump_to_next')
+            return True
+        return False
+
+
+def _matches(pattern, pending):
+    """Compara o padrão com o fim da janela, do penúltimo para trás (o último já foi indexado)."""
+    i = -2
+    for expected in pattern[-2::-1]:
+        if expected is not None and pending[i][0] not in expected:
+            return False
+        i -= 1
+    return True
+
+
+def optimize_code(code, rules=RULES):
+    """Aplica o peephole a uma lista de instruções; devolve (nova_lista, filtro com as estatísticas)."""
+    sink = PeepholeSink(rules=rules)
+    for instruction in code:
+        sink.emit(instruction)
+    sink.close()
+    return sink.code, sink
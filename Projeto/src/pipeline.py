@@ -0,0 +1,389 @@
+import os
+import pickle
+import time
+from contextlib import contextmanager
+
+from lexer import TokenBuffer
+from parser import parse
+from semantic import SemanticAnalyzer
+from codegen import CodeGenerator
+from optimizer import Optimizer
+from cache import ArtifactCache
+from sinks import FileSink, ListSink
+from peephole import PeepholeSink
+from profiling import NULL_PROFILER
+from visitor import walk
+
+# Entra na chave da cache: mudar quando o comportamento do compilador mudar
+COMPILER_VERSION = '1.1'
+
+
+class CompilationResult:
+    """
+    Resultado de uma compilação sem interface (sem rich, sem ecrã).
+    Guarda o produto de cada fase para quem chamou decidir como o apresentar.
+    """
+    def __init__(self):
+        self.status = 'ok' # ok | lexical_error | syntax_error | semantic_error | internal_error
+        self.tokens = [] # LexTokens produzidos uma única vez pelo TokenBuffer
+        self.lexical_errors = []
+        self.syntax_errors = []
+        self.recovery_warnings = []
+        self.ast = None
+        self.is_valid = False
+        self.semantic_errors = []
+        self.semantic_warnings = []
+        self.global_scope = None
+        self.optimizations_count = 0
+        self.optimization_rules = {} # Regra do Optimizer (ou 'peephole:regra') -> número de aplicações
+        self.peephole_removed = 0 # Instruções eliminadas pelo peephole
+        self.code = None # Lista de instruções (None quando o código foi escrito em streaming)
+        self.source_map = None # Instrução -> linha/subprograma/ciclos (só com source_map=True)
+        self.instruction_count = 0
+        self.output_file = None
+        self.preview = [] # Primeiras instruções, para pré-visualização sem reler o ficheiro
+        self.timings = {} # Fase -> segundos
+        self.cached = False # True se veio da cache (nesse caso 'ast' é a AST do parser, antes da otimização)
+
+    @property
+    def ok(self):
+        return self.status == 'ok'
+
+
+def tokenize(code, backend='ply'):
+    """
+    Executa o Lexer sobre todo o código (uma só vez).
+    Devolve o TokenBuffer, que guarda os tokens e os caracteres inválidos e é
+    depois entregue diretamente ao parser. 'backend' é 'ply' ou 'fast' (scanner.py).
+    """
+    return TokenBuffer(code, backend=backend)
+
+
+def compile_source(source_code, no_opt=False, no_code=False, stop_after=None, cache=None,
+                   output_file=None, preview_lines=0, lexer_backend='ply', profiler=None, source_map=False):
+    """
+    Executa o pipeline completo (Lexer -> Parser -> Semântica -> Otimização -> Geração).
+    'stop_after' permite parar depois de uma fase ('parse' ou 'semantic').
+    Com uma 'cache' (ArtifactCache), uma fonte já compilada com as mesmas flags é
+    servida diretamente do disco sem executar nenhuma fase.
+    Com 'output_file', o código é escrito nesse ficheiro; sem cache é emitido em
+    streaming (result.code fica None e só se guardam 'preview_lines' instruções).
+    'lexer_backend' não entra na chave da cache: os dois scanners produzem os mesmos tokens.
+    'profiler' (ver profiling.py) recolhe métricas por fase; por omissão não mede nada.
+    Com 'source_map' o resultado traz o mapa de origem das instruções (result.source_map);
+    como a cache não o guarda, nesse caso a cache é ignorada.
+    """
+    profiler = profiler or NULL_PROFILER
+    if cache is None or source_map:
+        result = CompilationResult()
+        _run_phases(result, source_code, no_opt, no_code, stop_after, output_file, preview_lines,
+                    lexer_backend=lexer_backend, profiler=profiler, source_map=source_map)
+        _profile_counters(result, profiler)
+        return result
+
+    start = time.perf_counter()
+    with profiler.phase('cache'):
+        flags = {'no_opt': no_opt, 'no_code': no_code, 'stop_after': stop_after}
+        key = cache.make_key(source_code, COMPILER_VERSION, flags)
+        entry = cache.get(key)
+        if entry is not None:
+            result = _result_from_entry(entry, source_code)
+            _finish_code(result, output_file, preview_lines)
+    if entry is not None:
+        result.timings['cache'] = time.perf_counter() - start
+        _profile_counters(result, profiler)
+        return result
+
+    result = CompilationResult()
+    # A cache precisa da lista de instruções, por isso aqui não há streaming
+    ast_snapshot = _run_phases(result, source_code, no_opt, no_code, stop_after, None, preview_lines,
+                               snapshot_ast=True, lexer_backend=lexer_backend, profiler=profiler)
+    if result.status != 'internal_error':
+        cache.put(key, _entry_from_result(result, ast_snapshot))
+    _finish_code(result, output_file, preview_lines)
+    _profile_counters(result, profiler)
+    return result
+
+
+def _finish_code(result, output_file, preview_lines):
+    """Escreve (se pedido) o código que ficou em memória e prepara a pré-visualização."""
+    if result.code is None:
+        return
+    result.instruction_count = len(result.code)
+    result.preview = result.code[:preview_lines]
+    if output_file:
+        write_code(result.code, output_file)
+        result.output_file = output_file
+
+
+@contextmanager
+def _phase(result, profiler, name):
+    """Mede uma fase: o tempo de parede vai para result.timings e o resto para o profiler."""
+    start = time.perf_counter()
+    with profiler.phase(name):
+        yield
+    result.timings[name] = time.perf_counter() - start
+
+
+def _profile_counters(result, profiler):
+    """Contadores finais da compilação (só calculados com o profiler ligado)."""
+    if not profiler.enabled:
+        return
+    profiler.set('tokens', len(result.tokens))
+    profiler.set('instructions', result.instruction_count)
+    profiler.set('optimizations', result.optimizations_count)
+    profiler.set('optimizations_by_rule', dict(result.optimization_rules))
+    profiler.set('peephole_removed', result.peephole_removed)
+    if result.ast is not None:
+        node_types = {}
+
+        def count(item, depth):
+            if not hasattr(item, 'children'):
+                return False
+            node_types[item.type] = node_types.get(item.type, 0) + 1
+
+        walk(result.ast, pre=count)
+        profiler.set('ast_nodes', sum(node_types.values()))
+        profiler.set('ast_nodes_by_type', dict(sorted(node_types.items(), key=lambda kv: -kv[1])))
+
+
+def _run_phases(result, source_code, no_opt, no_code, stop_after, output_file=None, preview_lines=0,
+                snapshot_ast=False, lexer_backend='ply', profiler=NULL_PROFILER, source_map=False):
+    """
+    Corre as fases e preenche 'result'. Devolve a AST do parser serializada se 'snapshot_ast'.
+    Com 'output_file' o gerador escreve diretamente no ficheiro (FileSink).
+    """
+    ast_snapshot = None
+
+    # Fase Léxica
+    with _phase(result, profiler, 'lexer'):
+        token_buffer = tokenize(source_code, lexer_backend)
+    result.tokens = token_buffer.tokens
+    result.lexical_errors = token_buffer.errors
+    if result.lexical_errors:
+        result.status = 'lexical_error'
+        return ast_snapshot
+
+    # Fase de Parsing
+    with _phase(result, profiler, 'parse'):
+        # O parser consome os tokens já produzidos: a fonte não volta a ser tokenizada
+        ast, syntax_errors, recovery_warnings = parse(source_code, token_buffer)
+    # Copiar: o parser reutiliza as mesmas listas globais na próxima chamada
+    result.syntax_errors = list(syntax_errors)
+    result.recovery_warnings = list(recovery_warnings)
+    result.ast = ast
+    if not ast:
+        result.status = 'syntax_error'
+        return ast_snapshot
+    if snapshot_ast:
+        # O Optimizer altera a AST no lugar, por isso guarda-se já a versão do parser
+        try:
+            ast_snapshot = pickle.dumps(ast, protocol=pickle.HIGHEST_PROTOCOL)
+        except RecursionError:
+            ast_snapshot = None
+    if stop_after == 'parse':
+        return ast_snapshot
+
+    # Fase Semântica
+    with _phase(result, profiler, 'semantic'):
+        analyzer = SemanticAnalyzer()
+        is_valid, errors, warnings = analyzer.analyze(ast)
+    result.is_valid = is_valid
+    result.semantic_errors = errors
+    result.semantic_warnings = warnings
+    result.global_scope = analyzer.global_scope
+    if not is_valid:
+        result.status = 'semantic_error'
+        return ast_snapshot
+    if stop_after == 'semantic':
+        return ast_snapshot
+
+    # Fase de Otimização
+    if not no_opt:
+        with _phase(result, profiler, 'optimize'):
+            opt = Optimizer()
+            result.ast = opt.optimize(result.ast)
+        result.optimizations_count = opt.optimizations_count
+        result.optimization_rules = dict(opt.rule_counts)
+
+    # Fase da Geração de Código
+    if not no_code:
+        with _phase(result, profiler, 'codegen'):
+            target = FileSink(output_file, preview_lines) if output_file else ListSink()
+            # O peephole fica entre o gerador e o destino e otimiza as instruções à passagem
+            sink = target if no_opt else PeepholeSink(target)
+            generator = CodeGenerator(sink, source_map)
+            generator.generate(result.ast)
+            result.source_map = generator.source_map
+            if output_file:
+                result.instruction_count = target.count
+                result.preview = target.head
+                result.output_file = output_file
+            else:
+                result.code = target.code
+                _finish_code(result, None, preview_lines)
+        if not no_opt:
+            result.peephole_removed = sink.removed
+            for rule, count in sink.rule_counts.items():
+                result.optimization_rules[f"peephole:{rule}"] = count
+        profiler.set('labels', generator.label_counter)
+
+    return ast_snapshot
+
+
+def _entry_from_result(result, ast_snapshot):
+    """Artefactos guardados na cache, um por fase."""
+    return {
+        'status': result.status,
+        'tokens': [(tok.type, tok.value, tok.lineno, tok.lexpos) for tok in result.tokens],
+        'lexical_errors': result.lexical_errors,
+        'syntax_errors': result.syntax_errors,
+        'recovery_warnings': result.recovery_warnings,
+        'ast': ast_snapshot,
+        'semantic': {
+            'is_valid': result.is_valid,
+            'errors': result.semantic_errors,
+            'warnings': result.semantic_warnings,
+            'global_scope': result.global_scope,
+        },
+        'optimizations_count': result.optimizations_count,
+        'optimization_rules': result.optimization_rules,
+        'peephole_removed': result.peephole_removed,
+        'code': result.code,
+    }
+
+
+def _result_from_entry(entry, source_code):
+    result = CompilationResult()
+    result.cached = True
+    result.status = entry['status']
+    result.tokens = TokenBuffer.from_tuples(source_code, entry['tokens']).tokens
+    result.lexical_errors = entry['lexical_errors']
+    result.syntax_errors = entry['syntax_errors']
+    result.recovery_warnings = entry['recovery_warnings']
+    if entry['ast'] is not None:
+        result.ast = pickle.loads(entry['ast'])
+    semantic = entry['semantic']
+    result.is_valid = semantic['is_valid']
+    result.semantic_errors = semantic['errors']
+    result.semantic_warnings = semantic['warnings']
+    result.global_scope = semantic['global_scope']
+    result.optimizations_count = entry['optimizations_count']
+    result.optimization_rules = entry['optimization_rules']
+    result.peephole_removed = entry['peephole_removed']
+    result.code = entry['code']
+    return result
+
+
+def default_output_path(file_path, output_dir="../outputs"):
+    """Caminho de saída por omissão: <output_dir>/<nome>.ewvm"""
+    name_only = os.path.splitext(os.path.basename(file_path))[0]
+    return os.path.join(output_dir, name_only + '.ewvm')
+
+
+def write_code(code, output_file):
+    with open(output_file, 'w', buffering=1 << 16) as f:
+        for instruction in code:
+            f.write(instruction)
+            f.write("\n")
+
+
+def format_errors(result):
+    """Erros de todas as fases como texto simples (uma linha por erro, sem rich)."""
+    errors = [f"Linha {e['lineno']}, Coluna {e['col']}: Caractere inválido '{e['value']}'"
+              for e in result.lexical_errors]
+    errors += [f"Linha {e['lineno']}, Coluna {e['col']}: {e['msg']}" for e in result.syntax_errors]
+    errors += result.semantic_errors
+    return errors
+
+
+# Modo Batch (vários ficheiros em paralelo)
+def compile_one(job):
+    """
+    Compila um ficheiro num processo do pool e devolve um resumo serializável.
+    'job' é um tuplo (file_path, output_dir, no_opt, no_code, cache_dir, lexer_backend)
+    para ser 'picklable'. Sem 'cache_dir' (None) a cache não é usada.
+    """
+    file_path, output_dir, no_opt, no_code, cache_dir, lexer_backend = job
+    start = time.perf_counter()
+    summary = {
+        'file': file_path,
+        'status': 'ok',
+        'output': None,
+        'errors': [],
+        'optimizations': 0,
+        'instructions': 0,
+        'cached': False,
+        'timings': {},
+    }
+    try:
+        with open(file_path, 'r') as f:
+            source_code = f.read()
+
+        cache = ArtifactCache(cache_dir) if cache_dir else None
+        output_file = None if no_code else default_output_path(file_path, output_dir)
+        result = compile_source(source_code, no_opt=no_opt, no_code=no_code, cache=cache,
+                                output_file=output_file, lexer_backend=lexer_backend)
+        summary['status'] = result.status
+        summary['cached'] = result.cached
+        summary['timings'] = result.timings
+        summary['optimizations'] = result.optimizations_count
+
+        summary['errors'] = format_errors(result)
+
+        summary['output'] = result.output_file
+        summary['instructions'] = result.instruction_count
+    except Exception as e:
+        summary['status'] = 'internal_error'
+        summary['errors'] = [str(e)]
+
+    summary['timings']['total'] = time.perf_counter() - start
+    return summary
+
+
+def collect_sources(paths):
+    """Expande diretorias em ficheiros .pas (ordenados) e mantém ficheiros explícitos."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                if name.endswith('.pas'):
+                    files.append(os.path.join(path, name))
+        else:
+            files.append(path)
+    return files
+
+
+def compile_batch(files, output_dir="../outputs", jobs=None, no_opt=False, no_code=False, cache_dir=None,
+                  lexer_backend='ply'):
+    """
+    Distribui a compilação por um pool de processos (um ficheiro por tarefa).
+    Cada processo tem o seu próprio lexer/parser, por isso o estado global do PLY não é partilhado.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    os.makedirs(output_dir, exist_ok=True)
+    job_list = [(f, output_dir, no_opt, no_code, cache_dir, lexer_backend) for f in files]
+
+    start = time.perf_counter()
+    if jobs == 1 or len(job_list) <= 1:
+        results = [compile_one(job) for job in job_list]
+    else:
+        # chunksize > 1 reduz a comunicação entre processos em lotes grandes
+        workers = jobs or os.cpu_count() or 1
+        chunksize = max(1, len(job_list) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(compile_one, job_list, chunksize=chunksize))
+    elapsed = time.perf_counter() - start
+
+    failed = sum(1 for r in results if r['status'] != 'ok')
+    cached = sum(1 for r in results if r['cached'])
+    return {
+        'files': results,
+        'total': len(results),
+        'succeeded': len(results) - failed,
+        'failed': failed,
+        'cached': cached,
+        'jobs': jobs or os.cpu_count() or 1,
+        'wall_time': elapsed,
+    }
@@ -0,0 +1,98 @@
+"""
+Instrumentação do pipeline (--profile).
+
+O pipeline recebe sempre um perfilador: por omissão o NULL_PROFILER, cujos métodos
+não fazem nada, por isso a instrumentação desligada não custa nada. Só quando
+'enabled' é True é que o pipeline calcula as métricas mais caras (ex: contagem de
+nós da AST por tipo).
+"""
+import time
+import tracemalloc
+
+
+class _NullPhase:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_PHASE = _NullPhase()
+
+
+class NullProfiler:
+    """Perfilador desligado: mesma interface que o Profiler, sem trabalho nenhum."""
+    enabled = False
+
+    def phase(self, name):
+        return _NULL_PHASE
+
+    def count(self, name, amount=1):
+        pass
+
+    def set(self, name, value):
+        pass
+
+
+NULL_PROFILER = NullProfiler()
+
+
+class _PhaseTimer:
+    """Mede tempo de parede, tempo de CPU e pico de memória (tracemalloc) de uma fase."""
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.tracing = False
+
+    def __enter__(self):
+        if self.profiler.memory and not tracemalloc.is_tracing():
+            # O pico conta só o que é alocado durante a fase
+            tracemalloc.start()
+            self.tracing = True
+        self.cpu = time.process_time()
+        self.wall = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        wall = time.perf_counter() - self.wall
+        cpu = time.process_time() - self.cpu
+        peak = None
+        if self.tracing:
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+        # Uma fase pode repetir-se (ex: várias compilações): os tempos somam-se
+        stats = self.profiler.phases.setdefault(self.name, {'wall': 0.0, 'cpu': 0.0, 'peak_bytes': None})
+        stats['wall'] += wall
+        stats['cpu'] += cpu
+        if peak is not None:
+            stats['peak_bytes'] = max(stats['peak_bytes'] or 0, peak)
+        return False
+
+
+class Profiler:
+    """
+    Recolhe métricas de uma compilação: tempos e memória por fase ('phases') e
+    contadores ('counters', ex: tokens, instruções, etiquetas, otimizações por regra).
+    Com memory=True cada fase corre sob tracemalloc, o que torna os tempos mais lentos
+    (mas mantém as proporções entre fases).
+    """
+    enabled = True
+
+    def __init__(self, memory=True):
+        self.memory = memory
+        self.phases = {}
+        self.counters = {}
+
+    def phase(self, name):
+        return _PhaseTimer(self, name)
+
+    def count(self, name, amount=1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def set(self, name, value):
+        self.counters[name] = value
+
+    def as_dict(self):
+        return {'phases': self.phases, 'counters': self.counters}
@@ -0,0 +1,261 @@
+"""
+Propagação de constantes e de cópias entre comandos.
+
+Percorre os corpos (CompoundStatement) pela ordem de execução, com um conjunto de
+factos "variável -> valor conhecido" (uma constante inteira/booleana ou outra
+variável escalar). Em cada expressão as variáveis com valor conhecido são
+substituídas e a expressão volta a ser simplificada pelo Otimizador; um IF cuja
+condição passa a constante perde o ramo morto.
+
+Fluxo de controlo (análise "must": um facto só vale se valer em todos os caminhos):
+  if     - cada ramo parte dos factos antes do if; depois fica a interseção
+  while  - as variáveis atribuídas no ciclo deixam de ser conhecidas logo à entrada
+           (o corpo pode voltar ao teste com outros valores); à saída valem os
+           factos da entrada do ciclo
+  for    - o valor inicial e o limite usam os factos antes do ciclo (são avaliados uma
+           vez); o corpo é tratado como no while, mais a variável de controlo
+           (indefinida depois do ciclo)
+Uma chamada de função/procedimento pode alterar qualquer global: esquece todos os factos.
+As variáveis são identificadas pela ligação da análise semântica (node.binding).
+"""
+from parser import Node
+from visitor import NodeVisitor, transform_postorder
+
+# Constantes que se propagam (as strings ficam onde estão). Nada se propaga através de
+# uma coerção (real := inteiro): o valor guardado não tem o tipo da expressão
+PROPAGATED_CONSTANTS = ('IntegerConstant', 'BooleanConstant')
+CALLS = ('FunctionCall', 'ProcedureCall')
+LOOPS = ('WhileStatement', 'ForStatement')
+NO_NAMES = frozenset()
+
+
+class ConstantPropagator(NodeVisitor):
+    """
+    Passagem de propagação sobre a AST já simplificada. Usa o Otimizador ('optimizer')
+    para voltar a simplificar as expressões e para contar as regras aplicadas
+    (constant_propagation, copy_propagation, dead_branch).
+    """
+    visit_prefix = 'propagate_'
+
+    def __init__(self, optimizer):
+        self.optimizer = optimizer
+        self.facts = {} # Ligação da variável -> Node com o valor conhecido
+        self.indexed = set() # Ligações usadas com índice (arrays e strings): nunca são cópias
+        self.with_calls = {} # id -> nó, para os nós cuja subárvore tem chamadas
+        self.writes = {} # id -> variáveis alteradas na subárvore (só quando há alguma)
+        self.loop_writes = {} # id do ciclo -> variáveis alteradas no ciclo (None se houver chamadas)
+
+    def propagate(self, ast):
+        """Propaga sobre a AST; todos os nós já devem ter passado por summarize (pós-ordem)."""
+        return self.visit(ast)
+
+    def summarize(self, node):
+        """
+        Resume um nó cujos filhos já foram resumidos: se a subárvore tem chamadas e que
+        variáveis escalares altera. O Otimizador chama-o na mesma travessia em pós-ordem
+        da dobragem de constantes, por isso a propagação não volta a percorrer as
+        expressões e os ciclos. As folhas que não são chamadas não precisam de resumo,
+        tal como os nós criados depois pela propagação (nunca têm chamadas nem atribuições).
+        """
+        kind = node.type
+        with_calls = self.with_calls
+        writes = self.writes
+        has_call = kind in CALLS
+        names = NO_NAMES
+        for child in node.children:
+            key = id(child)
+            if not has_call and key in with_calls:
+                has_call = True
+            child_names = writes.get(key)
+            if child_names:
+                names = child_names if not names else names | child_names
+        if kind == 'AssignmentStatement' and node.children[0].type == 'VariableAccess':
+            names = names | {node.children[0].binding}
+        elif kind == 'ReadStatement':
+            names = names | {var.binding for var in node.children if var.type == 'VariableAccess'}
+        elif kind == 'ForStatement':
+            names = names | {node.children[0].binding}
+        elif kind == 'ArrayAccess':
+            self.indexed.add(node.binding)
+        if has_call:
+            with_calls[id(node)] = node # Guarda o nó: o id não pode ser reutilizado
+        if names:
+            writes[id(node)] = names
+        if kind in LOOPS:
+            self.loop_writes[id(node)] = None if has_call else names
+
+    def _has_call(self, node):
+        return id(node) in self.with_calls
+
+    # Factos
+    def _kill(self, name):
+        """A variável mudou: esquece o seu valor e as cópias que dependiam dela."""
+        facts = self.facts
+        facts.pop(name, None)
+        for var in [var for var, value in facts.items() if value.type == 'VariableAccess' and value.binding is name]:
+            del facts[var]
+
+    def _kill_names(self, names):
+        if names is None:
+            self.facts = {}
+        else:
+            for name in names:
+                self._kill(name)
+
+    def _join(self, other):
+        """Interseção: só ficam os factos iguais nos dois caminhos."""
+        self.facts = {var: value for var, value in self.facts.items()
+                      if var in other and other[var].type == value.type and other[var].leaf == value.leaf
+                      and other[var].binding is value.binding}
+
+    def _rewrite(self, expr):
+        """Substitui as variáveis conhecidas em 'expr' e volta a simplificá-la."""
+        if not expr or not self.facts:
+            return expr
+        if self._has_call(expr):
+            # A ordem de avaliação face à chamada importa: não se mexe
+            return expr
+        facts = self.facts
+        optimizer = self.optimizer
+        fold = optimizer.fold_node
+
+        def substitute(n):
+            if n.type == 'VariableAccess':
+                value = facts.get(n.binding)
+                if value is None:
+                    return n
+                optimizer._applied('copy_propagation' if value.type == 'VariableAccess' else 'constant_propagation')
+                return Node(value.type, [], value.leaf, lineno=n.lineno, binding=value.binding,
+                            value_type=value.value_type)
+            return fold(n)
+
+        return transform_postorder(expr, substitute)
+
+    def _rewrite_index(self, var):
+        """Índice de um ArrayAccess (destino de atribuição ou de leitura)."""
+        if var.type == 'ArrayAccess':
+            var.children[0] = self._rewrite(var.children[0])
+
+    # Estrutura: cada corpo começa sem factos
+    def generic_visit(self, node):
+        # Comando desconhecido: não se sabe o que altera
+        self.facts = {}
+        return node
+
+    def propagate_Program(self, node):
+        children = node.children
+        for i, child in enumerate(children):
+            children[i] = yield child
+        return node
+
+    propagate_Block = propagate_Program
+    propagate_FunctionDeclarations = propagate_Program
+
+    def propagate_FunctionDeclaration(self, node):
+        self.facts = {}
+        node.children[2] = yield node.children[2]
+        self.facts = {}
+        return node
+
+    propagate_ProcedureDeclaration = propagate_FunctionDeclaration
+
+    def propagate_Declarations(self, node):
+        return node
+
+    def propagate_Empty(self, node):
+        return node
+
+    # Comandos
+    def propagate_CompoundStatement(self, node):
+        children = node.children
+        for i, child in enumerate(children):
+            children[i] = yield child
+        return node
+
+    def propagate_AssignmentStatement(self, node):
+        target = node.children[0]
+        # O índice do destino é calculado antes da expressão
+        self._rewrite_index(target)
+        if self._has_call(target):
+            self.facts = {}
+        expr = node.children[1] = self._rewrite(node.children[1])
+        if self._has_call(expr):
+            self.facts = {}
+        if target.type != 'VariableAccess':
+            return node
+
+        name = target.binding
+        self._kill(name)
+        if expr.value_type is not name.type:
+            pass # Há uma coerção (real := inteiro): o valor lido não é o da expressão
+        elif expr.type in PROPAGATED_CONSTANTS:
+            self.facts[name] = expr
+        elif (expr.type == 'VariableAccess' and expr.binding is not name
+              and name not in self.indexed and expr.binding not in self.indexed):
+            self.facts[name] = expr
+        return node
+
+    def propagate_ReadStatement(self, node):
+        for var in node.children:
+            self._rewrite_index(var)
+            if var.type == 'VariableAccess':
+                self._kill(var.binding)
+        return node
+
+    def propagate_WriteStatement(self, node):
+        children = node.children
+        for i, expr in enumerate(children):
+            children[i] = self._rewrite(expr)
+            if self._has_call(children[i]):
+                self.facts = {}
+        return node
+
+    def propagate_ProcedureCall(self, node):
+        # Os argumentos são avaliados antes da chamada, com os factos atuais
+        # (a não ser que um deles chame uma função, que pode alterar os seguintes)
+        if node.children and node.children[0].type == 'ArgList' and not self._has_call(node.children[0]):
+            args = node.children[0].children
+            for i, arg in enumerate(args):
+                args[i] = self._rewrite(arg)
+        self.facts = {}
+        return node
+
+    def propagate_IfStatement(self, node):
+        cond = node.children[0] = self._rewrite(node.children[0])
+        if self._has_call(cond):
+            self.facts = {}
+
+        if cond.type == 'BooleanConstant':
+            # A condição passou a constante: fica só o ramo executado
+            folded = self.optimizer.fold_IfStatement(node)
+            if folded is not node:
+                return (yield folded)
+
+        before = dict(self.facts)
+        node.children[1] = yield node.children[1]
+        after_then = self.facts
+        self.facts = before
+        if len(node.children) > 2:
+            node.children[2] = yield node.children[2]
+        self._join(after_then)
+        return node
+
+    def propagate_WhileStatement(self, node):
+        self._kill_names(self.loop_writes[id(node)])
+        node.children[0] = self._rewrite(node.children[0])
+        head = dict(self.facts)
+        node.children[1] = yield node.children[1]
+        self.facts = head
+        return node
+
+    def propagate_ForStatement(self, node):
+        # O valor inicial e o limite são avaliados uma vez, antes do ciclo
+        for i in (1, 2):
+            node.children[i] = self._rewrite(node.children[i])
+            if self._has_call(node.children[i]):
+                self.facts = {}
+        self._kill_names(self.loop_writes[id(node)])
+        head = dict(self.facts)
+        node.children[3] = yield node.children[3]
+        self.facts = head
+        return node
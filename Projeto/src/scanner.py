@@ -0,0 +1,105 @@
+"""
+Scanner alternativo ao lexer do PLY (--lexer=fast).
+
+Produz exatamente os mesmos tokens (tipo, valor, lineno, lexpos) e os mesmos erros
+léxicos que lexer.py, mas com uma única expressão regular mestre pré-compilada:
+cada 'match' devolve o nome do grupo (lastgroup) e o despacho é feito com
+comparações simples, sem chamar uma função Python por regra como o PLY.
+"""
+import re
+
+from lexer import reserved
+
+# Tokens de pontuação: o texto do token determina o tipo
+OPERATORS = {
+    ':=': 'ASSIGN', '<>': 'NOTEQUAL', '<=': 'LESSEQUAL', '>=': 'GREATEREQUAL', '..': 'DOTDOT',
+    '+': 'PLUS', '-': 'MINUS', '*': 'TIMES', '/': 'DIVIDE', '=': 'EQUAL',
+    '<': 'LESSTHAN', '>': 'GREATERTHAN', '(': 'LPAREN', ')': 'RPAREN',
+    '[': 'LBRACKET', ']': 'RBRACKET', ',': 'COMMA', ';': 'SEMICOLON', ':': 'COLON', '.': 'DOT',
+}
+
+# A ordem das alternativas reproduz a prioridade do PLY: primeiro as regras-função
+# pela ordem em que aparecem em lexer.py, depois as regras simples das mais longas
+# para as mais curtas (por isso ':=' ganha a ':' e '..' ganha a '.').
+# Os comentários ficam antes do operador '(' para que '(*' abra um comentário.
+# Os espaços/tabs (t_ignore) são absorvidos no prefixo de cada match, e o grupo ERR
+# apanha qualquer outro caractere: assim cada match é um token, uma mudança de linha
+# ou um erro, e o finditer percorre o texto todo sem voltar ao Python entre tokens.
+MASTER = re.compile(r"""
+    [ \t]*
+    (?:
+        (?P<ID>[a-zA-Z][a-zA-Z0-9_]*)
+      | (?P<REAL>\d+(?:\.\d+)(?:[eE][-+]?\d+)?|\d+[eE][-+]?\d+)
+      | (?P<INT>\d+)
+      | (?P<STR>'(?:[^']|'')*')
+      | (?P<COMMENT>\{[^}]*\}|\(\*.*?\*\))
+      | (?P<NL>\n+)
+      | (?P<OP>:=|<>|<=|>=|\.\.|[-+*/=<>()\[\],;:.])
+      | (?P<ERR>[^ \t])
+    )
+""", re.VERBOSE)
+
+
+class Token:
+    """Token compatível com o LexToken do PLY (o yacc usa type/value/lineno/lexpos e 'lexer')."""
+    __slots__ = ('type', 'value', 'lineno', 'lexpos', 'lexer')
+
+    def __init__(self, type, value, lineno, lexpos):
+        self.type = type
+        self.value = value
+        self.lineno = lineno
+        self.lexpos = lexpos
+
+    def __repr__(self):
+        return f"LexToken({self.type},{self.value!r},{self.lineno},{self.lexpos})"
+
+
+def scan(data):
+    """Tokeniza 'data' e devolve (tokens, erros) no mesmo formato que o lexer do PLY."""
+    tokens = []
+    errors = []
+    append = tokens.append
+    keywords = reserved
+    operators = OPERATORS
+    lineno = 1
+
+    # Cache texto -> (tipo, valor) dos identificadores: evita lower() e a procura nas
+    # palavras reservadas para nomes repetidos (o caso comum)
+    identifiers = {}
+
+    for m in MASTER.finditer(data):
+        kind = m.lastgroup
+        if kind == 'ID':
+            start, stop = m.span(kind)
+            text = data[start:stop]
+            entry = identifiers.get(text)
+            if entry is None:
+                value = text.lower() # Pascal é case-insensitive
+                entry = identifiers[text] = (keywords.get(value, 'ID'), value)
+            append(Token(entry[0], entry[1], lineno, start))
+        elif kind == 'OP':
+            start, stop = m.span(kind)
+            text = data[start:stop]
+            append(Token(operators[text], text, lineno, start))
+        elif kind == 'NL':
+            # A contagem de linhas faz parte do próprio scan (como t_newline).
+            # Tal como no PLY, as mudanças de linha dentro de comentários e strings não contam.
+            start, stop = m.span(kind)
+            lineno += stop - start
+        elif kind == 'INT':
+            append(Token('INTEGER_CONST', int(m.group(kind)), lineno, m.start(kind)))
+        elif kind == 'REAL':
+            append(Token('REAL_CONST', float(m.group(kind)), lineno, m.start(kind)))
+        elif kind == 'STR':
+            append(Token('STRING_CONST', m.group(kind)[1:-1].replace("''", "'"), lineno, m.start(kind)))
+        elif kind == 'ERR':
+            # Mesmo tratamento que t_error: regista o caractere e continua no seguinte
+            pos = m.start(kind)
+            errors.append({
+                'lineno': lineno,
+                'col': pos - data.rfind('\n', 0, pos),
+                'value': data[pos],
+            })
+        # COMMENT: ignorado
+
+    return tokens, errors
@@ -1,3 +1,42 @@
+from visitor import NodeVisitor
+from typesystem import (INTEGER, REAL, BOOLEAN, STRING, ERROR, UNKNOWN, NUMERIC,
+                        basic_type, array_of, signature, compatible)
+
+
+class Binding:
+    """
+    Ligação de um identificador, resolvida uma só vez pela análise semântica e guardada
+    nos nós que o usam (node.binding): o Otimizador e o gerador de código usam-na em
+    vez de procurarem o nome. Os nós do mesmo identificador partilham o mesmo objeto,
+    por isso a identidade da ligação distingue uma local de uma global com o mesmo nome.
+      depth  - profundidade do escopo (0 = global, 1 = subprograma)
+      slot   - endereço no frame: globais a partir do GP, locais >= 0 e parâmetros e
+               resultado < 0 a partir do FP (None nos subprogramas). O gerador de
+               código volta a arrumar as variáveis declaradas (o Otimizador acrescenta
+               e remove variáveis)
+      type   - tipo (typesystem): o da variável ou, nos subprogramas, a assinatura
+      kind   - 'variable', 'parameter', 'result', 'function' ou 'procedure'
+      result - nas funções, a ligação da variável de resultado (o nome da função no corpo)
+    """
+    __slots__ = ('name', 'depth', 'slot', 'type', 'kind', 'result')
+
+    def __init__(self, name, depth, slot, type, kind, result=None):
+        self.name = name
+        self.depth = depth
+        self.slot = slot
+        self.type = type
+        self.kind = kind
+        self.result = result
+
+    @property
+    def low(self):
+        """Limite inferior de um array (0 nos outros tipos)."""
+        return self.type.low if self.type.is_array else 0
+
+    def __repr__(self):
+        return f"Binding({self.name!r}, depth={self.depth}, slot={self.slot}, kind={self.kind!r})"
+
+
 class SymbolTable:
     """
     Tabela de Símbolos com suporte a escopos hierárquicos (Pai -> Filho).
@@ -7,6 +46,7 @@ class SymbolTable:
         self.symbols = {} # Dicionário para guardar os símbolos deste escopo
         self.parent = None # Referência para o escopo pai (escopo exterior)
         self.level = 0 # Nível de profundidade (0 = Global)
+        self.frame_size = 0 # Espaços já atribuídos às variáveis declaradas neste escopo
 
     def add(self, name, info):
         # Guarda o símbolo sempre em minúsculas para garantir case-insensitivity
@@ -38,7 +78,7 @@ class SymbolTable:
         return child
 
 
-class SemanticAnalyzer:
+class SemanticAnalyzer(NodeVisitor):
     """
     Analisador Semântico que percorre a AST (Visitor Pattern).
     Responsabilidades:
@@ -46,6 +86,9 @@ class SemanticAnalyzer:
     2. Gestão de Escopos e Declarações
     3. Verificação de Inicialização de Variáveis
     """
+    visit_prefix = 'visit_'
+    default_result = UNKNOWN
+
     def __init__(self):
         self.global_scope = SymbolTable()
         self.current_scope = self.global_scope
@@ -88,24 +131,21 @@ class SemanticAnalyzer:
             self.current_scope = self.current_scope.parent
 
     # Mecanismo de Visitor
-    def visit(self, node):
-        if not node: return 'unknown'
-        # Invoca dinamicamente o método visit_TipoDoNo (ex: visit_IfStatement)
-        method_name = f'visit_{node.type}'
-        visitor = getattr(self, method_name, self.generic_visit)
-        return visitor(node)
-
+    # 'visit' vem do NodeVisitor: despacha para visit_TipoDoNo (ex: visit_IfStatement)
+    # através de uma tabela construída uma vez por classe.
+    # Para visitar um filho faz-se 'tipo = yield filho': o NodeVisitor avança com uma
+    # pilha explícita, sem recursão, e devolve o resultado da visita ao filho.
     def generic_visit(self, node):
         """Visitante genérico para nós que não precisam de tratamento especial"""
         if hasattr(node, 'children'):
             for child in node.children:
                 if child:
-                    self.visit(child)
-        return 'unknown'
+                    yield child
+        return UNKNOWN
 
     # Estrutura e Blocos
     def visit_Program(self, node):
-        if node.children: self.visit(node.children[0])
+        if node.children: yield node.children[0]
 
     def visit_Block(self, node):
         funcs = None
@@ -125,14 +165,14 @@ class SemanticAnalyzer:
         # 1. Variáveis Globais (para estarem disponíveis)
         # 2. Funções/Procedimentos
         # 3. Corpo Principal
-        if decls: self.visit(decls)
-        if funcs: self.visit(funcs)
-        if body: self.visit(body)
+        if decls: yield decls
+        if funcs: yield funcs
+        if body: yield body
 
     # Declarações de Variáveis
     def visit_Declarations(self, node):
         for child in node.children:
-            if child and child.type != 'Empty': self.visit(child)
+            if child and child.type != 'Empty': yield child
 
     def visit_Declaration(self, node):
         id_list = node.children[0]
@@ -142,32 +182,37 @@ class SemanticAnalyzer:
         # Suporte a id_list plana ou aninhada (dependendo de como o parser gerou)
         ids = id_list.children if id_list.type == 'IDList' else [id_list]
 
+        scope = self.current_scope
+        size = type_info.size
         for child in ids:
             var_name = child.leaf
             # Verifica colisão de nomes no mesmo escopo
-            if self.current_scope.lookup_current_scope(var_name):
+            if scope.lookup_current_scope(var_name):
                 self.add_error(f"Variável '{var_name}' já declarada neste escopo.", child)
             else:
-                self.current_scope.add(var_name, {
+                child.binding = Binding(var_name, scope.level, scope.frame_size, type_info, 'variable')
+                scope.frame_size += size
+                scope.add(var_name, {
                     'kind': 'variable',
                     'type': type_info,
-                    'initialized': False # Rastreio de inicialização
+                    'initialized': False, # Rastreio de inicialização
+                    'binding': child.binding,
                 })
 
     def get_type_info(self, type_node):
-        """Converte o nó de tipo da AST para uma representação interna simples"""
-        if type_node.type == 'BasicType': return type_node.leaf 
-        elif type_node.type == 'Type': return type_node.leaf
+        """Converte o nó de tipo da AST no tipo (único) do typesystem"""
+        if type_node.type == 'BasicType': return basic_type(type_node.leaf)
+        elif type_node.type == 'Type': return basic_type(type_node.leaf)
         elif type_node.type == 'ArrayType':
-            range_tuple = type_node.leaf
+            low, high = type_node.leaf
             # Recursivo para arrays de arrays (se suportado)
             elem_type = self.get_type_info(type_node.children[0])
-            return {'kind': 'array', 'range': range_tuple, 'elem_type': elem_type}
-        return 'unknown'
+            return array_of(low, high, elem_type)
+        return UNKNOWN
 
     # Subprogramas
     def visit_FunctionDeclarations(self, node):
-        for child in node.children: self.visit(child)
+        for child in node.children: yield child
 
     def visit_ProcedureDeclaration(self, node):
         proc_name = node.leaf
@@ -176,7 +221,8 @@ class SemanticAnalyzer:
         else:
             # Extrai assinatura para validar chamadas depois
             params_info = self._extract_params(node.children[0])
-            proc_info = {'kind': 'procedure', 'params': params_info}
+            node.binding = Binding(proc_name, self.current_scope.level, None, signature(params_info), 'procedure')
+            proc_info = {'kind': 'procedure', 'params': params_info, 'binding': node.binding}
             self.current_scope.add(proc_name, proc_info)
 
         # Cria novo escopo para os parâmetros e variáveis locais
@@ -184,7 +230,7 @@ class SemanticAnalyzer:
         self._register_params_in_scope(node.children[0])
         
         if len(node.children) > 2:
-            self.visit(node.children[2]) # Visita o corpo do procedimento
+            yield node.children[2] # Visita o corpo do procedimento
         self.exit_scope()
 
     def visit_FunctionDeclaration(self, node):
@@ -195,16 +241,27 @@ class SemanticAnalyzer:
             self.add_error(f"Função '{func_name}' já declarada.", node)
         else:
             params_info = self._extract_params(node.children[0])
-            func_info = {'kind': 'function', 'params': params_info, 'return_type': return_type}
+            node.binding = Binding(func_name, self.current_scope.level, None, signature(params_info, return_type),
+                                   'function')
+            func_info = {'kind': 'function', 'params': params_info, 'return_type': return_type,
+                         'binding': node.binding}
             self.current_scope.add(func_name, func_info)
 
         self.enter_scope()
         # Em Pascal, o nome da função age como uma variável local para o retorno
-        self.current_scope.add(func_name, {'kind': 'variable', 'type': return_type, 'initialized': False})
+        # ('function' guarda a assinatura para as chamadas recursivas, ver visit_FunctionCall)
+        declared = self.current_scope.parent.lookup_current_scope(func_name)
+        # O chamador reserva o espaço do resultado por baixo dos argumentos
+        result = Binding(func_name, self.current_scope.level, -(len(self._extract_params(node.children[0])) + 1),
+                         return_type, 'result')
+        if node.binding is not None:
+            node.binding.result = result
+        self.current_scope.add(func_name, {'kind': 'variable', 'type': return_type, 'initialized': False,
+                                           'function': declared, 'binding': result})
         self._register_params_in_scope(node.children[0])
 
         if len(node.children) > 2:
-            self.visit(node.children[2]) 
+            yield node.children[2] 
         self.exit_scope()
 
     # Helpers para Parâmetros
@@ -221,38 +278,46 @@ class SemanticAnalyzer:
         return params
 
     def _register_params_in_scope(self, params_node):
-        """Regista os parâmetros como variáveis locais inicializadas"""
+        """
+        Regista os parâmetros como variáveis locais inicializadas. O chamador empilha os
+        argumentos pela ordem: o último fica em FP-1, o penúltimo em FP-2, ...
+        """
         if params_node.type == 'FormalParameters':
+            scope = self.current_scope
+            flat = []
             for param in params_node.children:
                 p_ids = param.children[0]
                 ids = p_ids.children if p_ids.type == 'IDList' else [p_ids]
                 p_type = self.get_type_info(param.children[1])
-                for p_id in ids:
-                    self.current_scope.add(p_id.leaf, {'kind': 'variable', 'type': p_type, 'initialized': True})
+                flat.extend((p_id, p_type) for p_id in ids)
+            for i, (p_id, p_type) in enumerate(flat):
+                p_id.binding = Binding(p_id.leaf, scope.level, i - len(flat), p_type, 'parameter')
+                scope.add(p_id.leaf, {'kind': 'variable', 'type': p_type, 'initialized': True,
+                                      'binding': p_id.binding})
 
     # Comandos
     def visit_CompoundStatement(self, node):
         # Garante a visita a TODAS as instruções do bloco
         for child in node.children:
             if child:
-                self.visit(child)
+                yield child
 
     def visit_StatementList(self, node):
         for child in node.children:
-            if child: self.visit(child)
+            if child: yield child
 
     def visit_AssignmentStatement(self, node): 
         # Fase 1: Visita o lado esquerdo (LHS)
         self.in_lhs_of_assignment = True
         var_node = node.children[0]
-        var_type = self.visit(var_node) # Verifica se a variável existe
+        var_type = yield var_node # Verifica se a variável existe
         self.in_lhs_of_assignment = False
 
         # Fase 2: Visita o lado direito (RHS) - a expressão
-        expr_type = self.visit(node.children[1])
+        expr_type = yield node.children[1]
 
         # Fase 3: Verificação de Compatibilidade de Tipos
-        if var_type and expr_type and var_type != 'error' and expr_type != 'error':
+        if var_type and expr_type and var_type is not ERROR and expr_type is not ERROR:
             if not self.check_type_compatibility(var_type, expr_type):
                 self.add_error(f"Incompatibilidade: Tentativa de atribuir '{expr_type}' a '{var_type}'.", node)
         
@@ -263,18 +328,18 @@ class SemanticAnalyzer:
 
     def visit_IfStatement(self, node):
         # Validação da Condição
-        cond_type = self.visit(node.children[0])
-        if cond_type != 'boolean' and cond_type != 'error':
+        cond_type = yield node.children[0]
+        if cond_type is not BOOLEAN and cond_type is not ERROR:
             self.add_error(f"A condição do 'if' deve ser booleana, recebeu '{cond_type}'.", node.children[0])
         
-        self.visit(node.children[1]) # Then
-        if len(node.children) > 2: self.visit(node.children[2]) # Else (Opcional)
+        yield node.children[1] # Then
+        if len(node.children) > 2: yield node.children[2] # Else (Opcional)
 
     def visit_WhileStatement(self, node):
-        cond_type = self.visit(node.children[0])
-        if cond_type != 'boolean' and cond_type != 'error':
+        cond_type = yield node.children[0]
+        if cond_type is not BOOLEAN and cond_type is not ERROR:
             self.add_error("A condição do 'while' deve ser booleana.", node.children[0])
-        self.visit(node.children[1])
+        yield node.children[1]
 
     def visit_ForStatement(self, node):
         var_name = node.children[0].leaf
@@ -283,15 +348,16 @@ class SemanticAnalyzer:
             self.add_error(f"Variável de controle '{var_name}' não declarada.", node)
         else:
             var_info['initialized'] = True # Variável do for é inicializada automaticamente
+            node.children[0].binding = var_info.get('binding')
 
         # Validação dos Limites (Start to End)
-        start_t = self.visit(node.children[1])
-        end_t = self.visit(node.children[2])
+        start_t = yield node.children[1]
+        end_t = yield node.children[2]
 
-        if (start_t != 'integer' and start_t != 'error') or (end_t != 'integer' and end_t != 'error'):
+        if start_t not in (INTEGER, ERROR) or end_t not in (INTEGER, ERROR):
             self.add_error("Limites do 'for' devem ser inteiros.", node)
 
-        self.visit(node.children[3]) # Corpo do Loop
+        yield node.children[3] # Corpo do Loop
 
     # Expressões e Operações
     def visit_VariableAccess(self, node):
@@ -299,13 +365,15 @@ class SemanticAnalyzer:
         info = self.current_scope.lookup(name)
         if not info:
             self.add_error(f"Identificador '{name}' não declarado.", node)
-            return 'error' 
+            return ERROR
+        node.binding = info.get('binding')
         
         # Aviso opcional se usarmos uma variável não inicializada (apenas no lado direito)
         if not self.in_lhs_of_assignment and not info.get('initialized', False):
             # self.add_warning(f"Variável '{name}' pode não ter sido inicializada.", node)
             pass
 
+        node.value_type = info['type']
         return info['type']
 
     def visit_ArrayAccess(self, node):
@@ -314,97 +382,134 @@ class SemanticAnalyzer:
         
         if not info:
             self.add_error(f"Array '{name}' não declarado.", node)
-            return 'error'
+            return ERROR
+        node.binding = info.get('binding')
 
         type_info = info['type']
-        is_array = isinstance(type_info, dict) and type_info.get('kind') == 'array'
-        is_string = type_info == 'string'
+        is_string = type_info is STRING
 
-        if not is_array and not is_string:
+        if not type_info.is_array and not is_string:
             self.add_error(f"Variável '{name}' não é indexável (não é array nem string).", node)
-            return 'error'
+            return ERROR
 
         # Validação do Índice
-        index_type = self.visit(node.children[0])
-        if index_type != 'integer' and index_type != 'error':
+        index_type = yield node.children[0]
+        if index_type is not INTEGER and index_type is not ERROR:
             self.add_error(f"Índice de array deve ser inteiro.", node.children[0])
 
-        if is_string: return 'string' # Em Pascal retornaria char, mas simplificamos
-        return type_info['elem_type']
+        # Em Pascal um caráter de uma string seria char, mas simplificamos
+        node.value_type = STRING if is_string else type_info.element
+        return node.value_type
 
     def visit_BinaryOp(self, node):
-        left_t = self.visit(node.children[0])
-        right_t = self.visit(node.children[1])
+        left_t = yield node.children[0]
+        right_t = yield node.children[1]
+        # O tipo fica no nó para o Otimizador e o gerador de código (ex: ADD ou FADD)
+        node.value_type = self._binary_type(node, left_t, right_t)
+        return node.value_type
+
+    def _binary_type(self, node, left_t, right_t):
         op = node.leaf
 
-        if left_t == 'error' or right_t == 'error':
-            return 'error'
+        if left_t is ERROR or right_t is ERROR:
+            return ERROR
 
         # Operações Matemáticas (+, -, *, /)
         if op in ['+', '-', '*', 'DIV', 'MOD', '/']:
-            if left_t == 'integer' and right_t == 'integer':
-                return 'integer'
-            if left_t == 'real' or right_t == 'real': # Suporte básico a real (contágio)
-                return 'real'
-            
-            self.add_error(f"Operação '{op}' requer tipos numéricos. Recebeu '{left_t}' e '{right_t}'.", node)
-            return 'error'
+            if left_t not in NUMERIC or right_t not in NUMERIC:
+                self.add_error(f"Operação '{op}' requer tipos numéricos. Recebeu '{left_t}' e '{right_t}'.", node)
+                return ERROR
+            if op == '/':
+                return REAL # Em Pascal '/' dá sempre real
+            if left_t is INTEGER and right_t is INTEGER:
+                return INTEGER
+            if op in ('DIV', 'MOD'):
+                self.add_error(f"Operação '{op.lower()}' requer inteiros. Recebeu '{left_t}' e '{right_t}'.", node)
+                return ERROR
+            return REAL # Inteiro com real: o inteiro passa a real
 
         # Operações de Comparação (=, <>, <, >)
         if op in ['=', '<>', '<', '>', '<=', '>=']:
-            if self.check_type_compatibility(left_t, right_t):
-                return 'boolean'
+            # Inteiro com real em qualquer ordem (o gerador converte o inteiro com ITOF)
+            if self.check_type_compatibility(left_t, right_t) or self.check_type_compatibility(right_t, left_t):
+                return BOOLEAN
             self.add_error(f"Comparação inválida entre '{left_t}' e '{right_t}'.", node)
-            return 'error'
+            return ERROR
 
         # Operações Lógicas (AND, OR)
         if op in ['AND', 'OR']:
-            if left_t == 'boolean' and right_t == 'boolean':
-                return 'boolean'
+            if left_t is BOOLEAN and right_t is BOOLEAN:
+                return BOOLEAN
             self.add_error(f"Operador lógico '{op}' requer booleanos.", node)
-            return 'error'
+            return ERROR
 
-        return 'error'
+        return ERROR
 
     def visit_UnaryOp(self, node):
-        expr_t = self.visit(node.children[0])
-        if expr_t == 'error': return 'error'
+        expr_t = yield node.children[0]
+        node.value_type = self._unary_type(node, expr_t)
+        return node.value_type
+
+    def _unary_type(self, node, expr_t):
+        if expr_t is ERROR: return ERROR
 
         op = node.leaf
         if op == 'NOT':
-            if expr_t != 'boolean': 
+            if expr_t is not BOOLEAN: 
                 self.add_error("NOT requer booleano.", node)
-                return 'error'
-            return 'boolean'
+                return ERROR
+            return BOOLEAN
         elif op == 'MINUS':
-            if expr_t != 'integer' and expr_t != 'real': 
+            if expr_t not in NUMERIC: 
                 self.add_error("Menos unário requer número.", node)
-                return 'error'
+                return ERROR
             return expr_t
         return expr_t
 
     # Literais
-    def visit_IntegerConstant(self, node): return 'integer'
-    def visit_RealConstant(self, node): return 'real'
-    def visit_StringConstant(self, node): return 'string'
-    def visit_BooleanConstant(self, node): return 'boolean'
-    def visit_NumericConst(self, node): return 'integer'
+    def visit_IntegerConstant(self, node):
+        node.value_type = INTEGER
+        return INTEGER
+
+    def visit_RealConstant(self, node):
+        node.value_type = REAL
+        return REAL
+
+    def visit_StringConstant(self, node):
+        node.value_type = STRING
+        return STRING
+
+    def visit_BooleanConstant(self, node):
+        node.value_type = BOOLEAN
+        return BOOLEAN
+
+    visit_NumericConst = visit_IntegerConstant
 
     # Chamadas de Funções e I/O
     def visit_FunctionCall(self, node):
         func_name = node.leaf
         info = self.current_scope.lookup(func_name)
+        if info and info.get('function'):
+            # Dentro da própria função o nome é a variável de retorno: f(...) é uma chamada recursiva
+            info = info['function']
         if not info:
-            if func_name == 'length': return 'integer' # Built-in 'length'
+            if func_name == 'length': # Built-in 'length': os argumentos também são ligados
+                if node.children:
+                    for arg in node.children[0].children:
+                        yield arg
+                node.value_type = INTEGER
+                return INTEGER
             self.add_error(f"Função '{func_name}' não declarada.", node)
-            return 'error'
+            return ERROR
         
         if info['kind'] != 'function':
             self.add_error(f"'{func_name}' não é uma função.", node)
-            return 'error'
+            return ERROR
+        node.binding = info['binding']
 
         # Validação de Argumentos
-        self._check_args(node, info['params'], func_name)
+        yield from self._check_args(node, info['params'], func_name)
+        node.value_type = info['return_type']
         return info['return_type']
 
     def visit_ProcedureCall(self, node):
@@ -422,8 +527,9 @@ class SemanticAnalyzer:
         if info['kind'] != 'procedure':
             self.add_error(f"'{proc_name}' não é um procedimento.", node)
             return
+        node.binding = info['binding']
 
-        self._check_args(node, info['params'], proc_name)
+        yield from self._check_args(node, info['params'], proc_name)
 
     def _check_args(self, node, expected_params, name):
         """Verifica se o número e tipo dos argumentos correspondem à declaração"""
@@ -433,7 +539,7 @@ class SemanticAnalyzer:
         # Coleta tipos dos argumentos passados
         if args_node and args_node.type == 'ArgList':
             for arg in args_node.children:
-                t = self.visit(arg)
+                t = yield arg
                 given_args.append(t)
         
         # Verifica quantidade
@@ -450,11 +556,11 @@ class SemanticAnalyzer:
     def visit_ReadStatement(self, node):
         for var in node.children:
             self.in_lhs_of_assignment = True
-            t = self.visit(var)
+            t = yield var
             self.in_lhs_of_assignment = False
             
             # Read só aceita tipos básicos
-            if t not in ['integer', 'real', 'string', 'error']:
+            if t not in (INTEGER, REAL, STRING, ERROR):
                  self.add_error(f"Não é possível ler para variável do tipo '{t}'.", var)
 
             if var.type == 'VariableAccess':
@@ -462,13 +568,9 @@ class SemanticAnalyzer:
                 if info: info['initialized'] = True
 
     def visit_WriteStatement(self, node):
-        for expr in node.children: self.visit(expr)
+        for expr in node.children: yield expr
 
     # Funções Auxiliares
     def check_type_compatibility(self, expected, actual):
-        """Regras de compatibilidade de tipos do Pascal"""
-        if expected == 'error' or actual == 'error': return True # Erro propaga-se silenciosamente
-        if expected == actual: return True
-        if expected == 'string' and actual == 'string': return True
-        if expected == 'real' and actual == 'integer': return True # Coerção implícita int -> real permitida
-        return False
\ No newline at end of file
+        """Regras de compatibilidade de tipos do Pascal (tipos únicos: ver typesystem.compatible)"""
+        return compatible(expected, actual)
\ No newline at end of file
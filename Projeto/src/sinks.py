@@ -0,0 +1,70 @@
+"""
+Destinos (sinks) para as instruções EWVM emitidas pelo CodeGenerator.
+Todos têm a mesma interface: emit(instrução), close() e o contador 'count'.
+Opcionalmente recebem marcas de origem (mark), que constroem o mapa de origem
+('source_map', ver sourcemap.py) com os índices finais das instruções.
+"""
+from sourcemap import SourceMap
+
+
+class Sink:
+    """Base dos destinos: o mapa de origem só é criado se o gerador enviar marcas."""
+    source_map = None
+    count = 0
+
+    def mark(self, origin):
+        if self.source_map is None:
+            self.source_map = SourceMap()
+        self.source_map.mark(self.count, origin)
+
+
+class ListSink(Sink):
+    """Guarda as instruções numa lista em memória (comportamento original)."""
+    def __init__(self):
+        self.code = []
+        self.count = 0
+
+    def emit(self, instruction):
+        self.code.append(instruction)
+        self.count += 1
+
+    def close(self):
+        pass
+
+
+class FileSink(Sink):
+    """
+    Escreve as instruções diretamente num ficheiro com buffer grande, à medida que são
+    emitidas: o código nunca fica todo em memória. Guarda as primeiras 'preview_lines'
+    instruções para a pré-visualização, evitando reler o ficheiro do disco.
+    """
+    def __init__(self, path, preview_lines=0, buffer_size=1 << 16):
+        self.path = path
+        self.count = 0
+        self.preview_lines = preview_lines
+        self.head = []
+        self._file = open(path, 'w', buffering=buffer_size)
+        self._write = self._file.write
+
+    def emit(self, instruction):
+        if self.count < self.preview_lines:
+            self.head.append(instruction)
+        self.count += 1
+        self._write(instruction)
+        self._write("\n")
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+
+class NullSink(Sink):
+    """Descarta as instruções e apenas as conta (útil para benchmarks)."""
+    def __init__(self):
+        self.count = 0
+
+    def emit(self, instruction):
+        self.count += 1
+
+    def close(self):
+        pass
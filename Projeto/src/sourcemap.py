@@ -0,0 +1,59 @@
+"""
+Mapa de origem (source map) do código EWVM gerado.
+
+Liga cada instrução emitida à linha Pascal que a produziu. Em vez de uma entrada por
+instrução, guarda só os pontos onde a origem muda (codificação por sequências): o
+CodeGenerator marca a origem no fluxo de instruções (sink.mark) e o destino final
+regista o índice da próxima instrução. Assim o mapa continua certo depois do
+peephole, que remove e reescreve instruções pelo caminho.
+"""
+from bisect import bisect_right
+from collections import namedtuple
+
+# line        - linha do comando Pascal (None antes do primeiro comando)
+# subprogram  - nome da função/procedimento (None no programa principal)
+# loops       - linhas dos ciclos (while/for) que envolvem a instrução, do mais exterior para dentro
+Origin = namedtuple('Origin', 'line subprogram loops')
+
+NO_ORIGIN = Origin(None, None, ())
+
+
+class SourceMap:
+    """Tabela índice da instrução -> Origin, guardada como (início, origem) de cada sequência."""
+    def __init__(self):
+        self.starts = []
+        self.origins = []
+
+    def mark(self, index, origin):
+        """A partir da instrução 'index' (inclusive) a origem passa a ser 'origin'."""
+        if self.starts and self.starts[-1] == index:
+            # Nenhuma instrução desde a última marca: substitui-a
+            self.origins[-1] = origin
+            if len(self.origins) > 1 and self.origins[-2] == origin:
+                self.starts.pop()
+                self.origins.pop()
+            return
+        if self.origins and self.origins[-1] == origin:
+            return
+        self.starts.append(index)
+        self.origins.append(origin)
+
+    def origin_at(self, index):
+        i = bisect_right(self.starts, index) - 1
+        return self.origins[i] if i >= 0 else NO_ORIGIN
+
+    def expand(self, count):
+        """Lista com a origem de cada uma das 'count' instruções."""
+        result = []
+        previous = 0
+        origin = NO_ORIGIN
+        for start, next_origin in zip(self.starts, self.origins):
+            start = min(start, count)
+            result.extend([origin] * (start - previous))
+            previous = start
+            origin = next_origin
+        result.extend([origin] * (count - previous))
+        return result
+
+    def __len__(self):
+        return len(self.starts)
@@ -0,0 +1,254 @@
+"""
+Eliminação de chamadas recursivas em posição final (tail calls).
+
+Uma chamada de um subprograma a si próprio que é a última coisa que ele faz não
+precisa de um novo frame: basta dar aos parâmetros os valores dos argumentos e
+voltar ao início do corpo. O corpo passa a estar dentro de um nó TailLoop (o
+CodeGenerator põe-lhe uma etiqueta depois da reserva das locais) e cada chamada
+final passa a um nó TailCall (avalia os argumentos, guarda-os nos parâmetros, põe
+as locais outra vez a 0 e salta para essa etiqueta).
+
+  procedimentos - 'p(args)' como último comando de um caminho do corpo
+  funções       - 'f := f(args)' como último comando de um caminho, se todos os
+                  caminhos acabarem numa atribuição a 'f' e 'f' não for lido nem
+                  atribuído noutro sítio
+  acumulador    - recursão linear 'f := e + f(args)' ou 'f := e * f(args)' (ou com
+                  a chamada à esquerda), com 'e' e os argumentos sem efeitos: o
+                  resultado parcial vai para uma local escondida ($f_acc, começa no
+                  elemento neutro) e os outros caminhos devolvem acc + valor
+                  (ou acc * valor). Só em funções inteiras: + e * são associativos
+                  e comutativos, por isso a ordem das operações não altera o valor.
+                  Com a chamada à esquerda, 'e' passa a ser avaliado antes da
+                  recursão: só pode ler parâmetros e locais (a chamada não as altera)
+
+Corre no fim do Otimizador, depois da eliminação de código morto, por isso as
+outras passagens nunca veem os nós TailLoop e TailCall. Numa chamada a sério o
+PUSHN deixa as locais a 0 (o Inliner mantém o mesmo comportamento): o TailCall
+leva-as (segundo filho, um IDList) para o gerador de código as voltar a pôr a 0.
+Os subprogramas com arrays locais ficam como estão (seria preciso limpar cada
+elemento em cada volta).
+"""
+from parser import Node
+from deadcode import is_pure, block_parts, declared_variables, declare_variable, variable
+from typesystem import INTEGER
+
+# Operador do acumulador -> elemento neutro
+ACCUMULATORS = {'+': 0, '*': 1}
+
+
+def _tail_slots(parent, index, slots):
+    """
+    Junta a 'slots' os (pai, índice) dos comandos em posição final de parent.children[index].
+    Um caminho que acaba sem comando (if sem else) dá (None, None).
+    """
+    pending = [(parent, index)]
+    while pending:
+        owner, i = pending.pop()
+        node = owner.children[i]
+        if node.type == 'CompoundStatement':
+            last = [j for j, child in enumerate(node.children) if child.type != 'Empty']
+            if last:
+                pending.append((node, last[-1]))
+            else:
+                slots.append((None, None))
+        elif node.type == 'IfStatement':
+            pending.append((node, 1))
+            if len(node.children) > 2:
+                pending.append((node, 2))
+            else:
+                slots.append((None, None))
+        elif node.type == 'Empty':
+            slots.append((None, None))
+        else:
+            slots.append((owner, i))
+    return slots
+
+
+def _parameter_count(sub):
+    count = 0
+    for param in sub.children[0].children:
+        id_list = param.children[0]
+        count += len(id_list.children) if id_list.type == 'IDList' else 1
+    return count
+
+
+def _self_call(node, function, arity):
+    """Argumentos de uma chamada à função 'function' (ligação) com 'arity' argumentos; None se 'node' não for uma."""
+    if node.type != 'FunctionCall' or node.binding is not function:
+        return None
+    args = node.children[0].children if node.children else []
+    return args if len(args) == arity else None
+
+
+def _reads_frame_only(node, depth):
+    """'node' só lê variáveis do frame do subprograma (parâmetros e locais de profundidade 'depth')."""
+    pending = [node]
+    while pending:
+        item = pending.pop()
+        if item.type in ('VariableAccess', 'ArrayAccess') and item.binding.depth != depth:
+            return False
+        pending.extend(item.children)
+    return True
+
+
+def _locals_to_reset(decls):
+    """Nós ID das locais declaradas (a limpar em cada chamada final); None se houver arrays."""
+    if decls is None:
+        return []
+    ids = [id_node for _, id_node in declared_variables(decls)]
+    if any(id_node.binding.type.size != 1 for id_node in ids):
+        return None
+    return ids
+
+
+def _contains_call(node, function):
+    pending = [node]
+    while pending:
+        item = pending.pop()
+        if item.type == 'FunctionCall' and item.binding is function:
+            return True
+        pending.extend(item.children)
+    return False
+
+
+class TailCallEliminator:
+    """Troca as chamadas recursivas finais por saltos. Regras: tail_call, accumulator."""
+    def __init__(self, optimizer):
+        self.optimizer = optimizer
+
+    def eliminate(self, ast):
+        if ast is None or ast.type != 'Program' or not ast.children:
+            return ast
+        funcs = block_parts(ast.children[0])[0]
+        if funcs is not None:
+            for sub in funcs.children:
+                if getattr(sub, 'type', None) == 'ProcedureDeclaration':
+                    self._eliminate_procedure(sub)
+                elif getattr(sub, 'type', None) == 'FunctionDeclaration':
+                    self._eliminate_function(sub)
+        return ast
+
+    def _eliminate_procedure(self, sub):
+        _, decls, body = block_parts(sub.children[2])
+        resets = _locals_to_reset(decls)
+        if body is None or resets is None:
+            return
+        arity = _parameter_count(sub)
+        calls = []
+        for owner, i in _tail_slots(sub.children[2], 2, []):
+            if owner is None:
+                continue
+            node = owner.children[i]
+            if node.type == 'ProcedureCall' and node.binding is sub.binding:
+                args = node.children[0].children if node.children else []
+                if len(args) == arity:
+                    calls.append((owner, i, args))
+        for owner, i, args in calls:
+            owner.children[i] = self._tail_call(sub, args, owner.children[i], resets)
+        if calls:
+            self._wrap_body(sub, body, [])
+
+    def _eliminate_function(self, sub):
+        _, decls, body = block_parts(sub.children[2])
+        resets = _locals_to_reset(decls)
+        if body is None or decls is None or resets is None:
+            return
+        function = sub.binding
+        result = function.result
+        arity = _parameter_count(sub)
+        slots = _tail_slots(sub.children[2], 2, [])
+        results = [] # (pai, índice, atribuição) de cada caminho
+        for owner, i in slots:
+            if owner is None:
+                return # Um caminho acaba sem atribuir o resultado
+            node = owner.children[i]
+            if node.type != 'AssignmentStatement' or node.children[0].type != 'VariableAccess' \
+                    or node.children[0].binding is not result:
+                return
+            results.append((owner, i, node))
+        if not self._result_only_at_tails(body, result, {id(node) for _, _, node in results}):
+            return
+
+        sites = [] # (pai, índice, argumentos, operador, e) das chamadas finais
+        operators = set()
+        for owner, i, node in results:
+            expr = node.children[1]
+            args = _self_call(expr, function, arity)
+            if args is not None:
+                sites.append((owner, i, args, None, None))
+                continue
+            if expr.type == 'BinaryOp' and expr.leaf in ACCUMULATORS:
+                left, right = expr.children
+                for call, other in ((right, left), (left, right)):
+                    args = _self_call(call, function, arity)
+                    # 'f(args) op e': 'e' era avaliado depois da chamada, que pode alterar globais
+                    if call is left and not _reads_frame_only(other, result.depth):
+                        continue
+                    if (args is not None and not _contains_call(other, function) and is_pure(other)
+                            and all(is_pure(arg) for arg in args)):
+                        sites.append((owner, i, args, expr.leaf, other))
+                        operators.add(expr.leaf)
+                        break
+        if not sites:
+            return
+        if operators and (len(operators) > 1 or function.type.result is not INTEGER):
+            # Sem acumulador possível: só as chamadas 'f := f(args)'
+            sites = [site for site in sites if site[3] is None]
+            operators = set()
+            if not sites:
+                return
+
+        prologue = []
+        if operators:
+            op = operators.pop()
+            acc = declare_variable(decls, f"${sub.leaf}_acc", INTEGER, result.depth, sub.lineno)
+            neutral = Node('IntegerConstant', [], ACCUMULATORS[op], lineno=sub.lineno, value_type=INTEGER)
+            prologue.append(self._assign(acc, neutral, sub))
+            self.optimizer._applied('accumulator')
+            tail_ids = {id(owner.children[i]) for owner, i, _, _, _ in sites}
+            # Os outros caminhos devolvem o acumulado combinado com o seu valor
+            for owner, i, node in results:
+                if id(node) not in tail_ids:
+                    node.children[1] = self._combine(acc, op, node.children[1])
+
+        for owner, i, args, op, other in sites:
+            statement = owner.children[i]
+            # O acumulador (declarado depois) não está em 'resets': continua entre voltas
+            call = self._tail_call(sub, args, statement, resets)
+            if op is None:
+                owner.children[i] = call
+            else:
+                update = self._assign(acc, self._combine(acc, op, other), statement)
+                owner.children[i] = Node('CompoundStatement', [update, call], lineno=statement.lineno)
+        self._wrap_body(sub, body, prologue)
+
+    def _result_only_at_tails(self, body, result, tails):
+        """O resultado só é escrito nas atribuições finais ('tails') e nunca é lido."""
+        pending = [body]
+        while pending:
+            item = pending.pop()
+            if id(item) in tails:
+                pending.append(item.children[1])
+                continue
+            # Inclui os destinos de atribuições, leituras e ciclos for
+            if item.type in ('VariableAccess', 'ArrayAccess') and item.binding is result:
+                return False
+            pending.extend(item.children)
+        return True
+
+    # Construtores
+    def _assign(self, binding, expr, origin):
+        return Node('AssignmentStatement', [variable(binding, origin.lineno), expr], lineno=origin.lineno)
+
+    def _combine(self, acc, op, expr):
+        return Node('BinaryOp', [variable(acc, expr.lineno), expr], op, lineno=expr.lineno, value_type=INTEGER)
+
+    def _tail_call(self, sub, args, statement, resets):
+        self.optimizer._applied('tail_call')
+        return Node('TailCall', [Node('ArgList', list(args)), Node('IDList', list(resets))], sub.leaf,
+                    lineno=statement.lineno, binding=sub.binding)
+
+    def _wrap_body(self, sub, body, prologue):
+        loop = Node('TailLoop', [Node('CompoundStatement', body.children, lineno=body.lineno)], sub.leaf,
+                    lineno=body.lineno)
+        body.children = prologue + [loop]
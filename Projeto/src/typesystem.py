@@ -0,0 +1,130 @@
+"""
+Tipos da linguagem como objetos imutáveis e únicos (hash-consing).
+
+Cada tipo existe uma só vez: 'array_of(1, 10, INTEGER)' devolve sempre o mesmo
+objeto para os mesmos limites e elemento, tal como 'signature' para a mesma lista
+de parâmetros e o mesmo resultado. Por isso dois tipos são iguais se e só se forem
+o mesmo objeto ('is'), e a compatibilidade é uma comparação de identidade ou uma
+consulta a uma tabela. Os arrays guardam o tamanho (espaços ocupados) e o passo
+(espaços por elemento) já calculados.
+
+Os tipos mantêm-se únicos depois do pickle (a tabela de símbolos vai para a cache):
+ao carregar, cada tipo é pedido outra vez à fábrica respetiva.
+"""
+
+
+class Type:
+    """Base dos tipos: imutável depois de criado. A igualdade é a identidade (de object)."""
+    __slots__ = ('name', 'size')
+
+    def __init__(self, name, size):
+        object.__setattr__(self, 'name', name)
+        object.__setattr__(self, 'size', size) # Espaços ocupados por uma variável do tipo
+
+    def __setattr__(self, attr, value):
+        raise AttributeError(f"O tipo '{self}' é imutável")
+
+    def __str__(self):
+        return self.name
+
+    def __repr__(self):
+        return f"<tipo {self.name}>"
+
+    @property
+    def is_array(self):
+        return False
+
+
+class BasicType(Type):
+    """integer, real, boolean, string e os tipos internos 'error' e 'unknown'."""
+    __slots__ = ()
+
+    def __reduce__(self):
+        return (basic_type, (self.name,))
+
+
+class ArrayType(Type):
+    __slots__ = ('low', 'high', 'element', 'stride')
+
+    def __init__(self, low, high, element):
+        stride = element.size
+        super().__init__(f"array[{low}..{high}] of {element}", (high - low + 1) * stride)
+        object.__setattr__(self, 'low', low)
+        object.__setattr__(self, 'high', high)
+        object.__setattr__(self, 'element', element)
+        object.__setattr__(self, 'stride', stride) # Espaços entre dois elementos seguidos
+
+    @property
+    def is_array(self):
+        return True
+
+    def __reduce__(self):
+        return (array_of, (self.low, self.high, self.element))
+
+
+class SignatureType(Type):
+    """Assinatura de uma função (result é o tipo devolvido) ou de um procedimento (result None)."""
+    __slots__ = ('params', 'result')
+
+    def __init__(self, params, result):
+        args = ", ".join(str(p) for p in params)
+        name = f"function({args}): {result}" if result is not None else f"procedure({args})"
+        super().__init__(name, 0)
+        object.__setattr__(self, 'params', params) # Tuplo com o tipo de cada parâmetro
+        object.__setattr__(self, 'result', result)
+
+    def __reduce__(self):
+        return (signature, (self.params, self.result))
+
+
+_BASIC = {}
+_ARRAYS = {}
+_SIGNATURES = {}
+
+
+def basic_type(name):
+    """O tipo básico com este nome (criado na primeira vez)."""
+    t = _BASIC.get(name)
+    if t is None:
+        t = _BASIC[name] = BasicType(name, 1)
+    return t
+
+
+def array_of(low, high, element):
+    key = (low, high, element)
+    t = _ARRAYS.get(key)
+    if t is None:
+        t = _ARRAYS[key] = ArrayType(low, high, element)
+    return t
+
+
+def signature(params, result=None):
+    params = tuple(params)
+    key = (params, result)
+    t = _SIGNATURES.get(key)
+    if t is None:
+        t = _SIGNATURES[key] = SignatureType(params, result)
+    return t
+
+
+INTEGER = basic_type('integer')
+REAL = basic_type('real')
+BOOLEAN = basic_type('boolean')
+STRING = basic_type('string')
+ERROR = basic_type('error') # Resultado de uma expressão com erro: não gera mais mensagens
+UNKNOWN = basic_type('unknown')
+
+NUMERIC = frozenset((INTEGER, REAL))
+SCALARS = frozenset((INTEGER, BOOLEAN)) # Ocupam um espaço e têm valor inicial 0 (false)
+
+# Pares (esperado, recebido) compatíveis sem serem o mesmo tipo
+_COERCIONS = frozenset((
+    (REAL, INTEGER), # Coerção implícita int -> real
+))
+
+
+def compatible(expected, actual):
+    """Regras de compatibilidade de tipos do Pascal: identidade ou uma coerção da tabela."""
+    if expected is actual or expected is ERROR or actual is ERROR: # Erro propaga-se silenciosamente
+        return True
+    return (expected, actual) in _COERCIONS
@@ -0,0 +1,168 @@
+from types import GeneratorType
+
+
+class NodeVisitor:
+    """
+    Base comum dos visitantes da AST (Semântica, Otimizador, Gerador de Código).
+
+    Em vez de construir o nome do método (f'visit_{node.type}') e chamar getattr em
+    cada nó, a tabela tipo -> função é construída uma única vez por classe, quando a
+    subclasse é definida. Cada instância guarda ainda uma cache tipo -> método ligado
+    (bound method), incluindo o fallback genérico para tipos sem método próprio.
+
+    As subclasses indicam o prefixo dos seus métodos em 'visit_prefix'
+    (ex: 'visit_' -> visit_IfStatement, 'generate_' -> generate_IfStatement).
+
+    Travessia sem recursão:
+    Um método de visita pode ser um gerador. Em vez de chamar self.visit(filho),
+    faz 'resultado = yield filho' e o motor (visit) visita o filho e devolve-lhe o
+    resultado. O código antes do yield funciona como hook "pré" e o código depois
+    como hook "pós" (útil para escopos). Como a pilha é explícita (lista de
+    geradores), a profundidade da AST não está limitada pelo limite de recursão do
+    Python. Métodos normais (sem yield) continuam a funcionar, ex: folhas.
+    """
+    visit_prefix = 'visit_'
+    default_result = None # Valor devolvido ao visitar um nó vazio (None)
+    _dispatch = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        prefix = cls.visit_prefix
+        table = {}
+        # Percorre a MRO do mais genérico para o mais específico (as subclasses ganham)
+        for klass in reversed(cls.__mro__):
+            for name, value in vars(klass).items():
+                if name.startswith(prefix) and callable(value):
+                    table[name[len(prefix):]] = value
+        cls._dispatch = table
+
+    def _method_for(self, node_type):
+        """Resolve (e guarda na cache da instância) o método para um tipo de nó."""
+        try:
+            cache = self._visit_cache
+        except AttributeError:
+            cache = self._visit_cache = {}
+        func = self._dispatch.get(node_type)
+        method = func.__get__(self) if func is not None else self.generic_visit
+        cache[node_type] = method
+        return method
+
+    def visit(self, node):
+        if not node: return self.default_result
+        try:
+            cache = self._visit_cache
+        except AttributeError:
+            cache = self._visit_cache = {}
+
+        method = cache.get(node.type) or self._method_for(node.type)
+        result = method(node)
+        if result.__class__ is not GeneratorType:
+            return result
+
+        # Motor com pilha explícita: cada entrada é o 'send' de um método de visita suspenso
+        stack = [result.send]
+        push = stack.append
+        pop = stack.pop
+        value = None
+        default = self.default_result
+        while stack:
+            try:
+                child = stack[-1](value)
+            except StopIteration as stop:
+                pop()
+                value = stop.value
+                continue
+
+            if not child:
+                value = default
+                continue
+            method = cache.get(child.type) or self._method_for(child.type)
+            result = method(child)
+            if result.__class__ is GeneratorType:
+                push(result.send)
+                value = None
+            else:
+                value = result
+        return value
+
+    def generic_visit(self, node):
+        for child in node.children:
+            yield child
+
+
+# Profundidade até à qual as travessias simples usam recursão normal (mais rápida em
+# CPython); abaixo disso passam para a versão com pilha explícita.
+RECURSION_BUDGET = 200
+
+
+def transform_postorder(root, fn):
+    """
+    Percorre a árvore em pós-ordem (filhos antes do pai) e substitui cada nó pelo
+    valor devolvido por fn(nó). Usado pelo Otimizador para a dobragem de constantes:
+    quando fn vê o nó, os filhos já estão simplificados.
+    Subárvores mais fundas do que RECURSION_BUDGET são tratadas sem recursão.
+    """
+    if root is None or not hasattr(root, 'children'):
+        return root
+    return _transform(root, fn, 0)
+
+
+def _transform(node, fn, depth):
+    if depth >= RECURSION_BUDGET:
+        return _transform_iterative(node, fn)
+    children = node.children
+    for i, child in enumerate(children):
+        if hasattr(child, 'children'):
+            children[i] = _transform(child, fn, depth + 1)
+    return fn(node)
+
+
+def _transform_iterative(root, fn):
+    """
+    Versão com pilha explícita: uma pré-ordem iterativa regista (pai, índice, nó);
+    percorrida ao contrário, cada nó aparece depois de todos os seus descendentes.
+    """
+    order = []
+    record = order.append
+    stack = [(None, 0, root)]
+    pop = stack.pop
+    push = stack.append
+    while stack:
+        entry = pop()
+        record(entry)
+        node = entry[2]
+        for i, child in enumerate(node.children):
+            if hasattr(child, 'children'):
+                push((node, i, child))
+
+    for parent, i, node in reversed(order):
+        new_node = fn(node)
+        if parent is None:
+            return new_node
+        parent.children[i] = new_node
+
+
+def walk(root, pre=None, post=None):
+    """
+    Travessia em profundidade sem recursão com hooks de entrada e saída.
+    pre(item, depth) é chamado ao entrar; se devolver False os filhos são ignorados.
+    post(item, depth) é chamado ao sair, depois de todos os filhos.
+    Os itens sem 'children' (ex: valores soltos) são tratados como folhas.
+    """
+    if root is None:
+        return
+    stack = [(root, 0, False)]
+    while stack:
+        item, depth, leaving = stack.pop()
+        if leaving:
+            post(item, depth)
+            continue
+
+        descend = pre(item, depth) if pre else None
+        if post:
+            stack.append((item, depth, True))
+        children = getattr(item, 'children', None)
+        if children and descend is not False:
+            # Empilhar ao contrário para visitar pela ordem original
+            for child in reversed(children):
+                stack.append((child, depth + 1, False))
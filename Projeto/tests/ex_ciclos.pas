@@ -0,0 +1,68 @@
+program TesteCiclos;
+var
+    i, j, n, base, total, conta: integer;
+    palavra: string;
+    tabela: array[1..10] of integer;
+    g1, g2: integer;
+
+{ Altera a global g2: chamada no limite de um ciclo for }
+function zera(x: integer): integer;
+begin
+    g2 := 0;
+    zera := x
+end;
+
+begin
+    writeln('--- Inicio do Teste de Ciclos ---');
+    palavra := 'otimizacao';
+    n := length(palavra) div 2;
+    base := n - 2;
+    total := 0;
+
+    { 1. LIMITE CALCULADO UMA SO VEZ }
+    { length(palavra) * 2 e avaliado antes do ciclo e guardado num espaco escondido }
+    conta := 0;
+    for i := 1 to length(palavra) * 2 do
+        conta := conta + 1;
+    writeln('conta (esperado 20): ', conta);
+
+    { 2. EXPRESSOES INVARIANTES NO CORPO }
+    { n * base e (n + base) * 2 nao mudam dentro dos ciclos: sao calculadas antes }
+    for i := 1 to 10 do
+    begin
+        tabela[i] := i * (n * base);
+        for j := 1 to n do
+            total := total + (n + base) * 2 + j;
+    end;
+    writeln('tabela[10] (esperado 150): ', tabela[10]);
+    writeln('total (esperado 950): ', total);
+
+    { 3. CONDICAO DO WHILE COM PARTE INVARIANTE }
+    i := 0;
+    while i < n * base + 1 do
+        i := i + 1;
+    writeln('i (esperado 16): ', i);
+
+    { 4. CICLOS QUE NAO DAO NENHUMA VOLTA }
+    { O valor atribuido antes do ciclo continua a ser preciso depois dele }
+    conta := 1;
+    while n > 10 do
+    begin
+        conta := 2;
+        n := n - 1
+    end;
+    writeln('conta (esperado 1): ', conta);
+    conta := 1;
+    for i := 1 to n - 10 do
+        conta := 2;
+    writeln('conta (esperado 1): ', conta);
+
+    { 5. LIMITE COM UMA CHAMADA QUE ALTERA UMA VARIAVEL DO CORPO }
+    { zera(1) corre antes do ciclo: g2 + 1 nao pode ser calculado antes dela }
+    g2 := 5;
+    for j := 0 to zera(1) + 9 do
+        g1 := g2 + 1;
+    writeln('g1 (esperado 1): ', g1);
+
+    writeln('--- Fim ---');
+end.
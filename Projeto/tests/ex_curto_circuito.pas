@@ -0,0 +1,33 @@
+program CurtoCircuito;
+var i, n, conta: integer;
+    s: string;
+    b, c: boolean;
+
+function marca(x: integer): boolean;
+begin
+    conta := conta + 1;
+    marca := x > 2
+end;
+
+begin
+    read(n);
+    s := 'abcab';
+    conta := 0;
+    i := 1;
+    while (i <= length(s)) and (s[i] <> 'c') do
+        i := i + 1;
+    write(i); write(' ');
+    if (n > 10) and marca(n) then write('a') else write('b');
+    if (n > 1) or marca(n) then write('c') else write('d');
+    if not (n > 1) or marca(n) then write('e') else write('f');
+    if not not (n = 5) then write('g') else write('h');
+    b := (n > 10) and marca(n);
+    c := (n < 10) or marca(n);
+    write(' '); write(b); write(c); write(conta); write(' ');
+    b := (n > 3) and (n < 9) or (n = 0);
+    write(b);
+    if b and not c or (i div 1 = 3) then write('x') else write('y');
+    if true then write('t');
+    while false do write('nunca');
+    if (i <> 3) = false then write('z')
+end.
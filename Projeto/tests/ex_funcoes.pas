@@ -0,0 +1,54 @@
+program TesteFuncoes;
+var
+    i, total, r: integer;
+    positivo: boolean;
+
+{ Funcoes de uma linha: as chamadas sao trocadas pela expressao }
+function soma(a, b: integer): integer;
+begin
+    soma := a + b
+end;
+
+function dobro(x: integer): integer;
+begin
+    dobro := soma(x, x)
+end;
+
+function quadrado(x: integer): integer;
+begin
+    quadrado := x * x
+end;
+
+{ Procedimentos pequenos: o corpo e copiado para o sitio da chamada }
+procedure mostra(valor, extra: integer);
+var soma_local: integer;
+begin
+    soma_local := valor + extra;
+    write(soma_local);
+    write(' ')
+end;
+
+procedure quadrados(n: integer);
+var k, acc: integer;
+begin
+    acc := 0;
+    for k := 1 to n do
+        acc := acc + quadrado(k);
+    mostra(acc, 0)
+end;
+
+begin
+    writeln('--- Inicio do Teste de Funcoes ---');
+    total := 0;
+    r := 3;
+    for i := 1 to 10 do
+        total := soma(total, dobro(i)) + quadrado(r);
+    write('total (esperado 200): ');
+    mostra(total, 0);
+    write('quadrados (esperado 30 e 14): ');
+    quadrados(4);
+    quadrados(r);
+    positivo := soma(r, -1) > 0;
+    writeln('positivo (esperado 1): ', positivo);
+    writeln('--- Fim ---');
+end.
@@ -0,0 +1,26 @@
+program IndicesConstantes;
+var v: array[1..10] of integer;
+    w: array[5..8] of integer;
+    m: array[0..3] of integer;
+    i, s: integer;
+
+procedure local(n: integer);
+var a: array[2..4] of integer;
+    k: integer;
+begin
+    a[2] := n; a[3] := n * 2; a[4] := a[2] + a[3];
+    k := a[4] + a[2 + 1];
+    write(k); write(' ')
+end;
+
+begin
+    read(v[1]);
+    v[2] := v[1] + 1;
+    w[5] := 7; w[8] := w[5] * 3;
+    m[0] := 1; m[3] := m[0] + w[8];
+    for i := 3 to 10 do v[i] := v[i - 1] + v[i - 2];
+    s := v[10] + v[3 * 3] + w[5] + w[8] + m[3];
+    write(s); write(' ');
+    local(v[1]);
+    write(v[11 - 1])
+end.
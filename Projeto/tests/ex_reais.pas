@@ -0,0 +1,36 @@
+program Reais;
+var
+    r, s, media: real;
+    i, n: integer;
+    v: array[1..5] of real;
+
+function metade(x: real): real;
+begin
+    metade := x / 2
+end;
+
+function area(lado: integer): real;
+begin
+    area := lado * lado
+end;
+
+begin
+    writeln('Introduza um número inteiro:');
+    read(n);
+    r := 2.5;
+    s := 0;
+    for i := 1 to 5 do
+    begin
+        v[i] := i * r;
+        s := s + v[i]
+    end;
+    media := s / 5;
+    writeln('Soma: ', s);
+    writeln('Media: ', media);
+    writeln('Metade de n: ', metade(n));
+    writeln('Area menos meio: ', area(n) - 0.5);
+    writeln('7 / 2 = ', 7 / 2);
+    if media > n then writeln('Media acima de n') else writeln('Media abaixo de n');
+    if n < media then writeln('n abaixo da media') else writeln('n acima da media');
+    writeln('Simetrico do dobro: ', -r * 2)
+end.
@@ -0,0 +1,98 @@
+program TesteRecursao;
+var
+    n, g: integer;
+
+{ Acumulador: fatorial := n * fatorial(n - 1) passa a um ciclo }
+function fatorial(n: integer): integer;
+begin
+    if n <= 1 then
+        fatorial := 1
+    else
+        fatorial := n * fatorial(n - 1)
+end;
+
+{ Chamada final direta: os parametros sao atualizados e o corpo repete }
+function somaate(n, acc: integer): integer;
+begin
+    if n = 0 then
+        somaate := acc
+    else
+        somaate := somaate(n - 1, acc + n)
+end;
+
+function mdc(a, b: integer): integer;
+begin
+    if b = 0 then
+        mdc := a
+    else
+        mdc := mdc(b, a mod b)
+end;
+
+{ Duas chamadas recursivas: fica como esta }
+function fib(n: integer): integer;
+begin
+    if n < 2 then
+        fib := n
+    else
+        fib := fib(n - 1) + fib(n - 2)
+end;
+
+procedure contagem(n: integer);
+begin
+    if n > 0 then
+    begin
+        write(n);
+        write(' ');
+        contagem(n - 1)
+    end
+end;
+
+{ A chamada a esquerda altera a global lida a direita: nao passa a acumulador }
+function somaglobal(n: integer): integer;
+begin
+    g := g + 1;
+    if n <= 0 then
+        somaglobal := 0
+    else
+        somaglobal := somaglobal(n - 1) + g
+end;
+
+{ As locais comecam a 0 em cada chamada, tambem depois de a chamada final virar salto }
+procedure local(n: integer);
+var
+    t: integer;
+begin
+    t := t + 1;
+    write(t);
+    if n > 0 then
+        local(n - 1)
+end;
+
+{ Chamada final num procedimento com um ciclo for de limite calculado:
+  o espaco escondido do limite tem de existir dentro do ciclo da chamada final }
+procedure repete(p: integer);
+var
+    l, m: integer;
+begin
+    l := p;
+    for m := l to l + 1 do
+        g := g + 1;
+    if p > 0 then
+        repete(p - 1)
+end;
+
+begin
+    n := 10;
+    g := 0;
+    local(3);
+    writeln(' (esperado 1111)');
+    repete(3);
+    writeln(g);
+    g := 0;
+    writeln(somaglobal(3));
+    writeln(fatorial(n));
+    writeln(somaate(n * 100, 0));
+    writeln(mdc(1071, 462));
+    writeln(fib(n));
+    contagem(n)
+end.